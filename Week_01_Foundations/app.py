@@ -1,6 +1,37 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
+import io
+import os
+import sys
+from matplotlib.figure import Figure
+
+# Per-rerun timings, shared with the Week 2 pages (FACTORY_INSTRUMENT=1, see instrumentation.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Week_02_AI_Integration"))
+import instrumentation
+
+instrumentation.start_run("Factory Efficiency Dashboard")
+
+
+# Chart cache: the PNG is rendered once per distinct set of machine totals.
+# Figure() (not plt.subplots) isn't kept by pyplot, so nothing piles up between reruns.
+@st.cache_data(max_entries=32)
+@instrumentation.timed("chart")
+def render_bar_chart(summary):
+    fig = Figure()
+    ax = fig.subplots()
+    summary.plot(kind='bar', ax=ax, color='teal')
+    ax.set_ylabel("Count")
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    return buffer.getvalue()
+
+# Raw data table: only one page of rows is sent to the browser, not the whole file
+def show_page(df, page_size=100):
+    pages = max(1, -(-len(df) // page_size))  # ceiling division
+    page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1) if pages > 1 else 1
+    first = (page - 1) * page_size
+    st.dataframe(df.iloc[first:first + page_size])
+    st.caption(f"Rows {first + 1:,}-{min(first + page_size, len(df)):,} of {len(df):,}")
 
 # 1. The Title
 st.title("🏭 Factory Efficiency Dashboard")
@@ -11,17 +42,19 @@ uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
 
 if uploaded_file is not None:
     # 3. Read the Data (Just like before, but from the memory buffer)
-    df = pd.read_csv(uploaded_file)
+    with instrumentation.timer("csv_read"):
+        df = pd.read_csv(uploaded_file)
     
     st.success("File uploaded successfully!")
     
     # 4. Show Raw Data (Optional checkbox)
     if st.checkbox("Show Raw Data"):
-        st.write(df)
+        show_page(df)
 
     # 5. The Metrics (The "KPI Cards")
-    total_parts = df['Parts_Produced'].sum()
-    avg_cycle = df[df['Status'] == 'RUN']['Cycle_Time_Sec'].mean()
+    with instrumentation.timer("aggregate"):
+        total_parts = df['Parts_Produced'].sum()
+        avg_cycle = df[df['Status'] == 'RUN']['Cycle_Time_Sec'].mean()
     
     # Create 3 columns for layout
     col1, col2, col3 = st.columns(3)
@@ -32,14 +65,18 @@ if uploaded_file is not None:
     # 6. The Chart
     st.subheader("Production by Machine")
     
-    # Create the figure
-    fig, ax = plt.subplots()
-    summary = df.groupby('Machine_ID')['Parts_Produced'].sum()
-    summary.plot(kind='bar', ax=ax, color='teal')
-    plt.ylabel("Count")
-    
-    # Show it in the app
-    st.pyplot(fig)
+    with instrumentation.timer("aggregate"):
+        summary = df.groupby('Machine_ID')['Parts_Produced'].sum()
+
+    # Show it in the app: Streamlit's own chart (drawn in the browser) or the cached image
+    if st.checkbox("Interactive Chart"):
+        st.bar_chart(summary, color='#008080')
+    else:
+        st.image(render_bar_chart(summary))
 
 else:
-    st.info("Awaiting CSV upload...")
\ No newline at end of file
+    st.info("Awaiting CSV upload...")
+
+# 7. Timings (FACTORY_INSTRUMENT=1)
+instrumentation.finish_run()
+instrumentation.sidebar_panel("Factory Efficiency Dashboard")
\ No newline at end of file
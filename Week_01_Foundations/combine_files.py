@@ -1,44 +1,199 @@
 import pandas as pd
+import argparse
 import glob # The "File Finder" tool
+import json
 import os
+import resource # Memory usage (peak RSS) of this process and its workers
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-print("--- Starting Batch Process ---")
+# --- MERGE ENGINE ---
+# The first version read every file one by one, kept them ALL in a list, glued them
+# into one big "master" table and wrote Excel. Fine for 7 small files, too slow and
+# too memory hungry for a year of daily files. Now:
+# - Files are read by a pool of worker processes (one file per task)
+# - Explicit dtypes: Machine_ID as category, counts as 32-bit integers
+# - Each worker writes its file straight to the output folder as Parquet (a compressed
+#   column format) and sends back only its small per-machine totals
+# - The totals are added up as results arrive: no master table is ever built
+# Read the result back with pd.read_parquet('Weekly_Master_Report.parquet')
 
-# 1. FIND the files
-# glob.glob uses patterns. '*.csv' means "anything ending in .csv"
-# This creates a list: ['weekly_data/day_1.csv', 'weekly_data/day_2.csv', ...]
-all_files = glob.glob('weekly_data/*.csv')
+DTYPES = {
+    'Machine_ID': 'category',
+    'Parts_Produced': 'int32',
+    'Scrap_Count': 'int32',
+}
 
-print(f"Found {len(all_files)} files to process.")
 
-# 2. LOOP through them
-# We create an empty list to hold the dataframes
-dfs = []
+def process_file(filename, output_dir):
+    # Read the individual file (with the right types from the start)
+    temp_df = pd.read_csv(filename, dtype=DTYPES, parse_dates=['Timestamp'])
 
-for filename in all_files:
-    # Read the individual file
-    temp_df = pd.read_csv(filename)
-    
     # Add a column so we know which file it came from (Traceability!)
     temp_df['Source_File'] = os.path.basename(filename)
-    
-    # Add it to our list
-    dfs.append(temp_df)
-    print(f"Processed: {filename}")
-
-# 3. CONCATENATE (The "Master Merge")
-# Stack them all on top of each other
-master_df = pd.concat(dfs, ignore_index=True)
-
-# 4. ANALYZE the Master Data
-total_production = master_df['Parts_Produced'].sum()
-total_scrap = master_df['Scrap_Count'].sum()
-
-print("\n--- Weekly Summary ---")
-print(f"Total Files Merged: {len(all_files)}")
-print(f"Total Parts: {total_production}")
-print(f"Total Scrap: {total_scrap}")
-
-# 5. EXPORT
-master_df.to_excel('Weekly_Master_Report.xlsx', index=False)
-print("Saved 'Weekly_Master_Report.xlsx'")
\ No newline at end of file
+
+    # One Parquet file per source file, together they form the merged dataset
+    part_name = os.path.splitext(os.path.basename(filename))[0] + '.parquet'
+    temp_df.to_parquet(os.path.join(output_dir, part_name), index=False)
+
+    # Only the per-machine totals travel back to the main process
+    totals = temp_df.groupby('Machine_ID', observed=True)[['Parts_Produced', 'Scrap_Count']].sum()
+    return totals, len(temp_df)
+
+
+def peak_rss_mb(who):
+    # ru_maxrss is in kilobytes on Linux (bytes on macOS)
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / 1024 / (1024 if sys.platform == 'darwin' else 1)
+
+
+def clear_output(output_dir):
+    """
+    Creates 'output_dir', or empties it if it holds only Parquet parts from an earlier run.
+    Anything else (a file, a folder with other files - e.g. a mistyped --output .) raises
+    ValueError instead of being deleted.
+    """
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        return
+    if not os.path.isdir(output_dir):
+        raise ValueError(f"Output '{output_dir}' exists and is not a folder of Parquet parts")
+    entries = os.listdir(output_dir)
+    others = [e for e in entries if not (e.endswith('.parquet') and os.path.isfile(os.path.join(output_dir, e)))]
+    if others:
+        raise ValueError(f"Output folder '{output_dir}' contains other files (e.g. '{sorted(others)[0]}'), "
+                         f"refusing to overwrite it")
+    for entry in entries:
+        os.remove(os.path.join(output_dir, entry))
+
+
+def merge(all_files, output_dir, workers=4, verbose=True):
+    """
+    Merges 'all_files' into the Parquet folder 'output_dir'.
+    Returns (per-machine totals, number of rows).
+    """
+    # Start from an empty output folder so old parts never mix with new ones
+    clear_output(output_dir)
+
+    machine_totals = None
+    row_count = 0
+
+    def add(result):
+        # The "streaming reduction": fold each file's totals into the running sum
+        nonlocal machine_totals, row_count
+        totals, rows = result
+        machine_totals = totals if machine_totals is None else machine_totals.add(totals, fill_value=0)
+        row_count += rows
+
+    if workers == 1:
+        # No pool at all: the baseline
+        for filename in all_files:
+            add(process_file(filename, output_dir))
+            if verbose:
+                print(f"Processed: {filename}")
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(process_file, f, output_dir): f for f in all_files}
+            for future in as_completed(futures):
+                add(future.result())
+                if verbose:
+                    print(f"Processed: {futures[future]}")
+
+    if machine_totals is None:
+        machine_totals = pd.DataFrame(columns=['Parts_Produced', 'Scrap_Count'])
+    return machine_totals.astype('int64'), row_count
+
+
+def run_benchmark(folder, worker_counts):
+    # Every worker count runs in a fresh Python process, so peak RSS is not carried over
+    print(f"--- ⏱️ Merge benchmark: {folder} ---")
+    print(f"{'workers':>8}{'files/s':>10}{'rows/s':>12}{'seconds':>9}{'main RSS':>10}{'worker RSS':>12}")
+    for workers in worker_counts:
+        output = subprocess.run(
+            [sys.executable, __file__, '--folder', folder, '--workers', str(workers),
+             '--output', folder + '_bench.parquet', '--json'],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+        print(f"{workers:>8}{r['files'] / r['seconds']:>10.1f}{r['rows'] / r['seconds']:>12,.0f}{r['seconds']:>9.2f}"
+              f"{r['peak_rss_mb']:>8.0f}MB{r['worker_peak_rss_mb']:>10.0f}MB")
+    shutil.rmtree(folder + '_bench.parquet', ignore_errors=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Merge the daily CSV files")
+    parser.add_argument('--folder', default='weekly_data')
+    parser.add_argument('--output', default='Weekly_Master_Report.parquet')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--excel', action='store_true', help="Also write the old Weekly_Master_Report.xlsx")
+    parser.add_argument('--benchmark', action='store_true', help="Compare 1, 4 and 8 workers")
+    parser.add_argument('--archive', help="Total the Parquet archive instead (e.g. ../Week_02_AI_Integration/archive)")
+    parser.add_argument('--start', help="With --archive: first day (YYYY-MM-DD)")
+    parser.add_argument('--end', help="With --archive: last day (YYYY-MM-DD)")
+    parser.add_argument('--json', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.folder, [1, 4, 8])
+        sys.exit()
+
+    if args.archive:
+        # Already merged: read 3 columns, and only the day folders inside --start/--end
+        filters = [('date', '>=', args.start)] if args.start else []
+        filters += [('date', '<=', args.end)] if args.end else []
+        archive_df = pd.read_parquet(args.archive, columns=['Machine_ID', 'Parts_Produced', 'Scrap_Count'],
+                                     filters=filters or None)
+        print(archive_df.groupby('Machine_ID', observed=True).sum())
+        print(f"Total Parts: {archive_df['Parts_Produced'].sum()}")
+        print(f"Total Scrap: {archive_df['Scrap_Count'].sum()}")
+        sys.exit()
+
+    if not args.json:
+        print("--- Starting Batch Process ---")
+
+    # 1. FIND the files
+    # glob.glob uses patterns. '*.csv' means "anything ending in .csv"
+    # This creates a list: ['weekly_data/day_1.csv', 'weekly_data/day_2.csv', ...]
+    all_files = sorted(glob.glob(os.path.join(args.folder, '*.csv')))
+
+    if not args.json:
+        print(f"Found {len(all_files)} files to process.")
+
+    # 2. + 3. READ and MERGE (in parallel, straight to Parquet)
+    try:
+        clear_output(args.output)
+    except ValueError as e:
+        parser.error(str(e))
+    started = time.perf_counter()
+    machine_totals, row_count = merge(all_files, args.output, args.workers, verbose=not args.json)
+    seconds = time.perf_counter() - started
+
+    if args.json:
+        # Machine-readable line for --benchmark
+        print(json.dumps({
+            'files': len(all_files), 'rows': row_count, 'seconds': seconds,
+            'peak_rss_mb': peak_rss_mb(resource.RUSAGE_SELF),
+            'worker_peak_rss_mb': peak_rss_mb(resource.RUSAGE_CHILDREN),
+        }))
+        sys.exit()
+
+    # 4. ANALYZE the Master Data
+    total_production = machine_totals['Parts_Produced'].sum()
+    total_scrap = machine_totals['Scrap_Count'].sum()
+
+    print("\n--- Weekly Summary ---")
+    print(f"Total Files Merged: {len(all_files)}")
+    print(f"Total Rows: {row_count}")
+    print(f"Total Parts: {total_production}")
+    print(f"Total Scrap: {total_scrap}")
+    print(f"Speed: {len(all_files) / seconds:.1f} files/s with {args.workers} workers, "
+          f"peak memory {peak_rss_mb(resource.RUSAGE_SELF):.0f} MB")
+
+    # 5. EXPORT
+    print(f"Saved '{args.output}'")
+    if args.excel:
+        pd.read_parquet(args.output).to_excel('Weekly_Master_Report.xlsx', index=False)
+        print("Saved 'Weekly_Master_Report.xlsx'")
@@ -1,23 +1,163 @@
 import pandas as pd
+import argparse
+import hashlib
+import os
 import sqlite3 # This is the Database tool
+import time
 
-# 1. EXTRACT (Load the CSV)
-# We read the raw material just like before
-df = pd.read_csv('production_log.csv')
+# --- INCREMENTAL ETL ---
+# The first version re-read the whole CSV and rebuilt the table on every run
+# (if_exists='replace'). Log files only ever grow at the end, so now we remember,
+# per source file, how many bytes were already loaded (plus a fingerprint of the
+# start of the file) in a small 'etl_sources' table:
+# - next run: only the new lines after that offset are read and appended
+# - nothing new: nothing happens (safe to run again and again)
+# - file replaced/rewritten (fingerprint differs, or it got shorter): full reload
+# Rows + the new offsets are saved in ONE transaction, so a crash never loads a line twice.
+# The transaction is explicit (BEGIN IMMEDIATE ... COMMIT): in its default mode the Python
+# driver commits DDL on its own, so a failed full reload would leave the table dropped
+# while etl_sources still claimed everything was loaded.
 
-# 2. TRANSFORM (Clean the data)
-# Databases are strict. They hate missing numbers.
-df['Cycle_Time_Sec'] = df['Cycle_Time_Sec'].fillna(0)
+TABLE = 'production_logs'
+CHUNK_SIZE = 100_000
+FINGERPRINT_BYTES = 65536
 
-# 3. LOAD (Put it into the Warehouse)
-# Connect to a new database file (it will be created automatically)
-conn = sqlite3.connect('factory_data.db')
+STATE_SQL = """
+CREATE TABLE IF NOT EXISTS etl_sources (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,      -- bytes loaded so far (the end of the last loaded line)
+    fingerprint TEXT NOT NULL,    -- sha256 of the first bytes, to notice a replaced file
+    rows INTEGER NOT NULL,
+    loaded_at TEXT NOT NULL
+)
+"""
 
-# Write the data to a table named 'production_logs'
-# if_exists='replace': If the table exists, wipe it and write fresh.
-df.to_sql('production_logs', conn, if_exists='replace', index=False)
 
-print("Success! Data has been moved from CSV to SQL Database.")
+def fingerprint(path, size):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read(min(size, FINGERPRINT_BYTES))).hexdigest()
 
-# Close the door
-conn.close()
\ No newline at end of file
+
+def count_lines(path, start):
+    """
+    Number of lines from 'start' to the end of the file, and the end offset.
+    A last line without a newline counts too (hand-edited files often end that way).
+    """
+    lines, last = 0, b'\n'
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while block := f.read(1 << 20):
+            lines += block.count(b'\n')
+            last = block[-1:]
+        end = f.tell()
+    return lines + (last != b'\n'), end
+
+
+def ends_mid_line(path, offset):
+    # True if we stopped after a line that had no newline (yet)
+    if offset == 0:
+        return False
+    with open(path, 'rb') as f:
+        f.seek(offset - 1)
+        return f.read(1) != b'\n'
+
+
+def load_source(conn, path, state, chunk_size=CHUNK_SIZE):
+    """
+    Appends the new lines of one CSV. Returns (rows inserted, new state row).
+    Runs inside the caller's transaction.
+    """
+    columns = list(pd.read_csv(path, nrows=0).columns)
+    start = state['offset'] if state else 0
+    if start and ends_mid_line(path, start):
+        start += 1  # the newline that finished our last line (checked in run_etl)
+    lines, end = count_lines(path, start)
+    if start == 0:
+        lines -= 1  # the header line
+    if lines <= 0:
+        return 0, None
+
+    inserted = 0
+    with open(path, 'rb') as f:
+        f.seek(start)
+        # 1. EXTRACT in chunks: only 'chunk_size' rows are in memory at a time
+        reader = pd.read_csv(f, header=0 if start == 0 else None, names=columns, nrows=lines, chunksize=chunk_size)
+        for chunk in reader:
+            # 2. TRANSFORM (Clean the data)
+            # Databases are strict. They hate missing numbers. (Vectorized: one call per chunk)
+            chunk['Cycle_Time_Sec'] = chunk['Cycle_Time_Sec'].fillna(0)
+
+            # 3. LOAD: create the table like to_sql would, then one bulk insert per chunk
+            conn.execute(pd.io.sql.get_schema(chunk, TABLE).replace('CREATE TABLE', 'CREATE TABLE IF NOT EXISTS'))
+            placeholders = ', '.join('?' * len(columns))
+            conn.executemany(f'INSERT INTO "{TABLE}" VALUES ({placeholders})',
+                             chunk.itertuples(index=False, name=None))
+            inserted += len(chunk)
+
+    rows = (state['rows'] if state else 0) + inserted
+    return inserted, (end, fingerprint(path, end), rows, time.strftime('%Y-%m-%d %H:%M:%S'))
+
+
+def run_etl(db_path, sources, chunk_size=CHUNK_SIZE):
+    # Autocommit mode: the ETL transaction is opened and closed by hand (BEGIN IMMEDIATE below)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    first_run = not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'etl_sources'").fetchone()
+    conn.execute(STATE_SQL)
+    saved = {row[0]: {'offset': row[1], 'fingerprint': row[2], 'rows': row[3]}
+             for row in conn.execute("SELECT path, offset, fingerprint, rows FROM etl_sources")}
+
+    # Any source replaced or shorter than before? Then what we loaded is stale: reload everything.
+    full_reload = first_run
+    for path in sources:
+        state = saved.get(os.path.abspath(path))
+        size = os.path.getsize(path)
+        if not state:
+            continue
+        replaced = size < state['offset'] or fingerprint(path, state['offset']) != state['fingerprint']
+        if not replaced and size > state['offset'] and ends_mid_line(path, state['offset']):
+            # Our last line had no newline: new data must start with one, else that line was edited
+            with open(path, 'rb') as f:
+                f.seek(state['offset'])
+                replaced = f.read(1) != b'\n'
+        if replaced:
+            print(f"{path} was replaced -> full reload")
+            full_reload = True
+
+    started = time.perf_counter()
+    inserted = 0
+    # ONE transaction for the drop, the table, all rows and all offsets
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if full_reload:
+            conn.execute(f'DROP TABLE IF EXISTS "{TABLE}"')
+            conn.execute("DELETE FROM etl_sources")
+            saved = {}
+        for path in sources:
+            rows, new_state = load_source(conn, path, saved.get(os.path.abspath(path)), chunk_size)
+            if new_state:
+                conn.execute("INSERT OR REPLACE INTO etl_sources VALUES (?, ?, ?, ?, ?)",
+                             (os.path.abspath(path), *new_state))
+            inserted += rows
+            print(f"{path}: {rows} new rows")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        conn.close()
+        raise
+    seconds = time.perf_counter() - started
+
+    # Close the door
+    conn.close()
+    return inserted, seconds
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load new production log lines into the SQLite warehouse")
+    parser.add_argument('sources', nargs='*', default=['production_log.csv'], help="CSV files to load")
+    parser.add_argument('--db', default='factory_data.db')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    rows, seconds = run_etl(args.db, args.sources, args.chunk_size)
+    rate = rows / seconds if seconds > 0 else 0
+    print(f"Success! {rows} new rows moved from CSV to SQL Database in {seconds:.2f} s ({rate:,.0f} rows/s).")
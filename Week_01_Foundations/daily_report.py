@@ -1,42 +1,172 @@
 import pandas as pd
+import argparse
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-# 1. Load the Data
-# We use try/except just in case the file isn't found
-try:
-    df = pd.read_csv('production_log.csv', delimiter=',')
-    print("--- Raw Data Loaded Successfully ---")
-    print(df.head()) # Shows first 5 rows in the terminal
-except FileNotFoundError:
-    print("ERROR: Could not find production_log.csv. Make sure it is in the same folder as this script!")
-    exit()
+# --- CHUNKED MODE (for logs bigger than memory) ---
+# The normal path loads the whole CSV, then copies every RUN row before grouping.
+# With --chunksize the file is read a piece at a time (only the 4 needed columns,
+# with fixed types) and we only keep running totals per machine:
+#   parts sum, and the sum + count of RUN cycle times (average = sum / count at the end)
+# Memory stays the same whether the log is 1 MB or 10 GB.
+# With --workers the file is cut into byte ranges that are parsed in parallel processes.
 
-# 2. Clean the Data
-# Fill missing Cycle Times with 0 so math doesn't break
-df['Cycle_Time_Sec'] = df['Cycle_Time_Sec'].fillna(0)
+USECOLS = ['Machine_ID', 'Status', 'Cycle_Time_Sec', 'Parts_Produced']
+DTYPES = {'Status': 'category', 'Cycle_Time_Sec': 'float64', 'Parts_Produced': 'int64'}
+RANGE_BYTES = 64 * 1024 * 1024
 
-# 3. The Analysis (The "Pivot Table" replacement)
 
-# A. Total parts produced per Machine
-summary = df.groupby('Machine_ID')['Parts_Produced'].sum().reset_index()
+def build_report(df):
+    """
+    The in-memory analysis. Returns (summary, performance) DataFrames.
+    """
+    # 2. Clean the Data
+    # Fill missing Cycle Times with 0 so math doesn't break
+    has_cycle_times = 'Cycle_Time_Sec' in df
+    if has_cycle_times:
+        df['Cycle_Time_Sec'] = df['Cycle_Time_Sec'].fillna(0)
 
-# B. Calculate average cycle time (ONLY for 'RUN' status)
-# We filter for rows where Status is 'RUN', then group by Machine, then average the Cycle Time
-run_data = df[df['Status'] == 'RUN']
-performance = run_data.groupby('Machine_ID')['Cycle_Time_Sec'].mean().reset_index()
+    # 3. The Analysis (The "Pivot Table" replacement)
 
-# Rename the column to be clear
-performance.rename(columns={'Cycle_Time_Sec': 'Avg_Cycle_Time_Sec'}, inplace=True)
+    # A. Total parts produced per Machine
+    summary = df.groupby('Machine_ID')['Parts_Produced'].sum().reset_index()
 
-print("\n--- Production Summary ---")
-print(summary)
+    # B. Calculate average cycle time (ONLY for 'RUN' status)
+    # We filter for rows where Status is 'RUN', then group by Machine, then average the Cycle Time
+    run_data = df[df['Status'] == 'RUN']
+    if has_cycle_times:
+        performance = run_data.groupby('Machine_ID')['Cycle_Time_Sec'].mean().reset_index()
+        # Rename the column to be clear
+        performance.rename(columns={'Cycle_Time_Sec': 'Avg_Cycle_Time_Sec'}, inplace=True)
+    else:
+        # No cycle times in the archive: count the RUN events instead
+        performance = run_data.groupby('Machine_ID', observed=True).size().reset_index(name='Run_Events')
+    return summary, performance
 
-print("\n--- Average Cycle Time (Run Status Only) ---")
-print(performance)
 
-# 4. Export the Report
-# We will create a new Excel file with two sheets
-with pd.ExcelWriter('Shift_Report_Generated.xlsx') as writer:
-    summary.to_excel(writer, sheet_name='Production_Totals', index=False)
-    performance.to_excel(writer, sheet_name='Efficiency_Metrics', index=False)
+def partial_totals(chunk):
+    # Per-machine sums of one chunk, without copying the RUN rows
+    is_run = chunk['Status'] == 'RUN'
+    cycle = chunk['Cycle_Time_Sec'].fillna(0).where(is_run)  # non-RUN rows -> NaN -> not counted
+    parts = chunk.groupby('Machine_ID')['Parts_Produced'].sum()
+    run = cycle.groupby(chunk['Machine_ID']).agg(['sum', 'count'])
+    return parts, run[run['count'] > 0]
 
-print("\nSuccess! Report saved as 'Shift_Report_Generated.xlsx'")
\ No newline at end of file
+
+def combine(totals, partial):
+    parts, run = partial
+    if totals is None:
+        return parts, run
+    return totals[0].add(parts, fill_value=0), totals[1].add(run, fill_value=0)
+
+
+def byte_ranges(path, range_bytes=RANGE_BYTES):
+    """
+    Splits the file (after the header) into ranges of about 'range_bytes' that end on a newline.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        f.readline()  # header
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + range_bytes, size))
+            f.readline()  # move to the end of that line
+            end = min(f.tell(), size)
+            yield start, end
+            start = end
+
+
+def parse_range(args):
+    # Runs in a worker process: parse one byte range, return only its totals
+    path, start, end, columns = args
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    chunk = pd.read_csv(io.BytesIO(data), header=None, names=columns, usecols=USECOLS, dtype=DTYPES)
+    return partial_totals(chunk)
+
+
+def build_report_chunked(path, chunksize=1_000_000, workers=1):
+    """
+    Same (summary, performance) as build_report(pd.read_csv(path)), in constant memory.
+    """
+    totals = None
+    if workers > 1:
+        columns = list(pd.read_csv(path, nrows=0).columns)
+        tasks = ((path, start, end, columns) for start, end in byte_ranges(path))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for partial in pool.map(parse_range, tasks):
+                totals = combine(totals, partial)
+    else:
+        for chunk in pd.read_csv(path, usecols=USECOLS, dtype=DTYPES, chunksize=chunksize):
+            totals = combine(totals, partial_totals(chunk))
+
+    if totals is None:
+        return build_report(pd.read_csv(path, usecols=USECOLS))
+
+    parts, run = totals
+    summary = parts.astype('int64').sort_index().rename_axis('Machine_ID').reset_index()
+    performance = (run['sum'] / run['count']).sort_index().rename('Avg_Cycle_Time_Sec')
+    return summary, performance.rename_axis('Machine_ID').reset_index()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Production totals + cycle times per machine")
+    parser.add_argument('--csv', default='production_log.csv', help="Production log to analyse")
+    parser.add_argument('--chunksize', type=int, help="Chunked mode: rows per chunk (constant memory)")
+    parser.add_argument('--workers', type=int, default=1, help="Chunked mode: parse with N processes")
+    parser.add_argument('--verify', action='store_true', help="Also run the in-memory path and compare")
+    parser.add_argument('--archive', help="Read the Parquet archive folder (e.g. ../Week_02_AI_Integration/archive)")
+    parser.add_argument('--date', help="With --archive: report a single day (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    # 1. Load the Data
+    if args.archive:
+        # Parquet archive: read only the columns we need, and with --date only that
+        # day's folder (partition pruning). The archive has no cycle times.
+        filters = [('date', '==', args.date)] if args.date else None
+        df = pd.read_parquet(args.archive, columns=['Machine_ID', 'Status', 'Parts_Produced'], filters=filters)
+        print(f"--- Archive Loaded: {len(df)} events ---")
+        summary, performance = build_report(df)
+    elif args.chunksize or args.workers > 1:
+        if not os.path.exists(args.csv):
+            print(f"ERROR: Could not find {args.csv}.")
+            exit()
+        summary, performance = build_report_chunked(args.csv, args.chunksize or 1_000_000, args.workers)
+        print(f"--- Chunked Analysis Done ({os.path.getsize(args.csv) / 1e6:.0f} MB) ---")
+    else:
+        # We use try/except just in case the file isn't found
+        try:
+            df = pd.read_csv(args.csv, delimiter=',')
+            print("--- Raw Data Loaded Successfully ---")
+            print(df.head()) # Shows first 5 rows in the terminal
+        except FileNotFoundError:
+            print("ERROR: Could not find production_log.csv. Make sure it is in the same folder as this script!")
+            exit()
+        summary, performance = build_report(df)
+    seconds = time.perf_counter() - started
+
+    print("\n--- Production Summary ---")
+    print(summary)
+
+    print("\n--- Average Cycle Time (Run Status Only) ---")
+    print(performance)
+    print(f"\n(analysis took {seconds:.2f} s)")
+
+    if args.verify and not args.archive:
+        # The chunked path must give exactly what the in-memory path gives
+        expected = build_report(pd.read_csv(args.csv, usecols=USECOLS))  # other columns are never used
+        for name, got, want in zip(['Production_Totals', 'Efficiency_Metrics'], (summary, performance), expected):
+            pd.testing.assert_frame_equal(got, want)
+            print(f"Verified {name}: identical to the in-memory result")
+
+    # 4. Export the Report
+    # We will create a new Excel file with two sheets
+    with pd.ExcelWriter('Shift_Report_Generated.xlsx') as writer:
+        summary.to_excel(writer, sheet_name='Production_Totals', index=False)
+        performance.to_excel(writer, sheet_name='Efficiency_Metrics', index=False)
+
+    print("\nSuccess! Report saved as 'Shift_Report_Generated.xlsx'")
@@ -1,28 +1,45 @@
 import pandas as pd
+import argparse
 import os
 import random
 
+# Default: 7 small files (Monday to Sunday), one reading per machine per day.
+# For load tests, make a year of busy days, e.g.:
+#   python generate_week.py --days 365 --machines 20 --readings 480 --folder year_data
+parser = argparse.ArgumentParser(description="Create one CSV per day of fake production data")
+parser.add_argument('--days', type=int, default=7)
+parser.add_argument('--machines', type=int, default=3)
+parser.add_argument('--readings', type=int, default=1, help="Readings per machine per day (one per minute from 08:00)")
+parser.add_argument('--folder', default='weekly_data')
+args = parser.parse_args()
+
 # Create a folder for the raw files if it doesn't exist
-os.makedirs('weekly_data', exist_ok=True)
+os.makedirs(args.folder, exist_ok=True)
 
 # Machines
 machines = ['PRESS_01', 'CNC_02', 'WELD_03']
+machines += [f'LINE_{i:02d}' for i in range(len(machines) + 1, args.machines + 1)]
+machines = machines[:args.machines]
+
+# Generate one file per day
+for i in range(1, args.days + 1):
+    day = pd.Timestamp('2025-11-24 08:00:00') + pd.Timedelta(days=i)
+    times = [day + pd.Timedelta(minutes=m) for m in range(args.readings)]
+    rows = len(times) * len(machines)
 
-# Generate 7 files (simulating Monday to Sunday)
-for i in range(1, 8):
     # Create dummy data
     data = {
-        'Timestamp': [f'2025-11-{24+i} 08:00:00'] * 3,
-        'Machine_ID': machines,
-        'Parts_Produced': [random.randint(50, 150) for _ in range(3)],
-        'Scrap_Count': [random.randint(0, 10) for _ in range(3)]
+        'Timestamp': [t.strftime('%Y-%m-%d %H:%M:%S') for t in times for _ in machines],
+        'Machine_ID': machines * len(times),
+        'Parts_Produced': [random.randint(50, 150) for _ in range(rows)],
+        'Scrap_Count': [random.randint(0, 10) for _ in range(rows)]
     }
-    
+
     df = pd.DataFrame(data)
-    
+
     # Save as separate CSVs: day_1.csv, day_2.csv, etc.
-    filename = f'weekly_data/day_{i}.csv'
+    filename = f'{args.folder}/day_{i}.csv'
     df.to_csv(filename, index=False)
     print(f"Created: {filename}")
 
-print("Simulation Complete. 7 files created in 'weekly_data' folder.")
\ No newline at end of file
+print(f"Simulation Complete. {args.days} files created in '{args.folder}' folder.")
@@ -26,6 +26,9 @@ This application is split into two specialized modules:
    - Diagnoses machine faults using the Technical Manual.
    - Provides actionable maintenance steps (GPT-5.1).
 
+**3. 🔎 Event Browser**
+   - Page through every production event (filter by machine, status, dates).
+
 ---
 **👈 Please select a module from the sidebar to begin.**
 """)
\ No newline at end of file
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from manual_index import chunk_hash, default_index_dir
+from retrieval import normalize
+
+# --- SEMANTIC ANSWER CACHE ---
+# Technicians ask the same things every shift ("how do I fix E-404?"), worded slightly
+# differently. If a new question's embedding is very close to a cached question AND the
+# manual section the answer was based on is unchanged, we reuse the cached answer
+# instead of paying for another chat completion.
+# - LRU: at most 'max_entries' answers, least recently used are dropped first
+# - TTL: answers older than 'ttl' seconds are not reused
+# - Saved to JSON next to the manual index; thrown away when the manual file changes
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class SemanticAnswerCache:
+
+    def __init__(self, path, manual_hash, threshold=0.95, max_entries=500, ttl=7 * 24 * 3600):
+        self.path = path
+        self.manual_hash = manual_hash
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.lock = threading.Lock()
+
+        self.entries = OrderedDict()  # question -> entry dict, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+
+        self._load()
+        self._rebuild_matrix()
+
+    @classmethod
+    def for_manual(cls, manual_path, **options):
+        path = os.path.join(default_index_dir(manual_path), "answer_cache.json")
+        return cls(path, file_hash(manual_path), **options)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as f:
+            saved = json.load(f)
+        # Manual edited since the answers were cached -> start fresh
+        if saved.get("manual_hash") != self.manual_hash:
+            return
+        for entry in saved["entries"]:
+            self.entries[entry["question"]] = entry
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".tmp", "w") as f:
+            json.dump({"manual_hash": self.manual_hash, "entries": list(self.entries.values())}, f)
+        os.replace(self.path + ".tmp", self.path)
+
+    def _rebuild_matrix(self):
+        # All cached question vectors in one matrix -> one dot product per lookup
+        self.questions = list(self.entries)
+        vectors = [self.entries[q]["embedding"] for q in self.questions]
+        self.matrix = normalize(vectors) if vectors else None
+
+    def _expire(self):
+        now = time.time()
+        expired = [q for q, entry in self.entries.items() if now - entry["created"] > self.ttl]
+        for question in expired:
+            del self.entries[question]
+        return bool(expired)
+
+    def lookup(self, query_vector, source_chunk):
+        """
+        Returns a cached answer or None. 'source_chunk' is the manual section retrieved
+        for the new question - the cached answer must have been based on the same text.
+        """
+        with self.lock:
+            if self._expire():
+                self._rebuild_matrix()
+
+            if self.matrix is not None:
+                similarities = self.matrix @ normalize(query_vector)
+                best = int(np.argmax(similarities))
+                entry = self.entries[self.questions[best]]
+                if similarities[best] >= self.threshold and entry["source_hash"] == chunk_hash(source_chunk):
+                    self.entries.move_to_end(self.questions[best])
+                    self.hits += 1
+                    self.seconds_saved += entry["seconds"]
+                    return entry["answer"]
+
+            self.misses += 1
+            return None
+
+    def store(self, question, query_vector, source_chunk, answer, seconds):
+        """
+        Caches an answer. 'seconds' = how long the LLM took (credited as saved on every hit).
+        """
+        with self.lock:
+            self.entries[question] = {
+                "question": question,
+                "embedding": [float(x) for x in query_vector],
+                "source_hash": chunk_hash(source_chunk),
+                "answer": answer,
+                "seconds": seconds,
+                "created": time.time(),
+            }
+            self.entries.move_to_end(question)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._rebuild_matrix()
+            self._save()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "seconds_saved": self.seconds_saved,
+        }
@@ -0,0 +1,126 @@
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from db import DB_PATH, connect_writer
+from shifts import get_current_shift_start
+
+# --- ARCHIVE TIER (Parquet) ---
+# production_logs only needs the shift that is still running. Closed shifts are moved
+# ("compacted") into Parquet files, partitioned by day and machine:
+#   archive/date=2025-11-24/machine=PRESS_01/part-<first Event_ID>.parquet
+# - Column format: a report that needs 2 columns reads 2 columns (projection)
+# - Folder names are filters: "PRESS_01, last week" opens only those folders (partition pruning)
+# - Compressed: far smaller than CSV/SQLite, no text parsing on load
+# The rollup tables keep their totals for archived shifts (note: rollups.rebuild() only
+# sees the rows still in SQLite, so don't rebuild after compacting).
+
+ARCHIVE_DIR = os.getenv("FACTORY_ARCHIVE", "archive")
+
+ARCHIVE_COLUMNS = ["Event_ID", "Timestamp", "Machine_ID", "Status", "Parts_Produced", "Scrap_Count"]
+
+
+def local_midnight(day):
+    return int(time.mktime(day.timetuple()))
+
+
+def write_day(df, day, archive_dir=ARCHIVE_DIR):
+    """
+    Writes events of one local calendar day, one file per machine. The file is named
+    after its first Event_ID, so re-archiving the same rows overwrites the same file.
+    """
+    for machine, part in df.groupby("Machine_ID", sort=False, observed=True):
+        folder = os.path.join(archive_dir, f"date={day.isoformat()}", f"machine={machine}")
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"part-{int(part['Event_ID'].iloc[0])}.parquet")
+        part[ARCHIVE_COLUMNS].to_parquet(path + ".tmp", index=False, compression="zstd")
+        os.replace(path + ".tmp", path)
+
+
+def compact_closed_shifts(db_path=DB_PATH, archive_dir=ARCHIVE_DIR, verbose=True):
+    """
+    Moves every event older than the current shift from SQLite to the archive,
+    one day at a time. Returns the number of rows moved.
+    """
+    conn = connect_writer(db_path)
+    cutoff = int(get_current_shift_start()[0].timestamp())
+    moved = 0
+    try:
+        oldest = conn.execute("SELECT MIN(Timestamp) FROM production_logs").fetchone()[0]
+        if oldest is None or oldest >= cutoff:
+            return 0
+
+        day = datetime.fromtimestamp(oldest).date()
+        while local_midnight(day) < cutoff:
+            start = local_midnight(day)
+            end = min(local_midnight(day + timedelta(days=1)), cutoff)
+            df = pd.read_sql_query(
+                f"SELECT {', '.join(ARCHIVE_COLUMNS)} FROM production_logs "
+                "WHERE Timestamp >= ? AND Timestamp < ? ORDER BY Event_ID",
+                conn, params=(start, end),
+            )
+            if len(df):
+                # Files first, then delete: a crash in between only means the next run rewrites them
+                write_day(df, day, archive_dir)
+                with conn:
+                    conn.execute("DELETE FROM production_logs WHERE Timestamp >= ? AND Timestamp < ?", (start, end))
+                moved += len(df)
+                if verbose:
+                    print(f"Archived {day}: {len(df)} events")
+            day += timedelta(days=1)
+    finally:
+        conn.close()
+    return moved
+
+
+def read_archive(columns=None, start=None, end=None, machines=None, archive_dir=ARCHIVE_DIR):
+    """
+    Loads archived events as a DataFrame.
+    - columns: only these columns are read from disk (None = all)
+    - start / end: datetimes; whole days outside the range are never opened
+    - machines: list of Machine_IDs; other machines' folders are never opened
+    """
+    columns = list(columns) if columns else list(ARCHIVE_COLUMNS)
+    if not os.path.isdir(archive_dir):
+        return pd.DataFrame(columns=columns)
+
+    # Partition filters (folder names) + a row filter on Timestamp
+    filters = []
+    if start is not None:
+        filters.append(("date", ">=", start.date().isoformat()))
+        filters.append(("Timestamp", ">=", int(start.timestamp())))
+    if end is not None:
+        filters.append(("date", "<=", end.date().isoformat()))
+        filters.append(("Timestamp", "<", int(end.timestamp())))
+    if machines:
+        filters.append(("machine", "in", list(machines)))
+
+    return pd.read_parquet(archive_dir, engine="pyarrow", columns=columns, filters=filters or None)
+
+
+def load_events(conn, columns, start, end, archive_dir=ARCHIVE_DIR):
+    """
+    Events between two datetimes from wherever they live: the archive (closed shifts)
+    plus production_logs (the running shift, or anything not compacted yet).
+    """
+    archived = read_archive(columns, start, end, archive_dir=archive_dir)
+    live = pd.read_sql_query(
+        f"SELECT {', '.join(columns)} FROM production_logs WHERE Timestamp >= ? AND Timestamp < ?",
+        conn, params=(int(start.timestamp()), int(end.timestamp())),
+    )
+    frames = [df for df in (archived, live) if len(df)]
+    return pd.concat(frames, ignore_index=True) if frames else live
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move closed shifts from SQLite to the Parquet archive")
+    parser.add_argument('--db', default=DB_PATH, help="SQLite database file")
+    parser.add_argument('--archive', default=ARCHIVE_DIR, help="Archive folder")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    rows = compact_closed_shifts(args.db, args.archive)
+    print(f"--- 🗄️ {rows} events archived to '{args.archive}' in {time.perf_counter() - t0:.2f} s ---")
@@ -3,18 +3,21 @@ import pandas as pd
 import os
 from dotenv import load_dotenv
 from openai import OpenAI
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-import matplotlib.pyplot as plt
 
 from pypdf import PdfReader
 
 from fpdf import FPDF
 import base64
 
+import charts
+import instrumentation
+from manual_index import EMBEDDING_MODEL, ManualIndex
+from paging import show_page
+
 # --- 1. SETUP & CONFIG ---
 st.set_page_config(layout="wide", page_title="Industrial AI Cockpit")
 load_dotenv()
+instrumentation.start_run("Super App")
 
 # Initialize AI Client
 try:
@@ -23,28 +26,20 @@ except:
     st.error("OpenAI API Key not found. Please check your .env file.")
 
 # --- 2. THE INTELLIGENCE ENGINE (RAG Function) ---
-def get_ai_response(user_query, manual_text):
-    # A. Chunking
-    chunks = [c.strip() for c in manual_text.split("\n\n") if c.strip()]
-    
-    # B. Embedding Helper
-    def get_embedding(text):
-        return client.embeddings.create(input=text, model="text-embedding-3-small").data[0].embedding
+@st.cache_resource
+def get_manual_index(manual_path, manual_mtime):
+    # A. Chunking + B. Embeddings: done ONCE and saved next to the manual (see manual_index.py).
+    # The mtime in the cache key means an edited manual only re-embeds the changed chunks.
+    return ManualIndex.load_or_build(manual_path, client)
 
+def get_ai_response(user_query, manual_index):
     # C. Vector Search
-    # 1. Embed the user's question
-    q_vector = get_embedding(user_query)
-    # 2. Embed the manual chunks (In real life, we cache this!)
-    chunk_embeddings = [get_embedding(c) for c in chunks]
-    
-    # 3. Convert to Numpy Arrays (The Fix!)
-    q_array = np.array(q_vector).reshape(1, -1)
-    chunks_array = np.array(chunk_embeddings)
-    
-    # 4. Find Match
-    similarities = cosine_similarity(q_array, chunks_array)[0]
-    best_index = np.argmax(similarities)
-    best_chunk = chunks[best_index]
+    # 1. Embed the user's question (the only embedding call per question)
+    with instrumentation.timer("embed_question"):
+        q_vector = client.embeddings.create(input=user_query, model=EMBEDDING_MODEL).data[0].embedding
+    # 2. Find Match: one matrix-vector product against the cached chunk matrix
+    with instrumentation.timer("vector_search"):
+        best_chunk, _ = manual_index.search(q_vector)[0]
     
     # D. Generate Answer with GPT-5
     prompt = f"""
@@ -58,14 +53,16 @@ def get_ai_response(user_query, manual_text):
     {user_query}
     """
     
-    response = client.chat.completions.create(
-        model="gpt-5.1", # <--- NEW
-        messages=[{"role": "user", "content": prompt}]
-    )
+    with instrumentation.timer("llm_answer"):
+        response = client.chat.completions.create(
+            model="gpt-5.1", # <--- NEW
+            messages=[{"role": "user", "content": prompt}]
+        )
     
     return response.choices[0].message.content, best_chunk
 
 
+@instrumentation.timed("pdf")
 def create_pdf(total_parts, scrap_rate, advice):
     pdf = FPDF()
     pdf.add_page()
@@ -106,7 +103,8 @@ with col1:
     
     if uploaded_file:
         # Load Data
-        df = pd.read_csv(uploaded_file)
+        with instrumentation.timer("csv_load"):
+            df = pd.read_csv(uploaded_file)
         
         # KPI Cards
         kpi1, kpi2, kpi3 = st.columns(3)
@@ -122,23 +120,17 @@ with col1:
         # Charts
         st.subheader("Production by Machine")
 
-        # Create a custom chart figure
-        fig, ax = plt.subplots()
-
-        # Plot the data with a specific color (Hex code for Orange is #FFA500)
-        # You can also use 'red', 'green', 'purple', etc.
-        df.groupby("Machine_ID")["Parts_Produced"].sum().plot(kind='bar', ax=ax, color='#FFA500')
-
-        # Add labels to make it professional
-        plt.ylabel("Total Output")
-        plt.title("Production Volume per Machine")
-
-        # Display it in Streamlit
-        st.pyplot(fig)
+        with instrumentation.timer("chart_render"):
+            # Plot the data with a specific color (Hex code for Orange is #FFA500)
+            # You can also use 'red', 'green', 'purple', etc.
+            # The chart is cached on the per-machine totals, so reruns with the same file
+            # (every button click) don't redraw it (see charts.py)
+            charts.bar_chart(st, df.groupby("Machine_ID")["Parts_Produced"].sum(), color='#FFA500',
+                             ylabel="Total Output", title="Production Volume per Machine")
         
-        # Raw Data Expander
+        # Raw Data Expander (one page at a time, see paging.py)
         with st.expander("View Raw Logs"):
-            st.dataframe(df)
+            show_page(st, df, key="raw_logs_page")
 
         # === NEW PDF BUTTON HERE ===
         st.divider() # Adds a nice line
@@ -171,10 +163,6 @@ with col2:
 
     # Check if manual exists
     if os.path.exists(manual_path):
-        # Read the manual
-        with open(manual_path, "r") as f:
-            manual_text = f.read()
-            
         # Chat Input
         user_question = st.text_area("Question:", height=100, placeholder="e.g., How do I fix Error E-404?")
         
@@ -182,7 +170,9 @@ with col2:
             if user_question:
                 with st.spinner("Searching manual..."):
                     try:
-                        answer, source = get_ai_response(user_question, manual_text)
+                        with instrumentation.timer("load_index"):
+                            manual_index = get_manual_index(manual_path, os.path.getmtime(manual_path))
+                        answer, source = get_ai_response(user_question, manual_index)
                         
                         st.success("Analysis Complete:")
                         st.write(answer)
@@ -194,4 +184,8 @@ with col2:
             else:
                 st.warning("Please type a question.")
     else:
-        st.error("⚠️ 'machine_manual.txt' not found in this folder.")
\ No newline at end of file
+        st.error("⚠️ 'machine_manual.txt' not found in this folder.")
+
+# --- 4. TIMINGS (FACTORY_INSTRUMENT=1, see instrumentation.py) ---
+instrumentation.finish_run()
+instrumentation.sidebar_panel("Super App")
@@ -0,0 +1,50 @@
+import io
+import os
+from functools import lru_cache
+
+import pandas as pd
+from matplotlib.figure import Figure
+
+# --- CHART LAYER ---
+# plt.subplots() + st.pyplot() on every rerun registers a new figure with pyplot that is
+# never closed (memory grows with every Live Mode refresh), and redraws the chart even
+# when the numbers are the same. Here:
+# - figures are plain matplotlib Figure objects: not tracked by pyplot, freed with the last reference
+# - the rendered PNG is memoized on the aggregated data itself (labels + values + styling),
+#   so a rerun with unchanged totals costs a dict lookup; the LRU bound keeps memory flat
+# - FACTORY_CHARTS=native draws with st.bar_chart instead (Vega-Lite in the browser,
+#   nothing rendered on the server at all)
+
+CHART_BACKEND = os.getenv("FACTORY_CHARTS", "matplotlib")
+CACHED_CHARTS = 64
+
+
+@lru_cache(maxsize=CACHED_CHARTS)
+def bar_chart_png(labels, values, color="#FFA500", ylabel=None, title=None, rotation=90):
+    """
+    PNG bytes of a bar chart. Arguments must be hashable (tuples), they are the cache key.
+    """
+    fig = Figure()
+    ax = fig.subplots()
+    pd.Series(values, index=labels).plot(kind='bar', ax=ax, color=color)
+    if ylabel:
+        ax.set_ylabel(ylabel)
+    if title:
+        ax.set_title(title)
+    ax.tick_params(axis='x', labelrotation=rotation)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def bar_chart(container, series, color="#FFA500", ylabel=None, title=None, rotation=90, backend=None):
+    """
+    Draws 'series' (index = bar labels) into a Streamlit container (st, a column, ...).
+    """
+    if (backend or CHART_BACKEND) == "native":
+        if title:
+            container.caption(title)
+        container.bar_chart(series, color=color, y_label=ylabel)
+        return
+    png = bar_chart_png(tuple(map(str, series.index)), tuple(series.tolist()), color, ylabel, title, rotation)
+    container.image(png)
@@ -1,40 +1,44 @@
-import pandas as pd
-import os
 from dotenv import load_dotenv
-from openai import OpenAI
+
+from llm_client import StreamMetrics, get_llm_client, print_stream
+from log_analyst import LogAnalyst, load_log
 
 # 1. Setup
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Shared async client: the answer is printed token by token as it arrives (see llm_client.py)
+llm = get_llm_client()
 
 print("--- Loading Factory Data ---")
 
 # 2. Load the Data from Week 1
 # We go "up one level" (..) then down into Week_01
 try:
-    df = pd.read_csv('../Week_01_Foundations/production_log.csv')
+    df = load_log('../Week_01_Foundations/production_log.csv')
     print("Data Loaded Successfully.")
 except FileNotFoundError:
     print("Error: Could not find the CSV. Check your folder structure!")
     exit()
 
 # 3. Prepare the Context (The "Briefing")
-# We convert the dataframe to a string so the AI can read it.
-# To save money/tokens, we only send the column names and the first 20 rows.
-# For small files (like ours), we can send the whole thing.
-csv_context = df.to_markdown(index=False)
+# The AI does NOT get the raw rows (millions of them would not fit in a prompt).
+# It gets a short summary - columns, time range, totals per machine/status - and a tool
+# to request any other aggregation, which pandas computes here (see log_analyst.py).
+# The prompt is about the same size for 10 rows or 10 million.
+analyst = LogAnalyst(df)
+csv_context = analyst.summary()
 
 system_prompt = f"""
 You are an AI Data Analyst for a Manufacturing Plant.
-You have access to the following production logs:
+Here is a summary of the production logs:
 
 {csv_context}
 
 Rules:
 1. Answer based ONLY on this data.
-2. If the user asks for calculations (sums, averages), perform them accurately.
+2. For any number not in the summary, call the aggregate_log tool - never guess.
 3. Be concise and professional.
 """
+print(f"Briefing: {len(system_prompt):,} characters for {len(df):,} rows.")
 
 # 4. The Chat Loop
 print("\n--- AI Analyst Ready (Type 'exit' to stop) ---")
@@ -46,14 +50,16 @@ while True:
         print("Closing session.")
         break
         
-    # Send to GPT-5
-    response = client.chat.completions.create(
-        model="gpt-5",
-        messages=[
+    # Send to GPT-5 (streamed)
+    metrics = StreamMetrics()
+    print_stream(llm.stream_chat(
+        [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_question}
-        ]
-    )
-    
-    answer = response.choices[0].message.content
-    print(f"AI: {answer}")
\ No newline at end of file
+        ],
+        model="gpt-5",
+        metrics=metrics,
+        tools=analyst.tools(),
+        run_tool=analyst.run_tool,
+    ))
+    print(f"({metrics.summary()})")
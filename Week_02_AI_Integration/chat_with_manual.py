@@ -1,40 +1,33 @@
 import os
 from dotenv import load_dotenv
 from openai import OpenAI
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+
+from llm_client import StreamMetrics, get_llm_client, print_stream
+from manual_index import EMBEDDING_MODEL, ManualIndex
 
 # 1. Setup
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))  # bulk indexing (threaded batches)
+llm = get_llm_client()  # questions + streamed answers (see llm_client.py)
 
 print("--- Indexing Knowledge Base ---")
 
-# 2. Load and Chunk the Manual
-# We split the manual into "Sections" so we can search them individually.
-with open("machine_manual.txt", "r") as f:
-    text = f.read()
+# 2. + 3. Chunk the Manual and Create Embeddings (Turn Text into Numbers)
+# The manual is split into paragraphs and embedded in batches by several workers at once.
+# Results are saved to 'machine_manual_index/': the next start only embeds paragraphs
+# that changed, and an interrupted build continues where it stopped (see manual_index.py).
+# Offline testing: run fake_openai_server.py and set OPENAI_BASE_URL=http://127.0.0.1:8765/v1
+def show_progress(done, total):
+    print(f"  Embedded {done}/{total} sections", end="\r")
 
-# Split by double newlines (paragraphs)
-chunks = text.split("\n\n")
-chunks = [c.strip() for c in chunks if c.strip()] # Clean up empty lines
+index = ManualIndex.load_or_build("machine_manual.txt", client, progress=show_progress)
+chunks = index.chunks
 
 print(f"Found {len(chunks)} sections in the manual.")
 
-# 3. Create Embeddings (Turn Text into Numbers)
-# We ask OpenAI to convert our text chunks into vector lists
+# Helper for the questions (one request per question)
 def get_embedding(text):
-    response = client.embeddings.create(
-        input=text,
-        model="text-embedding-3-small" # Efficient and cheap model
-    )
-    return response.data[0].embedding
-
-# Store the vectors in memory (In a real app, this goes into a Vector DB like Pinecone)
-chunk_embeddings = []
-for chunk in chunks:
-    vector = get_embedding(chunk)
-    chunk_embeddings.append(vector)
+    return llm.embed(text, EMBEDDING_MODEL) # Efficient and cheap model
 
 print("Knowledge Base Indexed! Ready for questions.")
 
@@ -50,21 +43,13 @@ while True:
     question_vector = get_embedding(question)
 
     # B. Find the Best Match (Cosine Similarity)
-    # Compare the question vector to all manual vectors
-    # Convert lists to Numpy Arrays explicitly
-    # .reshape(1, -1) ensures the question is a "Row", not a flat line.
-    q_array = np.array(question_vector).reshape(1, -1)
-    chunks_array = np.array(chunk_embeddings)
-
-    similarities = cosine_similarity(q_array, chunks_array)[0]
-    
-    # Get the index of the highest score
-    best_index = np.argmax(similarities)
-    best_chunk = chunks[best_index]
+    # The index keeps unit-length vectors, so comparing the question with every
+    # manual section is one dot product (see retrieval.py)
+    best_chunk, score = index.search(question_vector)[0]
     
     # C. Send ONLY the Best Chunk to GPT-5
     # This saves money and improves accuracy
-    print(f"(Found relevant section: {best_chunk[:30]}...)") # Debug info
+    print(f"(Found relevant section: {best_chunk[:30]}... | similarity {score:.2f})") # Debug info
     
     prompt = f"""
     You are an expert maintenance assistant. 
@@ -77,9 +62,7 @@ while True:
     {question}
     """
     
-    response = client.chat.completions.create(
-        model="gpt-5",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    
-    print(f"AI: {response.choices[0].message.content}")
\ No newline at end of file
+    # Streamed: the first words appear while the rest is still being generated
+    metrics = StreamMetrics()
+    print_stream(llm.stream_chat([{"role": "user", "content": prompt}], model="gpt-5", metrics=metrics))
+    print(f"({metrics.summary()})")
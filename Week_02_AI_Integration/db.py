@@ -0,0 +1,82 @@
+import os
+import sqlite3
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from schema import create_schema
+
+# --- SHARED DATABASE ACCESS ---
+# The simulator (writer) and the dashboard (readers) use the same SQLite file at the same time.
+# With the default "rollback journal" a write locks out every reader and vice versa,
+# which is where "database is locked" comes from. In WAL mode readers see the last
+# committed snapshot while the writer keeps appending.
+
+DB_PATH = os.getenv("FACTORY_DB", "factory.db")
+
+# Applied to every connection (readers and writer)
+CONNECTION_PRAGMAS = {
+    'busy_timeout': 5000,        # wait up to 5 s for a lock instead of failing immediately
+    'cache_size': -64000,        # 64 MB page cache (negative = KiB)
+    'mmap_size': 268435456,      # read through a 256 MB memory map instead of read() calls
+    'temp_store': 'MEMORY',      # GROUP BY / ORDER BY temp tables in RAM
+}
+
+# Writer only: WAL is stored in the file, NORMAL sync is safe in WAL mode (no corruption,
+# only the last transactions can be lost on power failure) and much cheaper than FULL.
+WRITER_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+}
+
+
+def apply_pragmas(conn, pragmas):
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def connect_writer(db_path=DB_PATH):
+    """
+    Read/write connection for the simulator and ETL jobs. Creates/migrates the schema.
+    """
+    conn = sqlite3.connect(db_path, timeout=CONNECTION_PRAGMAS['busy_timeout'] / 1000)
+    apply_pragmas(conn, WRITER_PRAGMAS)
+    apply_pragmas(conn, CONNECTION_PRAGMAS)
+    create_schema(conn)
+    return conn
+
+
+def connect_reader(db_path=DB_PATH):
+    """
+    Read-only connection (opened with mode=ro, plus query_only as a second safety net).
+    """
+    uri = f"file:{os.path.abspath(db_path)}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, timeout=CONNECTION_PRAGMAS['busy_timeout'] / 1000,
+                           check_same_thread=False)
+    apply_pragmas(conn, CONNECTION_PRAGMAS)
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def ensure_database(db_path=DB_PATH):
+    # A read-only connection can't create the file or switch it to WAL,
+    # so make sure both happened once (the simulator may not have started yet).
+    conn = connect_writer(db_path)
+    conn.close()
+
+
+def get_read_engine(db_path=DB_PATH, pool_size=5):
+    """
+    SQLAlchemy engine for the dashboard: a pool of read-only connections.
+    Create it once per server (st.cache_resource) and share it across sessions.
+    """
+    ensure_database(db_path)
+    # "sqlite://" + creator: SQLAlchemy only provides the pool, connect_reader opens the file.
+    # QueuePool must be explicit, otherwise SQLAlchemy assumes an in-memory database.
+    return create_engine(
+        "sqlite://",
+        creator=lambda: connect_reader(db_path),
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=pool_size,
+    )
@@ -0,0 +1,123 @@
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+# --- BATCHED EMBEDDING PIPELINE ---
+# One API call per paragraph means one network round trip per paragraph.
+# The embeddings endpoint accepts a LIST of texts, so we:
+# 1. group chunks into batches that stay under a token budget,
+# 2. send several batches at once from a small thread pool,
+# 3. retry failed batches with exponential backoff,
+# 4. append every finished batch to a journal file, so an interrupted build resumes.
+
+# Optional: exact token counts. Without tiktoken we use the usual ~4 characters per token.
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except ImportError:
+    _ENCODING = None
+
+MAX_TOKENS_PER_BATCH = 8000
+MAX_ITEMS_PER_BATCH = 2048   # API limit on inputs per request
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+
+def estimate_tokens(text):
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return len(text) // 4 + 1
+
+
+def make_batches(items, max_tokens=MAX_TOKENS_PER_BATCH, max_items=MAX_ITEMS_PER_BATCH):
+    """
+    Groups (key, text) pairs into lists whose estimated token total stays under 'max_tokens'.
+    A single text larger than the budget gets a batch of its own.
+    """
+    batches, current, current_tokens = [], [], 0
+    for key, text in items:
+        tokens = estimate_tokens(text)
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append((key, text))
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def embed_with_retry(client, texts, model, retries=5, base_delay=0.5):
+    for attempt in range(retries + 1):
+        try:
+            response = client.embeddings.create(input=texts, model=model)
+            return [item.embedding for item in response.data]
+        except RETRYABLE_ERRORS:
+            if attempt == retries:
+                raise
+            # 0.5 s, 1 s, 2 s, ... plus jitter so parallel workers don't retry in lockstep
+            time.sleep(base_delay * 2 ** attempt * (1 + random.random()))
+
+
+class EmbeddingJournal:
+    """
+    Append-only JSONL file of {"key": ..., "embedding": [...]} lines.
+    Every finished batch is written and flushed immediately; a half-written last line
+    (crash mid-write) is ignored on load.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        done = {}
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                done[entry["key"]] = entry["embedding"]
+        return done
+
+    def append(self, keys, embeddings):
+        with open(self.path, "a") as f:
+            for key, embedding in zip(keys, embeddings):
+                f.write(json.dumps({"key": key, "embedding": embedding}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def embed_all(client, items, model, journal_path, workers=4, max_tokens=MAX_TOKENS_PER_BATCH, progress=None):
+    """
+    Embeds (key, text) pairs and returns {key: embedding}.
+    Keys already in the journal (from an earlier, interrupted run) are not sent again.
+    """
+    journal = EmbeddingJournal(journal_path)
+    results = journal.load()
+    todo = [(key, text) for key, text in items if key not in results]
+    batches = make_batches(todo, max_tokens=max_tokens)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(embed_with_retry, client, [t for _, t in batch], model): batch
+                   for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            keys = [key for key, _ in batch]
+            embeddings = future.result()
+            # Only this (main) thread writes the journal
+            journal.append(keys, embeddings)
+            results.update(zip(keys, embeddings))
+            if progress:
+                progress(len(results), len(items))
+
+    return results
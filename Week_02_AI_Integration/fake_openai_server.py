@@ -0,0 +1,163 @@
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# --- FAKE OPENAI SERVER (offline testing) ---
+# Speaks just enough of the OpenAI HTTP API for our scripts:
+#   POST /v1/embeddings       -> deterministic vectors (same text = same vector)
+#   POST /v1/chat/completions -> a canned answer, streamed word by word when stream=true
+#                                (with tools: first calls the first tool with {}, then answers)
+# Point any script at it with:
+#   OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake python chat_with_manual.py
+# Latency per request / per input and a random 429 rate simulate a real network + rate limits.
+
+
+def fake_embedding(text, dim):
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    # Set by make_server()
+    settings = {}
+
+    def log_message(self, format, *args):
+        pass  # keep the terminal quiet
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if random.random() < self.settings["fail_rate"]:
+            self.send_json(429, {"error": {"message": "Rate limit (simulated)", "type": "rate_limit_error"}})
+            return
+
+        if self.path.endswith("/embeddings"):
+            self.handle_embeddings(request)
+        elif self.path.endswith("/chat/completions"):
+            self.handle_chat(request)
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def handle_embeddings(self, request):
+        inputs = request["input"]
+        if isinstance(inputs, str):
+            inputs = [inputs]
+
+        # A real API costs a round trip per request plus a little per input
+        time.sleep(self.settings["latency"] + self.settings["per_item_latency"] * len(inputs))
+
+        self.send_json(200, {
+            "object": "list",
+            "model": request.get("model", "fake"),
+            "data": [
+                {"object": "embedding", "index": i, "embedding": fake_embedding(text, self.settings["dim"])}
+                for i, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        })
+
+
+    def handle_chat(self, request):
+        question = request["messages"][-1]["content"]
+        words = f"(fake answer) You asked about: {' '.join(question.split()[-40:])}".split(" ")
+        model = request.get("model", "fake")
+
+        # Time to first token: the model "thinking" before it starts writing
+        time.sleep(self.settings["first_token_delay"])
+
+        if not request.get("stream"):
+            time.sleep(self.settings["token_delay"] * len(words))
+            self.send_json(200, {
+                "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": " ".join(words)}}],
+            })
+            return
+
+        # Server-sent events, one chunk per word, like the real streaming API
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+
+        # Tools offered and no tool result yet -> ask for one (default arguments)
+        if request.get("tools") and request["messages"][-1]["role"] != "tool":
+            call = {"index": 0, "id": "call_fake", "type": "function",
+                    "function": {"name": request["tools"][0]["function"]["name"], "arguments": "{}"}}
+            chunk = {
+                "id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "finish_reason": "tool_calls",
+                             "delta": {"role": "assistant", "tool_calls": [call]}}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+            self.wfile.flush()
+            return
+
+        for i, word in enumerate(words):
+            chunk = {
+                "id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "finish_reason": None,
+                             "delta": {"role": "assistant", "content": word if i == 0 else " " + word}}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(self.settings["token_delay"])
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def make_server(port=8765, latency=0.05, per_item_latency=0.0005, fail_rate=0.0, dim=1536,
+                first_token_delay=0.5, token_delay=0.02):
+    FakeOpenAIHandler.settings = {
+        "latency": latency,
+        "per_item_latency": per_item_latency,
+        "fail_rate": fail_rate,
+        "dim": dim,
+        "first_token_delay": first_token_delay,
+        "token_delay": token_delay,
+    }
+    return ThreadingHTTPServer(("127.0.0.1", port), FakeOpenAIHandler)
+
+
+def start_in_background(**kwargs):
+    """
+    Starts the server on a thread (port 0 = pick a free port). Returns (server, base_url).
+    """
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI API")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help="Seconds per request")
+    parser.add_argument('--per-item-latency', type=float, default=0.0005, help="Extra seconds per input text")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument('--dim', type=int, default=1536, help="Embedding size")
+    parser.add_argument('--first-token-delay', type=float, default=0.5, help="Chat: seconds before the first token")
+    parser.add_argument('--token-delay', type=float, default=0.02, help="Chat: seconds between streamed tokens")
+    args = parser.parse_args()
+
+    server = make_server(args.port, args.latency, args.per_item_latency, args.fail_rate, args.dim,
+                         args.first_token_delay, args.token_delay)
+    print(f"--- 🧪 Fake OpenAI API on http://127.0.0.1:{args.port}/v1 (Ctrl+C to stop) ---")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
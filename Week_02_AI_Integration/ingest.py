@@ -0,0 +1,107 @@
+import time
+
+import rollups
+from db import connect_writer
+from schema import INSERT_SQL
+
+# --- INGEST ENGINE ---
+# Writing one row per transaction is the slowest thing you can do to SQLite:
+# every commit is a disk sync. Instead we collect events in a plain list of
+# tuples and write them in one go with executemany() inside ONE transaction.
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile (pct between 0 and 100). Returns 0 for an empty list.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = int(round(pct / 100 * (len(ordered) - 1)))
+    return ordered[rank]
+
+
+class BufferedWriter:
+    """
+    Collects events in memory and flushes them to 'production_logs' when either:
+    - the buffer holds 'batch_size' rows, or
+    - 'flush_interval' seconds have passed since the last flush.
+    Each event is a tuple: (Timestamp [epoch sec], Machine_ID, Status, Parts_Produced, Scrap_Count)
+    """
+
+    def __init__(self, db_path, batch_size=500, flush_interval=1.0, connect=connect_writer):
+        # connect_writer: WAL + tuned pragmas, creates/migrates the table on first run
+        self.conn = connect(db_path)
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.last_flush = time.perf_counter()
+
+        # Stats for the throughput report
+        self.started = time.perf_counter()
+        self.rows_written = 0
+        self.flush_latencies = []
+
+    def add(self, event):
+        self.buffer.append(event)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush_if_due(self):
+        # Time threshold: called by the producer loop even when no events arrive
+        if self.buffer and time.perf_counter() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self.last_flush = time.perf_counter()
+        if not self.buffer:
+            return 0
+
+        rows = self.buffer
+        self.buffer = []
+
+        t0 = time.perf_counter()
+        # 'with conn' = one transaction: commit on success, rollback on error.
+        # The rollup tables are updated in the same transaction, so they never disagree with the raw rows.
+        with self.conn:
+            self.conn.executemany(INSERT_SQL, rows)
+            rollups.apply_events(self.conn, rows)
+        self.flush_latencies.append(time.perf_counter() - t0)
+
+        self.rows_written += len(rows)
+        return len(rows)
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def report(self):
+        """
+        Throughput summary: rows/sec over the writer's lifetime and flush latency percentiles (ms).
+        """
+        elapsed = time.perf_counter() - self.started
+        flushes = len(self.flush_latencies)
+        return {
+            'rows': self.rows_written,
+            'seconds': elapsed,
+            'rows_per_sec': self.rows_written / elapsed if elapsed > 0 else 0.0,
+            'flushes': flushes,
+            'avg_rows_per_flush': self.rows_written / flushes if flushes else 0.0,
+            'flush_p50_ms': percentile(self.flush_latencies, 50) * 1000,
+            'flush_p95_ms': percentile(self.flush_latencies, 95) * 1000,
+            'flush_p99_ms': percentile(self.flush_latencies, 99) * 1000,
+            'flush_max_ms': max(self.flush_latencies, default=0.0) * 1000,
+        }
+
+
+def format_report(stats):
+    return (
+        f"Rows written:      {stats['rows']}\n"
+        f"Elapsed:           {stats['seconds']:.2f} s\n"
+        f"Throughput:        {stats['rows_per_sec']:.0f} rows/sec\n"
+        f"Flushes:           {stats['flushes']} (avg {stats['avg_rows_per_flush']:.1f} rows/flush)\n"
+        f"Flush latency:     p50 {stats['flush_p50_ms']:.2f} ms | "
+        f"p95 {stats['flush_p95_ms']:.2f} ms | p99 {stats['flush_p99_ms']:.2f} ms | "
+        f"max {stats['flush_max_ms']:.2f} ms"
+    )
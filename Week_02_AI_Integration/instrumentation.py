@@ -0,0 +1,226 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- PER-RERUN TIMINGS ---
+# Where does a slow page refresh go: the KPI query, the table query, matplotlib, or
+# Streamlit itself? Each page calls start_run() at the top and finish_run() at the bottom,
+# and wraps its stages in timers:
+#   with instrumentation.timer("kpi_query"): ...
+#   @instrumentation.timed("pdf")
+# Everything outside the timers ends up in "other" (widgets, st.* calls, Streamlit).
+# Switched on with FACTORY_INSTRUMENT=1. Switched off, timer() hands back one shared
+# do-nothing context manager, so the cost is a function call and an if.
+# Exports (both optional):
+# - FACTORY_METRICS_LOG=metrics.jsonl: one JSON line per finished rerun
+# - FACTORY_METRICS_PORT=9108: Prometheus text format on http://<host>:9108/metrics
+
+ENABLED = os.getenv("FACTORY_INSTRUMENT", "") not in ("", "0")
+HISTORY = int(os.getenv("FACTORY_INSTRUMENT_HISTORY", "20"))
+LOG_PATH = os.getenv("FACTORY_METRICS_LOG")
+METRICS_PORT = os.getenv("FACTORY_METRICS_PORT")
+
+_NOOP = nullcontext()
+# Streamlit runs every session's script in its own thread, so "the current rerun" is per thread
+_local = threading.local()
+
+
+class Run:
+    """
+    Stage timings of one script run of one page.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.started = time.time()
+        self.t0 = time.perf_counter()
+        self.stages = {}  # stage -> seconds (summed if a stage runs more than once)
+        self.total = None
+
+    def add(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def as_dict(self):
+        return {
+            "page": self.page,
+            "started": round(self.started, 3),
+            "stages": {stage: round(seconds, 6) for stage, seconds in self.stages.items()},
+            "other": round(max(self.total - sum(self.stages.values()), 0.0), 6),
+            "total": round(self.total, 6),
+        }
+
+
+class Recorder:
+    """
+    The last 'history' reruns (for the sidebar panel) and running totals per (page, stage)
+    for the Prometheus export. One per server process, shared by all sessions.
+    """
+
+    def __init__(self, history=HISTORY, log_path=LOG_PATH):
+        self.lock = threading.Lock()
+        self.runs = deque(maxlen=history)
+        self.totals = {}  # (page, stage) -> [count, seconds]
+        self.log_path = log_path
+
+    def record(self, run):
+        entry = run.as_dict()
+        with self.lock:
+            self.runs.append(entry)
+            for stage, seconds in [*entry["stages"].items(), ("other", entry["other"]), ("total", entry["total"])]:
+                totals = self.totals.setdefault((run.page, stage), [0, 0.0])
+                totals[0] += 1
+                totals[1] += seconds
+            if self.log_path:
+                with open(self.log_path, "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+
+    def recent(self, page=None):
+        with self.lock:
+            return [entry for entry in self.runs if page is None or entry["page"] == page]
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP factory_stage_seconds Time spent per stage of a Streamlit page run",
+            "# TYPE factory_stage_seconds summary",
+        ]
+        with self.lock:
+            totals = sorted(self.totals.items())
+        for (page, stage), (count, seconds) in totals:
+            labels = f'page="{escape_label(page)}",stage="{escape_label(stage)}"'
+            lines.append(f"factory_stage_seconds_count{{{labels}}} {count}")
+            lines.append(f"factory_stage_seconds_sum{{{labels}}} {seconds:.6f}")
+        return "\n".join(lines) + "\n"
+
+
+def escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+recorder = Recorder()
+
+
+# --- TIMERS ---
+
+class _Timer:
+    __slots__ = ("run", "stage", "t0")
+
+    def __init__(self, run, stage):
+        self.run = run
+        self.stage = stage
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.run.add(self.stage, time.perf_counter() - self.t0)
+
+
+def timer(stage):
+    """
+    Context manager that adds its duration to 'stage' of the current run.
+    Does nothing when instrumentation is off or no run was started in this thread.
+    """
+    run = getattr(_local, "run", None) if ENABLED else None
+    if run is None:
+        return _NOOP
+    return _Timer(run, stage)
+
+
+def timed(stage):
+    # Decorator version of timer()
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def start_run(page):
+    """
+    Call at the top of a page. A run that never reached finish_run() (st.rerun(), st.stop()
+    or an exception) is simply dropped.
+    """
+    if not ENABLED:
+        return
+    if METRICS_PORT:
+        serve_metrics(int(METRICS_PORT))
+    _local.run = Run(page)
+
+
+def finish_run():
+    run = getattr(_local, "run", None)
+    if run is None:
+        return
+    _local.run = None
+    run.total = time.perf_counter() - run.t0
+    recorder.record(run)
+
+
+# --- SIDEBAR PANEL ---
+
+def sidebar_panel(page, last_n=10):
+    """
+    Table of the stage timings (ms) of this page's last reruns, newest first.
+    Call after finish_run(). Shows nothing when instrumentation is off.
+    """
+    if not ENABLED:
+        return
+    import pandas as pd
+    import streamlit as st
+
+    runs = recorder.recent(page)[-last_n:][::-1]
+    with st.sidebar.expander("⏱️ Rerun Timings (ms)"):
+        if not runs:
+            st.caption("No finished runs yet.")
+            return
+        rows = [{**entry["stages"], "other": entry["other"], "total": entry["total"]} for entry in runs]
+        table = pd.DataFrame(rows, index=[time.strftime("%H:%M:%S", time.localtime(e["started"])) for e in runs])
+        st.dataframe((table * 1000).round(1))
+        st.caption("'other' = widgets, st.* calls and Streamlit itself")
+
+
+# --- PROMETHEUS ENDPOINT ---
+
+class MetricsHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass  # scraped every few seconds; keep the console quiet
+
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = recorder.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve_metrics(port):
+    # Started once per process, in a background thread
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        try:
+            _server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+        except OSError as e:
+            print(f"Metrics endpoint not started on port {port}: {e}")
+            _server = False
+            return _server
+        threading.Thread(target=_server.serve_forever, name="metrics-endpoint", daemon=True).start()
+        return _server
@@ -0,0 +1,44 @@
+import threading
+import time
+
+from db import DB_PATH, connect_reader
+from schema import DASHBOARD_QUERIES
+
+# --- CHANGE WATCHER ---
+# Instead of every browser tab re-running the whole page every 2 seconds, ONE background
+# thread per server watches the database. 'PRAGMA data_version' changes whenever another
+# connection (the simulator) commits - checking it doesn't read any table.
+# Sessions only compare 'watcher.version' with the version they last rendered.
+# 'watcher.commits' counts every commit (also deletes/updates that add no events) -
+# the shared query cache uses it to know when cached results are stale (see query_cache.py).
+
+
+class ChangeWatcher:
+
+    def __init__(self, db_path=DB_PATH, interval=0.5):
+        self.db_path = db_path
+        self.interval = interval
+        self.version = 0            # bumped every time new rows are seen
+        self.commits = 0            # bumped on every commit seen
+        self.last_event_id = None
+        self.thread = threading.Thread(target=self._run, name="change-watcher", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        conn = connect_reader(self.db_path)
+        data_version = None
+        while True:
+            try:
+                current = conn.execute("PRAGMA data_version").fetchone()[0]
+                if current != data_version:
+                    data_version = current
+                    self.commits += 1
+                    # Something was committed - did it add events?
+                    last_event_id = conn.execute(DASHBOARD_QUERIES['last_event_id']).fetchone()[0]
+                    if last_event_id != self.last_event_id:
+                        self.last_event_id = last_event_id
+                        self.version += 1
+            except Exception as e:
+                # Keep watching: the simulator may be migrating or restarting the database
+                print(f"Change watcher: {e}")
+            time.sleep(self.interval)
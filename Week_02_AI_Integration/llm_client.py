@@ -0,0 +1,193 @@
+import asyncio
+import os
+import queue
+import threading
+import time
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+# --- SHARED ASYNC LLM CLIENT ---
+# One AsyncOpenAI client running on one background event loop, shared by every script
+# and every Streamlit session in the process:
+# - one HTTP connection pool (keep-alive) instead of a new client per page run
+# - chat answers are STREAMED: tokens are handed out as they arrive, so the user reads
+#   the first sentence while the model is still writing the rest
+# - embeddings can be started in the background (embed_async) while other work runs
+# Callers stay plain synchronous code: they get a generator of tokens or a Future.
+# Offline testing: run fake_openai_server.py and set OPENAI_BASE_URL=http://127.0.0.1:8765/v1
+
+_DONE = object()
+
+
+class StreamMetrics:
+    """
+    Timings of one streamed answer (seconds). Filled in while the tokens are consumed.
+    """
+
+    def __init__(self):
+        self.started = None
+        self.first_token = None
+        self.finished = None
+        self.chunks = 0
+        self.tool_calls = 0
+
+    @property
+    def time_to_first_token(self):
+        return self.first_token - self.started if self.first_token else None
+
+    @property
+    def total(self):
+        return self.finished - self.started if self.finished else None
+
+    def summary(self):
+        ttft = self.time_to_first_token
+        ttft_text = f"{ttft:.2f} s" if ttft is not None else "-"
+        total_text = f"{self.total:.2f} s" if self.total is not None else "-"
+        tools_text = f" | {self.tool_calls} tool calls" if self.tool_calls else ""
+        return f"first token {ttft_text} | total {total_text} | {self.chunks} chunks{tools_text}"
+
+
+class LLMClient:
+
+    def __init__(self, api_key=None, base_url=None, max_connections=50):
+        # The event loop lives on its own daemon thread for the life of the process
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True, name="llm-client").start()
+
+        # All requests from all threads share this pool
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(120.0, connect=10.0),
+        )
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+
+    def submit(self, coro):
+        # Runs a coroutine on the client's loop; returns a concurrent.futures.Future
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def _embed(self, text, model):
+        response = await self.client.embeddings.create(input=text, model=model)
+        return response.data[0].embedding
+
+    def embed_async(self, text, model):
+        """
+        Starts an embedding request and returns at once. Call .result() on the returned
+        Future when the vector is needed.
+        """
+        return self.submit(self._embed(text, model))
+
+    def embed(self, text, model):
+        return self.embed_async(text, model).result()
+
+    async def _stream_into(self, tokens, messages, model, tools):
+        try:
+            options = {"tools": tools} if tools else {}
+            stream = await self.client.chat.completions.create(model=model, messages=messages, stream=True,
+                                                               **options)
+            calls = {}  # tool calls arrive in fragments: index -> {id, name, arguments}
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    tokens.put(delta.content)
+                for fragment in delta.tool_calls or []:
+                    call = calls.setdefault(fragment.index, {"id": "", "name": "", "arguments": ""})
+                    call["id"] = fragment.id or call["id"]
+                    if fragment.function:
+                        call["name"] += fragment.function.name or ""
+                        call["arguments"] += fragment.function.arguments or ""
+            if calls:
+                tokens.put([calls[i] for i in sorted(calls)])
+        except Exception as e:
+            tokens.put(e)
+        finally:
+            tokens.put(_DONE)
+
+    def _stream_round(self, messages, model, tools):
+        # One request; yields text tokens, and at the end a list of tool calls if the model made any
+        tokens = queue.Queue()
+        future = self.submit(self._stream_into(tokens, messages, model, tools))
+        try:
+            while True:
+                token = tokens.get()
+                if token is _DONE:
+                    break
+                if isinstance(token, Exception):
+                    raise token
+                yield token
+        finally:
+            # Also runs when the caller stops reading early: the request is cancelled
+            future.cancel()
+
+    def stream_chat(self, messages, model, metrics=None, tools=None, run_tool=None, max_tool_rounds=5):
+        """
+        Generator of answer tokens, yielded as soon as they arrive.
+        Pass a StreamMetrics to record time-to-first-token and total latency.
+        With 'tools', tool calls are executed locally with run_tool(name, arguments_json) -> str
+        and the results sent back, until the model answers in text.
+        """
+        metrics = metrics if metrics is not None else StreamMetrics()
+        metrics.started = time.perf_counter()
+        messages = list(messages)
+        try:
+            for round_number in range(max_tool_rounds + 1):
+                # Last round without tools: the model has to answer with what it has
+                round_tools = tools if round_number < max_tool_rounds else None
+                calls = []
+                for token in self._stream_round(messages, model, round_tools):
+                    if isinstance(token, list):
+                        calls = token
+                        continue
+                    if metrics.first_token is None:
+                        metrics.first_token = time.perf_counter()
+                    metrics.chunks += 1
+                    yield token
+                if not calls:
+                    return
+
+                metrics.tool_calls += len(calls)
+                messages.append({"role": "assistant", "content": None, "tool_calls": [
+                    {"id": c["id"], "type": "function", "function": {"name": c["name"], "arguments": c["arguments"]}}
+                    for c in calls
+                ]})
+                for c in calls:
+                    messages.append({"role": "tool", "tool_call_id": c["id"],
+                                     "content": run_tool(c["name"], c["arguments"])})
+        finally:
+            metrics.finished = time.perf_counter()
+
+    def chat(self, messages, model, metrics=None):
+        # Whole answer as one string (still streamed underneath, so metrics work the same)
+        return "".join(self.stream_chat(messages, model, metrics))
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_client():
+    """
+    The process-wide LLMClient (created on first use).
+    """
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            load_dotenv()
+            _shared_client = LLMClient(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL"))
+        return _shared_client
+
+
+def print_stream(tokens, prefix="AI: "):
+    """
+    Prints tokens to the terminal as they arrive and returns the full answer.
+    """
+    print(prefix, end="", flush=True)
+    parts = []
+    for token in tokens:
+        print(token, end="", flush=True)
+        parts.append(token)
+    print()
+    return "".join(parts)
@@ -0,0 +1,222 @@
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+import rollups
+from archive import write_day
+from db import connect_writer
+from schema import INSERT_SQL
+from sensor_sim import MACHINE_TYPES, make_machines
+
+# --- LOAD GENERATOR ---
+# Realistic production data in bulk, for benchmarking the dashboard, reports and ETL.
+# Everything is generated with NumPy one day at a time (all machines at once):
+# - RUN/STOP regimes: each machine alternates runs and stoppages with random
+#   (geometric) lengths, so stops come in realistic blocks instead of random single rows
+# - Cycle time drift: every machine slowly drifts away from its nominal cycle time
+# - Scrap bursts: short periods (e.g. a worn tool) where the scrap rate jumps
+# - Operators: crews per shift (06/14/22 h), rotating every week
+# Same seed = same data. Output to CSV (Week 1 format), SQLite (production_logs) and/or
+# the Parquet archive (archive.py).
+
+NOMINAL_CYCLE_SEC = {'PRESS': 45, 'CNC': 120, 'WELD': 60, 'ASSEMBLY': 90}
+SURNAMES = ['Kovac', 'Novak', 'Horvath', 'Varga', 'Toth', 'Nagy', 'Balaz', 'Molnar', 'Simko', 'Polak',
+            'Hudak', 'Kral', 'Bartos', 'Zelenak', 'Urban', 'Mraz']
+
+
+def regimes(rng, machines, steps, start_state, mean_on, mean_off):
+    """
+    Boolean (machines x steps) matrix of alternating on/off periods with geometric lengths
+    (mean_on / mean_off steps). Geometric lengths have no memory, so a new day can simply
+    continue from each machine's last state.
+    """
+    # Enough periods to cover the day for (almost) every machine; extended below if not
+    periods = int(2 * steps / (mean_on + mean_off)) + 16
+    while True:
+        on = rng.geometric(1 / mean_on, (machines, periods // 2))
+        off = rng.geometric(1 / mean_off, (machines, periods // 2))
+        # Machines that start "off" begin with an off period
+        first = np.where(start_state[:, None], on, off)
+        second = np.where(start_state[:, None], off, on)
+        lengths = np.empty((machines, periods // 2 * 2), dtype=np.int64)
+        lengths[:, 0::2], lengths[:, 1::2] = first, second
+        ends = np.cumsum(lengths, axis=1)
+        if ends[:, -1].min() >= steps:
+            break
+        periods *= 2
+
+    # Which period is step t in? One searchsorted over all machines (rows shifted apart)
+    shift = (np.arange(machines) * (ends[:, -1].max() + 1))[:, None]
+    period = np.searchsorted((ends + shift).ravel(), (np.arange(steps) + shift).ravel(), side='right')
+    period = period.reshape(machines, steps) - (np.arange(machines) * ends.shape[1])[:, None]
+    # Even periods have the start state, odd ones the opposite
+    return (period % 2 == 0) == start_state[:, None]
+
+
+class LoadGenerator:
+
+    def __init__(self, machine_count=200, interval=60, seed=0, mean_run_min=240, mean_stop_min=20,
+                 scrap_rate=0.02, burst_scrap_rate=0.2, mean_burst_min=30, mean_between_bursts_min=24 * 60):
+        self.rng = np.random.default_rng(seed)
+        self.machines = np.array(make_machines(machine_count))
+        self.interval = interval
+        # Mean period lengths in steps. At coarse intervals (e.g. 30 min) a 20 min stop is
+        # less than one step; a period lasts at least one step (geometric needs p <= 1)
+        steps_per_min = 60 / interval
+        self.mean_run = max(1.0, mean_run_min * steps_per_min)
+        self.mean_stop = max(1.0, mean_stop_min * steps_per_min)
+        self.mean_burst = max(1.0, mean_burst_min * steps_per_min)
+        self.mean_between_bursts = max(1.0, mean_between_bursts_min * steps_per_min)
+        self.scrap_rate = scrap_rate
+        self.burst_scrap_rate = burst_scrap_rate
+
+        n = machine_count
+        self.nominal_cycle = np.array([NOMINAL_CYCLE_SEC[MACHINE_TYPES[i % len(MACHINE_TYPES)]]
+                                       for i in range(n)], dtype=np.float64)
+        # Each machine reports at its own second within the interval (sorted, so rows in
+        # machine order are also in time order)
+        self.offsets = np.sort(self.rng.integers(0, interval, n))
+
+        # State carried from one day to the next
+        self.running = self.rng.random(n) < 0.9
+        self.bursting = np.zeros(n, dtype=bool)
+        self.drift = np.zeros(n)
+        self.next_event_id = 1
+
+        # Operators: 3 shift crews per group of 4 machines, plus a spare crew for the rotation
+        groups = (n + 3) // 4
+        crews = 4 * groups
+        initials = self.rng.choice(list('ABDEFHJKLMPRSTVZ'), crews)
+        surnames = self.rng.choice(SURNAMES, crews)
+        # (two crews can share a name, like in a real plant - they become one operator)
+        self.operators, self.crew_operator = np.unique([f"{i}. {s}" for i, s in zip(initials, surnames)],
+                                                       return_inverse=True)
+        self.crews = crews
+        self.machine_group = np.arange(n) // 4
+
+    def day(self, day):
+        """
+        All events of one calendar day as a DataFrame (Event_ID, Timestamp, Machine_ID,
+        Operator, Cycle_Time_Sec, Status, Parts_Produced, Scrap_Count), ordered by time.
+        """
+        rng = self.rng
+        n = len(self.machines)
+        steps = 86400 // self.interval
+        midnight = int(time.mktime(day.timetuple()))
+
+        # 1. RUN/STOP regimes and scrap bursts (machines x steps)
+        running = regimes(rng, n, steps, self.running, self.mean_run, self.mean_stop)
+        bursting = regimes(rng, n, steps, self.bursting, self.mean_burst, self.mean_between_bursts)
+        self.running, self.bursting = running[:, -1], bursting[:, -1]
+
+        # 2. Cycle time: nominal * (1 + slow random-walk drift, kept within +-15%) + noise
+        walk = self.drift[:, None] + np.cumsum(rng.normal(0, 0.0005, (n, steps)), axis=1)
+        walk = np.clip(walk, -0.15, 0.15)
+        self.drift = walk[:, -1]
+        cycle = self.nominal_cycle[:, None] * (1 + walk) + rng.normal(0, 1.5, (n, steps))
+        cycle = np.maximum(cycle, 1.0)
+
+        # 3. Output: parts that fit into one interval; scrap at the normal or burst rate
+        parts = np.where(running, rng.poisson(self.interval / cycle), 0)
+        scrap = rng.binomial(parts, np.where(bursting, self.burst_scrap_rate, self.scrap_rate))
+
+        # 4. Operators: shift 0/1/2 = 06-14 / 14-22 / 22-06, crews rotate weekly
+        step_seconds = np.arange(steps) * self.interval
+        hour = step_seconds // 3600
+        shift = np.where((hour >= 6) & (hour < 14), 0, np.where((hour >= 14) & (hour < 22), 1, 2))
+        week = day.toordinal() // 7
+        crew = (self.machine_group[:, None] * 4 + (shift[None, :] + week) % 4) % self.crews
+
+        # Time-ordered rows: step-major, machines inside a step
+        count = n * steps
+        frame = pd.DataFrame({
+            'Event_ID': np.arange(self.next_event_id, self.next_event_id + count),
+            'Timestamp': (midnight + step_seconds[:, None] + self.offsets[None, :]).ravel(),
+            'Machine_ID': pd.Categorical.from_codes(np.tile(np.arange(n), steps), self.machines),
+            'Operator': pd.Categorical.from_codes(self.crew_operator[crew.T.ravel()], self.operators),
+            'Cycle_Time_Sec': np.where(running, np.round(cycle), np.nan).T.ravel(),
+            'Status': pd.Categorical.from_codes(running.T.ravel().astype(np.int8), ['STOP', 'RUN']),
+            'Parts_Produced': parts.T.ravel(),
+            'Scrap_Count': scrap.T.ravel(),
+        })
+        self.next_event_id += count
+        return frame
+
+    def days(self, start, count):
+        for offset in range(count):
+            day = start + timedelta(days=offset)
+            yield day, self.day(day)
+
+
+# --- OUTPUTS ---
+
+def local_text(timestamps):
+    # Epoch -> 'YYYY-MM-DD HH:MM:SS' local time. All rows are one day, so one UTC offset lookup
+    # (from the first row) is enough, and the formatting stays vectorized.
+    first = int(timestamps[0])
+    offset = datetime.fromtimestamp(first) - datetime.fromtimestamp(first, timezone.utc).replace(tzinfo=None)
+    local = (timestamps + int(offset.total_seconds())).astype('datetime64[s]')
+    text = np.datetime_as_string(local, unit='s').astype('U19')
+    text.view('U1').reshape(-1, 19)[:, 10] = ' '  # ISO 'T' separator -> space
+    return text
+
+
+def to_csv_format(frame):
+    # Week 1 layout: readable timestamps, no Event_ID
+    out = frame.drop(columns=['Event_ID'])
+    out['Timestamp'] = local_text(frame['Timestamp'].to_numpy())
+    return out
+
+
+def write_sqlite(conn, frame):
+    # Rows and rollups in one transaction, like the ingest writer. (rollups.rebuild() would
+    # also work on an empty database, but it drops the totals of already archived shifts.)
+    rows = list(zip(frame['Timestamp'].tolist(), frame['Machine_ID'].astype(str).tolist(),
+                    frame['Status'].astype(str).tolist(), frame['Parts_Produced'].tolist(),
+                    frame['Scrap_Count'].tolist()))
+    with conn:
+        conn.executemany(INSERT_SQL, rows)
+        rollups.apply_events(conn, rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate realistic production data in bulk")
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--machines', type=int, default=200)
+    parser.add_argument('--interval', type=int, default=60, help="Seconds between events per machine")
+    parser.add_argument('--start', default='2025-01-01', help="First day (YYYY-MM-DD)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--csv', help="Write a Week 1 style CSV")
+    parser.add_argument('--db', help="Append to production_logs in this SQLite file")
+    parser.add_argument('--archive', help="Write the Parquet archive to this folder")
+    args = parser.parse_args()
+
+    generator = LoadGenerator(args.machines, args.interval, args.seed)
+    conn = connect_writer(args.db) if args.db else None
+
+    rows = 0
+    gen_seconds = 0.0
+    started = time.perf_counter()
+    t0 = time.perf_counter()
+    for i, (day, frame) in enumerate(generator.days(datetime.strptime(args.start, '%Y-%m-%d').date(), args.days)):
+        gen_seconds += time.perf_counter() - t0
+        rows += len(frame)
+        if args.csv:
+            to_csv_format(frame).to_csv(args.csv, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        if conn:
+            write_sqlite(conn, frame)
+        if args.archive:
+            write_day(frame, day, args.archive)
+        print(f"  {day}: {rows:,} rows", end="\r")
+        t0 = time.perf_counter()
+
+    if conn:
+        conn.close()
+
+    total = time.perf_counter() - started
+    print()
+    print(f"--- 🏭 {rows:,} events | generated at {rows / gen_seconds:,.0f} rows/s | "
+          f"total with output {total:.1f} s ({rows / total:,.0f} rows/s) ---")
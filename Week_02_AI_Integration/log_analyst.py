@@ -0,0 +1,153 @@
+import json
+
+import pandas as pd
+
+# --- PRODUCTION LOG ANALYST (bounded prompts) ---
+# Pasting the whole log into the prompt works for 10 rows, not for millions.
+# Instead the model gets:
+# 1. a compact SUMMARY: columns, row count, time range, totals per machine / status
+#    (long lists are cut to the top 'max_groups' entries)
+# 2. a TOOL, aggregate_log, to ask for any other number. The aggregation runs here,
+#    in pandas, and only the (row-limited) result table goes back to the model.
+# The prompt stays roughly the same size whether the log has 10 rows or 10 million.
+
+MAX_RESULT_ROWS = 50
+AGGREGATIONS = ["sum", "mean", "min", "max", "count"]
+TIME_BUCKETS = {"hour": "h", "day": "D"}
+
+
+def load_log(path):
+    # Repeated text values (machine, status, operator) as categories: far less memory
+    df = pd.read_csv(path, parse_dates=["Timestamp"])
+    for column in df.columns:
+        if pd.api.types.is_string_dtype(df[column]):
+            df[column] = df[column].astype("category")
+    return df
+
+
+class LogAnalyst:
+
+    def __init__(self, df, time_column="Timestamp", max_groups=20):
+        self.df = df
+        self.time_column = time_column
+        self.max_groups = max_groups
+        self.text_columns = [c for c in df.columns
+                             if c != time_column and not pd.api.types.is_numeric_dtype(df[c])]
+        self.number_columns = [c for c in df.columns
+                               if c != time_column and pd.api.types.is_numeric_dtype(df[c])]
+
+    # --- 1. SUMMARY ---
+    def _top(self, table):
+        # Keeps the biggest groups, folds the rest into one line
+        if len(table) <= self.max_groups:
+            return table.to_markdown()
+        shown = table.head(self.max_groups).to_markdown()
+        return f"{shown}\n(+ {len(table) - self.max_groups} more, use aggregate_log to see them)"
+
+    def summary(self):
+        df = self.df
+        lines = [f"Rows: {len(df):,}"]
+        if len(df):
+            lines.append(f"Time range: {df[self.time_column].min()} to {df[self.time_column].max()}")
+
+        schema = pd.DataFrame({
+            "type": df.dtypes.astype(str),
+            "missing": df.isna().sum(),
+        })
+        lines += ["", "Columns:", schema.to_markdown()]
+
+        for column in self.text_columns:
+            groups = df.groupby(column, observed=True)
+            table = groups.size().rename("rows").to_frame()
+            for number in self.number_columns:
+                table[f"{number} (sum)"] = groups[number].sum()
+            table = table.sort_values("rows", ascending=False)
+            lines += ["", f"Per {column}:", self._top(table)]
+
+        return "\n".join(lines)
+
+    # --- 2. TOOL ---
+    def tools(self):
+        """
+        Tool definitions in the OpenAI function-calling format.
+        """
+        return [{
+            "type": "function",
+            "function": {
+                "name": "aggregate_log",
+                "description": "Aggregate the production log. Returns a small table (largest values first).",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "metric": {"type": "string", "enum": self.number_columns + ["rows"],
+                                   "description": "Column to aggregate, or 'rows' to count rows"},
+                        "agg": {"type": "string", "enum": AGGREGATIONS},
+                        "group_by": {"type": "array",
+                                     "items": {"type": "string", "enum": self.text_columns + list(TIME_BUCKETS)}},
+                        "filters": {
+                            "type": "object",
+                            "description": "Exact matches on text columns, plus optional 'start'/'end' timestamps",
+                            "properties": {
+                                **{c: {"type": "string"} for c in self.text_columns},
+                                "start": {"type": "string"},
+                                "end": {"type": "string"},
+                            },
+                        },
+                        "limit": {"type": "integer", "description": f"Max rows returned (up to {MAX_RESULT_ROWS})"},
+                    },
+                },
+            },
+        }]
+
+    def aggregate(self, metric="rows", agg="sum", group_by=None, filters=None, limit=20):
+        df = self.df
+        filters = filters or {}
+
+        # Filters: every key must be a known column (no free-form code is ever executed)
+        mask = pd.Series(True, index=df.index)
+        for column, value in filters.items():
+            if column == "start":
+                mask &= df[self.time_column] >= pd.Timestamp(value)
+            elif column == "end":
+                mask &= df[self.time_column] < pd.Timestamp(value)
+            elif column in self.text_columns:
+                mask &= df[column] == value
+            else:
+                raise ValueError(f"Unknown filter '{column}'")
+        df = df[mask]
+
+        keys = []
+        for column in group_by or []:
+            if column in TIME_BUCKETS:
+                keys.append(df[self.time_column].dt.floor(TIME_BUCKETS[column]).rename(column))
+            elif column in self.text_columns:
+                keys.append(column)
+            else:
+                raise ValueError(f"Unknown group_by '{column}'")
+
+        if metric != "rows" and metric not in self.number_columns:
+            raise ValueError(f"Unknown metric '{metric}'")
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"Unknown agg '{agg}'")
+
+        name = "rows" if metric == "rows" else f"{agg}({metric})"
+        if not keys:
+            value = len(df) if metric == "rows" else getattr(df[metric], agg)()
+            return pd.DataFrame({name: [value]})
+
+        groups = df.groupby(keys, observed=True)
+        result = groups.size() if metric == "rows" else getattr(groups[metric], agg)()
+        limit = max(1, min(int(limit), MAX_RESULT_ROWS))
+        return result.rename(name).sort_values(ascending=False).head(limit).to_frame()
+
+    def run_tool(self, name, arguments):
+        """
+        Executes a tool call from the model. Errors are returned as text so the model can retry.
+        """
+        if name != "aggregate_log":
+            return f"Error: unknown tool '{name}'"
+        try:
+            result = self.aggregate(**json.loads(arguments or "{}"))
+        except (ValueError, TypeError, KeyError) as e:
+            return f"Error: {e}"
+        return result.to_markdown()
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from embedding_pipeline import EmbeddingJournal, embed_all
+from retrieval import build_index, normalize
+
+# --- PERSISTENT MANUAL INDEX ---
+# Embedding every chunk of the manual on every question costs one API call per paragraph.
+# Here the manual is embedded ONCE and saved next to it:
+#   machine_manual_index/embeddings.npy  -> unit-length float32 rows, one per chunk (memory-mapped on load)
+#   machine_manual_index/chunks.json     -> chunk text + content hash per row
+#   machine_manual_index/pending.jsonl   -> only while building: finished batches (resume point)
+# When the manual changes, only chunks with a new hash are sent to the API again.
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+def chunk_manual(text):
+    # Split by double newlines (paragraphs)
+    return [c.strip() for c in text.split("\n\n") if c.strip()]
+
+
+def chunk_hash(text, model=EMBEDDING_MODEL):
+    # The model is part of the key: a different model means different vectors
+    return hashlib.sha256(f"{model}\n{text}".encode("utf-8")).hexdigest()
+
+
+def default_index_dir(manual_path):
+    return os.path.splitext(manual_path)[0] + "_index"
+
+
+class ManualIndex:
+
+    def __init__(self, chunks, embeddings, backend='auto'):
+        self.chunks = chunks
+        self.embeddings = embeddings
+        # Rows are saved already normalized, so brute force searches the memory map directly.
+        # Large knowledge bases switch to the approximate IVF backend (see retrieval.py).
+        self.store = build_index(embeddings, backend=backend, normalized=True)
+
+    @classmethod
+    def load_or_build(cls, manual_path, client, index_dir=None, model=EMBEDDING_MODEL, workers=4, progress=None,
+                      backend='auto'):
+        """
+        Loads the saved index for 'manual_path', embedding only chunks that are new or changed
+        (batched and in parallel, see embedding_pipeline.py).
+        """
+        index_dir = index_dir or default_index_dir(manual_path)
+        matrix_path = os.path.join(index_dir, "embeddings.npy")
+        chunks_path = os.path.join(index_dir, "chunks.json")
+        journal_path = os.path.join(index_dir, "pending.jsonl")
+
+        with open(manual_path, "r") as f:
+            chunks = chunk_manual(f.read())
+        hashes = [chunk_hash(c, model) for c in chunks]
+
+        # 1. LOAD what we already have (memory-mapped: nothing is read until it is used)
+        saved_hashes, saved_matrix = [], None
+        if os.path.exists(matrix_path) and os.path.exists(chunks_path):
+            with open(chunks_path, "r") as f:
+                saved_hashes = [entry["hash"] for entry in json.load(f)]
+            saved_matrix = np.load(matrix_path, mmap_mode="r")
+
+        # Fast path: manual unchanged since the index was built
+        if saved_hashes == hashes:
+            return cls(chunks, saved_matrix, backend)
+
+        # 2. EMBED only the chunks we have never seen (duplicates are sent once)
+        known = {h: row for row, h in enumerate(saved_hashes)}
+        missing = {h: c for h, c in zip(hashes, chunks) if h not in known}
+        os.makedirs(index_dir, exist_ok=True)
+        new_vectors = embed_all(client, list(missing.items()), model, journal_path,
+                                workers=workers, progress=progress) if missing else {}
+
+        # 3. ASSEMBLE the matrix in manual order and save it
+        rows = [saved_matrix[known[h]] if h in known else new_vectors[h] for h in hashes]
+        matrix = normalize(rows)
+
+        # Write to temp files and swap, so a crash never leaves half an index behind
+        np.save(matrix_path + ".tmp.npy", matrix)
+        with open(chunks_path + ".tmp", "w") as f:
+            json.dump([{"hash": h, "text": c} for h, c in zip(hashes, chunks)], f)
+        os.replace(matrix_path + ".tmp.npy", matrix_path)
+        os.replace(chunks_path + ".tmp", chunks_path)
+        EmbeddingJournal(journal_path).remove()
+
+        print(f"Manual index: {len(missing)} of {len(chunks)} chunks embedded, saved to {index_dir}")
+        return cls(chunks, np.load(matrix_path, mmap_mode="r"), backend)
+
+    def search(self, query_vector, k=1):
+        """
+        Returns the k best (chunk, cosine similarity) pairs for a query embedding, best first.
+        """
+        indices, scores = self.store.search(query_vector, k)
+        return self._results(indices, scores)
+
+    def search_batch(self, query_vectors, k=1):
+        """
+        Same as search() for many questions at once (one matrix product).
+        """
+        indices, scores = self.store.search_batch(query_vectors, k)
+        return [self._results(row_i, row_s) for row_i, row_s in zip(indices, scores)]
+
+    def _results(self, indices, scores):
+        # IVFIndex pads missing results (fewer than k rows in the probed clusters) with
+        # index -1 and score -inf; self.chunks[-1] would silently return the last chunk
+        return [(self.chunks[i], float(score)) for i, score in zip(indices, scores)
+                if i >= 0 and np.isfinite(score)]
@@ -1,59 +1,51 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-from sqlalchemy import create_engine
-import time
-from datetime import datetime, time as dt_time, timedelta
+from datetime import datetime
+
+import charts
+import instrumentation
+from db import get_read_engine
+from live_updates import ChangeWatcher
+from query_cache import QueryCache
+from schema import DASHBOARD_QUERIES
+from shift_kpis import ShiftAggregator
+from shifts import get_current_shift_start
 
 st.set_page_config(page_title="Real-Time Monitor", page_icon="📊", layout="wide")
+instrumentation.start_run("Real-Time Monitor")
 
 st.title("📊 Live Production Monitor")
 
 # --- 1. SETUP & CONFIG ---
 @st.cache_resource
 def get_database_connection():
-    # Connect to the local database file (shared with simulator)
-    return create_engine('sqlite:///factory.db')
+    # Read-only pool on the database shared with the simulator (WAL mode, see db.py)
+    return get_read_engine()
 
 db_engine = get_database_connection()
 
-# --- 2. SHIFT LOGIC HELPER ---
-def get_current_shift_start():
-    """
-    Calculates the start time of the current shift based on standard Central European patterns:
-    - Morning: 06:00 - 14:00
-    - Afternoon: 14:00 - 22:00
-    - Night: 22:00 - 06:00 (Crosses Midnight)
-    """
-    now = datetime.now()
-    current_time = now.time()
-    
-    # Define Shift Boundaries
-    morning_start = dt_time(6, 0)
-    afternoon_start = dt_time(14, 0)
-    night_start = dt_time(22, 0)
-    
-    if morning_start <= current_time < afternoon_start:
-        # Morning Shift (Starts Today 06:00)
-        start_dt = datetime.combine(now.date(), morning_start)
-        shift_name = "Morning (Ranná)"
-        
-    elif afternoon_start <= current_time < night_start:
-        # Afternoon Shift (Starts Today 14:00)
-        start_dt = datetime.combine(now.date(), afternoon_start)
-        shift_name = "Afternoon (Poobedná)"
-        
-    else:
-        # Night Shift (Nočná)
-        shift_name = "Night (Nočná)"
-        if current_time >= night_start:
-            # It's late night (e.g., 23:00) - Shift started today at 22:00
-            start_dt = datetime.combine(now.date(), night_start)
-        else:
-            # It's early morning (e.g., 03:00) - Shift started Yesterday at 22:00
-            start_dt = datetime.combine(now.date() - timedelta(days=1), night_start)
-            
-    return start_dt, shift_name
+# --- 2. SHIFT KPIs (shared by every browser session) ---
+@st.cache_resource
+def get_shift_aggregator():
+    # Keeps running totals for the current shift and only adds new rows on each refresh
+    return ShiftAggregator()
+
+shift_aggregator = get_shift_aggregator()
+
+@st.cache_resource
+def get_change_watcher():
+    # ONE background thread per server polls the database for new rows (see live_updates.py)
+    return ChangeWatcher()
+
+change_watcher = get_change_watcher()
+
+@st.cache_resource
+def get_query_cache():
+    # Results shared by ALL sessions until the database changes (see query_cache.py):
+    # 50 open dashboards cost about the same queries as one
+    return QueryCache(db_engine, lambda: change_watcher.commits)
+
+query_cache = get_query_cache()
 
 # --- 3. CONTROLS ---
 col_controls1, col_controls2 = st.columns([1, 4])
@@ -65,26 +57,29 @@ with col_controls2:
         st.rerun()
 
 # --- 4. DATA LOGIC ---
+# Remember which data version this run shows BEFORE querying, so rows that arrive
+# while we render still trigger the next refresh.
+rendered_version = change_watcher.version
+shift_start, shift_name = get_current_shift_start()
+
 try:
     # A. Get Shift Context
-    shift_start, shift_name = get_current_shift_start()
     shift_start_str = shift_start.strftime("%Y-%m-%d %H:%M:%S")
     
     st.caption(f"Current Shift: **{shift_name}** | Data since: {shift_start_str}")
 
-    # B. KPI QUERY (Aggregates for CURRENT SHIFT only)
-    kpi_query = f"""
-    SELECT 
-        SUM(Parts_Produced) as Total_Parts,
-        SUM(Scrap_Count) as Total_Scrap
-    FROM production_logs
-    WHERE Timestamp >= '{shift_start_str}'
-    """
-    df_kpi = pd.read_sql(kpi_query, db_engine)
-    
-    # Extract scalar values safely
-    total_parts = df_kpi['Total_Parts'].iloc[0] if not df_kpi.empty and pd.notna(df_kpi['Total_Parts'].iloc[0]) else 0
-    total_scrap = df_kpi['Total_Scrap'].iloc[0] if not df_kpi.empty and pd.notna(df_kpi['Total_Scrap'].iloc[0]) else 0
+    # Timestamps are stored as epoch seconds (see schema.py)
+    shift_start_epoch = int(shift_start.timestamp())
+
+    # B. KPIs (CURRENT SHIFT only)
+    # The aggregator folds in only the events written since the last refresh (see shift_kpis.py)
+    def refresh_shift_kpis():
+        with db_engine.connect() as conn:
+            return shift_aggregator.refresh(conn.connection, shift_start_epoch)
+
+    with instrumentation.timer("kpi_query"):
+        total_parts, total_scrap, machine_totals = query_cache.get(("shift_kpis", shift_start_epoch),
+                                                                   refresh_shift_kpis)
     
     # Calculate Rate
     if total_parts > 0:
@@ -92,20 +87,17 @@ try:
     else:
         scrap_rate = 0
         
-    # C. CHART QUERY (Grouped by Machine, Current Shift only)
-    chart_query = f"""
-    SELECT 
-        Machine_ID, 
-        SUM(Parts_Produced) as Machine_Total 
-    FROM production_logs 
-    WHERE Timestamp >= '{shift_start_str}'
-    GROUP BY Machine_ID
-    """
-    df_chart = pd.read_sql(chart_query, db_engine)
+    # C. CHART DATA (Grouped by Machine, Current Shift only)
+    df_chart = pd.DataFrame(
+        [(machine, parts) for machine, (parts, _) in sorted(machine_totals.items())],
+        columns=['Machine_ID', 'Machine_Total'],
+    )
     
     # D. TABLE QUERY (Recent Activity - Last 50 rows regardless of shift)
-    table_query = "SELECT * FROM production_logs ORDER BY Timestamp DESC LIMIT 50"
-    df_recent = pd.read_sql(table_query, db_engine)
+    with instrumentation.timer("table_query"):
+        df_recent = query_cache.read_sql(DASHBOARD_QUERIES['recent_events'])
+        # Epoch seconds -> readable local time for the table
+        df_recent['Timestamp'] = df_recent['Timestamp'].map(datetime.fromtimestamp)
     
     # --- 5. VISUALIZATION ---
     if not df_recent.empty:
@@ -121,19 +113,19 @@ try:
         with col1:
             st.subheader("Shift Volume by Machine")
             if not df_chart.empty:
-                fig1, ax1 = plt.subplots()
-                # Plot with custom Orange color
-                df_chart.set_index("Machine_ID")["Machine_Total"].plot(kind='bar', ax=ax1, color='#FFA500')
-                plt.ylabel("Output")
-                plt.xticks(rotation=0)
-                st.pyplot(fig1)
+                with instrumentation.timer("chart_render"):
+                    # Plot with custom Orange color. Rendered once per distinct set of totals (see charts.py)
+                    charts.bar_chart(st, df_chart.set_index("Machine_ID")["Machine_Total"],
+                                     color='#FFA500', ylabel="Output", rotation=0)
             else:
                 st.info("No production data for this shift yet.")
             
         # Recent Table
         with col2:
             st.subheader("Live Feed (Last 50 Events)")
-            st.dataframe(df_recent, height=300)
+            with instrumentation.timer("table_render"):
+                st.dataframe(df_recent, height=300)
+            st.page_link("pages/4_🔎_Event_Browser.py", label="Browse all events", icon="🔎")
 
     else:
         st.warning("Database connected, but waiting for data...")
@@ -142,6 +134,25 @@ except Exception as e:
     st.error(f"Connection Error: {e}")
 
 # --- 6. AUTO-REFRESH ---
+# The fragment re-runs on its own every second but only compares two numbers in memory.
+# The full page (queries + chart) re-runs only when the watcher has seen new rows
+# or a new shift has started.
+@st.fragment(run_every=1)
+def watch_for_new_data():
+    if change_watcher.version != rendered_version or get_current_shift_start()[0] != shift_start:
+        st.rerun()
+
 if live_mode:
-    time.sleep(2)
-    st.rerun()
\ No newline at end of file
+    watch_for_new_data()
+
+# --- 7. CACHE STATS ---
+cache_stats = query_cache.stats()
+st.sidebar.markdown("**🗄️ Query Cache**")
+st.sidebar.caption(
+    f"{cache_stats['entries']} results | hit rate {cache_stats['hit_rate']:.0%} "
+    f"({cache_stats['hits']} hits / {cache_stats['misses']} misses)"
+)
+
+# --- 8. TIMINGS (FACTORY_INSTRUMENT=1, see instrumentation.py) ---
+instrumentation.finish_run()
+instrumentation.sidebar_panel("Real-Time Monitor")
@@ -2,45 +2,41 @@ import streamlit as st
 import os
 from dotenv import load_dotenv
 from openai import OpenAI
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+
+import instrumentation
+from answer_cache import SemanticAnswerCache
+from llm_client import StreamMetrics, get_llm_client
+from manual_index import EMBEDDING_MODEL, ManualIndex
 
 # Page Config
 st.set_page_config(page_title="AI Technician", page_icon="🤖", layout="wide")
 load_dotenv()
+instrumentation.start_run("AI Technician")
 
 st.title("🤖 AI Maintenance Technician")
 
 # --- 1. SETUP AI ---
 try:
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))  # building the manual index
+    # Questions + streamed answers: one async client and connection pool for all sessions
+    llm = get_llm_client()
 except:
     st.error("OpenAI API Key not found. Please check your .env file.")
 
 # --- 2. RAG ENGINE ---
-def get_ai_response(user_query, manual_text):
-    # Chunking
-    chunks = [c.strip() for c in manual_text.split("\n\n") if c.strip()]
-    
-    # Embedding Helper
-    def get_embedding(text):
-        return client.embeddings.create(input=text, model="text-embedding-3-small").data[0].embedding
+@st.cache_resource
+def get_manual_index(manual_path, manual_mtime):
+    # Embedded once and saved to disk (see manual_index.py). The file's mtime is part of
+    # the cache key, so editing the manual re-embeds only the changed chunks.
+    return ManualIndex.load_or_build(manual_path, client)
 
-    # Vector Search
-    q_vector = get_embedding(user_query)
-    chunk_embeddings = [get_embedding(c) for c in chunks]
-    
-    # Numpy Fix
-    q_array = np.array(q_vector).reshape(1, -1)
-    chunks_array = np.array(chunk_embeddings)
-    
-    # Find Match
-    similarities = cosine_similarity(q_array, chunks_array)[0]
-    best_index = np.argmax(similarities)
-    best_chunk = chunks[best_index]
-    
-    # Generate Answer (GPT-5.1)
-    prompt = f"""
+@st.cache_resource
+def get_answer_cache(manual_path, manual_mtime):
+    # Shared by all sessions and saved to disk; a new manual mtime = a fresh cache (see answer_cache.py)
+    return SemanticAnswerCache.for_manual(manual_path)
+
+def build_prompt(best_chunk, user_query):
+    return f"""
     You are an expert industrial technician. 
     Answer the question based ONLY on the context below.
     
@@ -50,13 +46,6 @@ def get_ai_response(user_query, manual_text):
     QUESTION:
     {user_query}
     """
-    
-    response = client.chat.completions.create(
-        model="gpt-5.1",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    
-    return response.choices[0].message.content, best_chunk
 
 # --- 3. MAIN UI ---
 st.markdown("### Ask questions about maintenance protocols.")
@@ -69,26 +58,63 @@ parent_dir = os.path.dirname(current_dir)
 manual_path = os.path.join(parent_dir, "machine_manual.txt")
 
 if os.path.exists(manual_path):
-    with open(manual_path, "r") as f:
-        manual_text = f.read()
-        
     # Chat Input
     user_question = st.text_area("Question:", height=100, placeholder="e.g., How do I fix Error E-404?")
     
     if st.button("Ask Manual"):
         if user_question:
-            with st.spinner("Analyzing technical docs..."):
-                try:
-                    answer, source = get_ai_response(user_question, manual_text)
-                    
+            try:
+                # Start embedding the question right away; load the index while it is in flight
+                q_future = llm.embed_async(user_question, EMBEDDING_MODEL)
+                with st.spinner("Analyzing technical docs..."):
+                    manual_mtime = os.path.getmtime(manual_path)
+                    with instrumentation.timer("load_index"):
+                        manual_index = get_manual_index(manual_path, manual_mtime)
+                        answer_cache = get_answer_cache(manual_path, manual_mtime)
+                    # (only the part of the embedding call that the index loading didn't hide)
+                    with instrumentation.timer("embed_question"):
+                        q_vector = q_future.result()
+                    # Vector Search: one matrix-vector product
+                    with instrumentation.timer("vector_search"):
+                        best_chunk, _ = manual_index.search(q_vector)[0]
+                
+                # Same question (or a close rewording) already answered from the same manual section?
+                with instrumentation.timer("cache_lookup"):
+                    cached_answer = answer_cache.lookup(q_vector, best_chunk)
+                if cached_answer is not None:
+                    st.success("Analysis Complete: (answered from cache)")
+                    st.write(cached_answer)
+                else:
+                    # Generate Answer (GPT-5.1), written to the page token by token
                     st.success("Analysis Complete:")
-                    st.write(answer)
-                    
-                    with st.expander("Show Source Context"):
-                        st.info(source)
-                except Exception as e:
-                    st.error(f"Error: {e}")
+                    metrics = StreamMetrics()
+                    with instrumentation.timer("llm_answer"):
+                        answer = st.write_stream(llm.stream_chat(
+                            [{"role": "user", "content": build_prompt(best_chunk, user_question)}],
+                            model="gpt-5.1",
+                            metrics=metrics,
+                        ))
+                    st.caption(f"⏱️ {metrics.summary()}")
+                    answer_cache.store(user_question, q_vector, best_chunk, answer, metrics.total)
+                
+                with st.expander("Show Source Context"):
+                    st.info(best_chunk)
+            except Exception as e:
+                st.error(f"Error: {e}")
         else:
             st.warning("Please type a question.")
 else:
-    st.error(f"⚠️ 'machine_manual.txt' not found at: {manual_path}")
\ No newline at end of file
+    st.error(f"⚠️ 'machine_manual.txt' not found at: {manual_path}")
+
+# --- 4. CACHE STATS ---
+if os.path.exists(manual_path):
+    stats = get_answer_cache(manual_path, os.path.getmtime(manual_path)).stats()
+    st.sidebar.markdown("**🧠 Answer Cache**")
+    st.sidebar.caption(
+        f"{stats['entries']} answers | hit rate {stats['hit_rate']:.0%} "
+        f"({stats['hits']} hits / {stats['misses']} misses) | {stats['seconds_saved']:.0f} s of LLM time saved"
+    )
+
+# --- 5. TIMINGS (FACTORY_INSTRUMENT=1, see instrumentation.py) ---
+instrumentation.finish_run()
+instrumentation.sidebar_panel("AI Technician")
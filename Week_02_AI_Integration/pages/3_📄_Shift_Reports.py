@@ -1,11 +1,15 @@
 import streamlit as st
-import pandas as pd
-from sqlalchemy import create_engine
 from fpdf import FPDF
 import base64
-from datetime import datetime
+from datetime import date, datetime, timedelta
+
+import instrumentation
+import reports
+from archive import load_events
+from db import get_read_engine
 
 st.set_page_config(page_title="Shift Reports", page_icon="📄", layout="wide")
+instrumentation.start_run("Shift Reports")
 
 st.title("📄 Shift Reporting Module")
 st.markdown("Generate and download formal production reports.")
@@ -13,12 +17,14 @@ st.markdown("Generate and download formal production reports.")
 # --- 1. SETUP ---
 @st.cache_resource
 def get_database_connection():
-    return create_engine('sqlite:///factory.db')
+    # Read-only pool on the database shared with the simulator (WAL mode, see db.py)
+    return get_read_engine()
 
 db_engine = get_database_connection()
 
 # --- 2. PDF GENERATOR (Cleaned for FPDF2 Warnings) ---
-def create_pdf(total_parts, scrap_rate, advice, timestamp):
+@instrumentation.timed("pdf")
+def create_pdf(period, totals, by_machine, advice, timestamp):
     pdf = FPDF()
     pdf.add_page()
     # FIX 1: Use 'Helvetica' instead of 'Arial' to stop the warnings
@@ -29,6 +35,7 @@ def create_pdf(total_parts, scrap_rate, advice, timestamp):
     pdf.cell(200, 10, text="Official Shift Report", new_x="LMARGIN", new_y="NEXT", align='C')
     pdf.set_font("Helvetica", size=10)
     pdf.cell(200, 10, text=f"Generated: {timestamp}", new_x="LMARGIN", new_y="NEXT", align='C')
+    pdf.cell(200, 10, text=period, new_x="LMARGIN", new_y="NEXT", align='C')
     
     # Metrics Section
     pdf.ln(10)
@@ -36,8 +43,24 @@ def create_pdf(total_parts, scrap_rate, advice, timestamp):
     pdf.cell(200, 10, text="Production Summary", new_x="LMARGIN", new_y="NEXT")
     
     pdf.set_font("Helvetica", size=12)
-    pdf.cell(200, 10, text=f"Total Units Produced: {total_parts}", new_x="LMARGIN", new_y="NEXT")
-    pdf.cell(200, 10, text=f"Scrap Rate: {scrap_rate:.2f}%", new_x="LMARGIN", new_y="NEXT")
+    pdf.cell(200, 10, text=f"Total Units Produced: {totals['parts']}", new_x="LMARGIN", new_y="NEXT")
+    pdf.cell(200, 10, text=f"Scrap: {totals['scrap']} units ({totals['scrap_rate']:.2f}%)", new_x="LMARGIN", new_y="NEXT")
+    pdf.cell(200, 10, text=f"Availability (RUN share): {totals['availability']:.1f}%", new_x="LMARGIN", new_y="NEXT")
+    
+    # Per-machine breakdown
+    pdf.ln(5)
+    pdf.set_font("Helvetica", 'B', 14)
+    pdf.cell(200, 10, text="By Machine", new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font("Helvetica", 'B', 9)
+    for header, width in zip(["Machine", "Parts", "Scrap", "Scrap %", "Availability %"], [50, 30, 30, 30, 40]):
+        pdf.cell(width, 7, text=header)
+    pdf.ln()
+    pdf.set_font("Helvetica", size=9)
+    for row in by_machine.itertuples(index=False):
+        for value, width in zip([row.Machine_ID, row.Parts_Produced, row.Scrap_Count,
+                                 f"{row[5]:.2f}", f"{row[6]:.1f}"], [50, 30, 30, 30, 40]):
+            pdf.cell(width, 6, text=str(value))
+        pdf.ln()
     
     # AI/Notes Section
     pdf.ln(10)
@@ -54,11 +77,28 @@ col1, col2 = st.columns([1, 2])
 
 with col1:
     st.subheader("Report Settings")
-    # In a real app, you would pick dates here. For now, we get "All Data"
-    report_type = st.selectbox("Select Report Type", ["Current Shift", "Last 24 Hours"])
+    report_type = st.selectbox("Select Report Type", ["Current Shift", "Past Shift", "Day", "Week", "Date Range"])
+    
+    # The window to report on (see reports.py)
+    today = date.today()
+    if report_type == "Current Shift":
+        window = None  # computed when the report is generated, so it ends "now"
+    elif report_type == "Past Shift":
+        shift_day = st.date_input("Shift date", today - timedelta(days=1))
+        shift_name = st.radio("Shift", list(reports.SHIFTS))
+        window = reports.shift_window(shift_day, shift_name)
+    elif report_type == "Day":
+        window = reports.day_window(st.date_input("Day", today - timedelta(days=1)))
+    elif report_type == "Week":
+        window = reports.week_window(st.date_input("Any day of the week", today - timedelta(days=7)))
+    else:
+        days = st.date_input("From - To", (today - timedelta(days=30), today - timedelta(days=1)))
+        window = reports.range_window(days[0], days[-1]) if days else None
     
     # Input for AI Notes (Optional manual override)
     manager_notes = st.text_area("Add Manager Notes:", "Standard operation. No critical faults detected.")
+    # Raw events are the only part that grows with the window - only load them when asked
+    include_events = st.checkbox("Include raw events (CSV)")
     
     generate_btn = st.button("Generate Report")
 
@@ -66,26 +106,52 @@ with col2:
     st.subheader("Preview")
     
     if generate_btn:
-        # Fetch Data on Demand
-        # In a real scenario, you'd filter WHERE Timestamp > ...
-        df = pd.read_sql("SELECT * FROM production_logs", db_engine)
+        if report_type == "Current Shift":
+            window = reports.current_shift_window()
         
-        if not df.empty:
-            total_parts = df['Parts_Produced'].sum()
-            total_scrap = df['Scrap_Count'].sum()
-            scrap_rate = (total_scrap / total_parts * 100) if total_parts > 0 else 0
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Show a quick summary on screen
-            st.info(f"Report Period: All Data | Total Output: {total_parts}")
-            
-            # Generate PDF
-            pdf_data = create_pdf(total_parts, scrap_rate, manager_notes, timestamp)
-            b64 = base64.b64encode(pdf_data).decode()
-            
-            # Download Button
-            href = f'<a href="data:application/octet-stream;base64,{b64}" download="Production_Report_{datetime.now().date()}.pdf" style="text-decoration:none; color:white; background-color:#d32f2f; padding:12px 24px; border-radius:5px; font-weight:bold;">⬇️ Download PDF</a>'
-            st.markdown(href, unsafe_allow_html=True)
-            
+        if window is None:
+            st.warning("Pick a date range first.")
         else:
-            st.warning("No data found to generate report.")
\ No newline at end of file
+            period_start, period_end, period_label = window
+            # Fetch Data on Demand
+            # Aggregated in SQL from the rollup tables (whole shifts/hours/minutes of the window),
+            # only one row per machine comes back (see reports.py)
+            with instrumentation.timer("report_query"), db_engine.connect() as conn:
+                totals, by_machine = reports.build_report(conn.connection.driver_connection, period_start, period_end)
+            
+            if totals['events'] > 0:
+                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                
+                # Show a quick summary on screen
+                st.info(f"Report Period: {period_label}")
+                kpi1, kpi2, kpi3, kpi4 = st.columns(4)
+                kpi1.metric("Output", f"{totals['parts']} units")
+                kpi2.metric("Scrap", f"{totals['scrap']} units")
+                kpi3.metric("Scrap Rate", f"{totals['scrap_rate']:.2f}%")
+                kpi4.metric("Availability", f"{totals['availability']:.1f}%")
+                st.dataframe(by_machine.round(2), hide_index=True)
+                
+                # Generate PDF
+                pdf_data = create_pdf(period_label, totals, by_machine, manager_notes, timestamp)
+                b64 = base64.b64encode(pdf_data).decode()
+                
+                # Download Button
+                href = f'<a href="data:application/octet-stream;base64,{b64}" download="Production_Report_{period_start:%Y%m%d_%H%M}.pdf" style="text-decoration:none; color:white; background-color:#d32f2f; padding:12px 24px; border-radius:5px; font-weight:bold;">⬇️ Download PDF</a>'
+                st.markdown(href, unsafe_allow_html=True)
+                
+                if include_events:
+                    # Raw events of the period: closed shifts come from the Parquet archive
+                    # (only these columns, only the needed day folders), the rest from SQLite
+                    with instrumentation.timer("events_query"):
+                        events = load_events(db_engine, ["Timestamp", "Machine_ID", "Status", "Parts_Produced", "Scrap_Count"],
+                                             period_start, period_end)
+                        events["Timestamp"] = events["Timestamp"].map(datetime.fromtimestamp)
+                    st.download_button("⬇️ Download Events (CSV)", events.sort_values("Timestamp").to_csv(index=False),
+                                       file_name=f"Events_{period_start:%Y%m%d_%H%M}.csv", mime="text/csv")
+                
+            else:
+                st.warning("No data found to generate report.")
+
+# --- 4. TIMINGS (FACTORY_INSTRUMENT=1, see instrumentation.py) ---
+instrumentation.finish_run()
+instrumentation.sidebar_panel("Shift Reports")
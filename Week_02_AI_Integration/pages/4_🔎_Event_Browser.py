@@ -0,0 +1,93 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime, timedelta
+
+import instrumentation
+from archive import local_midnight
+from db import get_read_engine
+from queries import EVENT_COLUMNS, events_page, machine_ids
+
+st.set_page_config(page_title="Event Browser", page_icon="🔎", layout="wide")
+instrumentation.start_run("Event Browser")
+
+st.title("🔎 Event Browser")
+st.markdown("Page through every production event. Only the visible page is read and sent to the browser.")
+
+# --- 1. SETUP ---
+@st.cache_resource
+def get_database_connection():
+    # Read-only pool on the database shared with the simulator (WAL mode, see db.py)
+    return get_read_engine()
+
+db_engine = get_database_connection()
+
+@st.cache_data(ttl=300)
+def get_machines():
+    with db_engine.connect() as conn:
+        return machine_ids(conn.connection.driver_connection)
+
+# --- 2. FILTERS ---
+col_machine, col_status, col_dates, col_size = st.columns([2, 1, 2, 1])
+machine = col_machine.selectbox("Machine", ["All"] + get_machines())
+status = col_status.selectbox("Status", ["All", "RUN", "STOP"])
+dates = col_dates.date_input("Date range (optional)", value=())
+page_size = col_size.selectbox("Rows per page", [25, 50, 100, 200], index=1)
+
+start = end = None
+if len(dates) == 2:
+    start = local_midnight(dates[0])
+    end = local_midnight(dates[1] + timedelta(days=1))
+
+# --- 3. PAGE STATE ---
+# Keyset pagination (see queries.py): the page is defined by the row it continues from,
+# not by a row number. New filters start again from the newest events.
+filters = (machine, status, start, end, page_size)
+state = st.session_state
+if state.get("browser_filters") != filters:
+    state.browser_filters = filters
+    state.browser_nav = (None, 'older')
+    state.browser_page_no = 1
+
+def go(direction):
+    edge = state.browser_first if direction == 'newer' else state.browser_last
+    state.browser_nav = (edge, direction)
+    state.browser_page_no = max(state.browser_page_no + (1 if direction == 'older' else -1), 1)
+
+def go_newest():
+    state.browser_nav = (None, 'older')
+    state.browser_page_no = 1
+
+cursor, direction = state.browser_nav
+at_newest = cursor is None
+with instrumentation.timer("page_query"), db_engine.connect() as conn:
+    query = dict(machine=None if machine == "All" else machine, status=None if status == "All" else status,
+                 start=start, end=end, limit=page_size)
+    rows = events_page(conn.connection.driver_connection, cursor, direction, **query)
+    if direction == 'newer' and len(rows) < page_size:
+        # Reached the newest events: show a full newest page
+        rows = events_page(conn.connection.driver_connection, **query)
+        go_newest()
+        at_newest = True
+
+# --- 4. TABLE ---
+if rows:
+    state.browser_first = (rows[0][1], rows[0][0])
+    state.browser_last = (rows[-1][1], rows[-1][0])
+    df = pd.DataFrame(rows, columns=EVENT_COLUMNS)
+    # Epoch seconds -> readable local time for the table
+    df['Timestamp'] = df['Timestamp'].map(datetime.fromtimestamp)
+    with instrumentation.timer("table_render"):
+        st.dataframe(df, hide_index=True, use_container_width=True)
+    st.caption(f"Page {state.browser_page_no} | {df['Timestamp'].iloc[0]:%Y-%m-%d %H:%M:%S} "
+               f"→ {df['Timestamp'].iloc[-1]:%Y-%m-%d %H:%M:%S}")
+else:
+    st.info("No events match these filters.")
+
+nav_newest, nav_newer, nav_older = st.columns([1, 1, 6])
+nav_newest.button("⏮ Newest", on_click=go_newest, disabled=at_newest)
+nav_newer.button("◀ Newer", on_click=go, args=('newer',), disabled=at_newest)
+nav_older.button("Older ▶", on_click=go, args=('older',), disabled=len(rows) < page_size)
+
+# --- 5. TIMINGS (FACTORY_INSTRUMENT=1, see instrumentation.py) ---
+instrumentation.finish_run()
+instrumentation.sidebar_panel("Event Browser")
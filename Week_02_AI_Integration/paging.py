@@ -0,0 +1,19 @@
+# --- DATAFRAME WINDOWS ---
+# st.dataframe(df) / st.write(df) serialize EVERY row and send it to the browser - with a
+# big uploaded log that is most of the rerun time and a lot of browser memory.
+# show_page() sends one page of rows; the page number is a widget, so only the
+# rows you look at ever leave the server.
+
+
+def show_page(container, df, key, page_size=100):
+    """
+    Shows one page of 'df' in a Streamlit container (st, a column, an expander, ...).
+    'key' must be unique on the page (it names the page-number widget).
+    """
+    pages = max(1, -(-len(df) // page_size))  # ceiling division
+    page = 1
+    if pages > 1:
+        page = container.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, key=key)
+    first = (page - 1) * page_size
+    container.dataframe(df.iloc[first:first + page_size])
+    container.caption(f"Rows {first + 1:,}-{min(first + page_size, len(df)):,} of {len(df):,}")
@@ -0,0 +1,95 @@
+from schema import DASHBOARD_QUERIES
+
+# --- SHIFT WINDOW QUERIES ---
+# The first Real-Time Monitor built its SQL with f-strings (WHERE Timestamp >= '{shift_start_str}'):
+# a new SQL text every shift, compared as text, and two scans per refresh (KPI cards + chart).
+# Now:
+# - constant SQL text with ? parameters (see DASHBOARD_QUERIES). sqlite3 keeps a cache of
+#   prepared statements per connection, keyed by the SQL text, so each pooled connection
+#   parses and plans a query once and afterwards only binds new values
+# - Timestamp is an INTEGER (epoch seconds), compared as a number through the index
+# - 'shift_totals' returns the per-machine totals and the overall totals together:
+#   one index range scan instead of two
+
+END_OF_TIME = 2 ** 62  # "no upper bound" - keeps the SQL text the same for open windows
+
+
+def shift_totals(conn, start, end=None):
+    """
+    Totals of [start, end) (epoch seconds, end=None: up to now):
+    (total parts, total scrap, {Machine_ID: (parts, scrap)}).
+    'conn' is a DB-API connection.
+    """
+    rows = conn.execute(DASHBOARD_QUERIES['shift_totals'], (start, end or END_OF_TIME)).fetchall()
+    if not rows:
+        return 0, 0, {}
+    by_machine = {machine: (parts, scrap) for machine, parts, scrap, _, _ in rows}
+    return rows[0][3], rows[0][4], by_machine
+
+
+# --- EVENT BROWSER (keyset pagination) ---
+# OFFSET paging reads and throws away every row before the page: page 10,000 of a big
+# table costs 10,000 pages. Keyset paging remembers where the current page ends
+# (Timestamp, Event_ID of its last row) and asks for the rows just past it, so every page
+# is a short index range walk whatever its position:
+# - no filter / status / time range: idx_logs_timestamp
+# - machine filter: idx_logs_machine_timestamp (machine equality + time range)
+# The SQL text only depends on WHICH filters are set, so the statement cache still works.
+
+EVENT_COLUMNS = ['Event_ID', 'Timestamp', 'Machine_ID', 'Status', 'Parts_Produced', 'Scrap_Count']
+
+
+def events_page(conn, cursor=None, direction='older', machine=None, status=None, start=None, end=None,
+                limit=50):
+    """
+    One page of events as a list of tuples (EVENT_COLUMNS), newest first.
+    'cursor' = (Timestamp, Event_ID) to continue from: the last row of the current page
+    for direction='older', the first row for direction='newer'. No cursor = newest page
+    (or oldest page with 'newer'). start/end: epoch seconds, [start, end).
+    """
+    where, params = [], []
+    if machine:
+        where.append("Machine_ID = ?")
+        params.append(machine)
+    if status:
+        where.append("Status = ?")
+        params.append(status)
+    if start is not None:
+        where.append("Timestamp >= ?")
+        params.append(start)
+    if end is not None:
+        where.append("Timestamp < ?")
+        params.append(end)
+    if cursor:
+        timestamp, event_id = cursor
+        # The plain Timestamp bound is what the index range uses; the OR breaks ties
+        if direction == 'older':
+            where.append("Timestamp <= ? AND (Timestamp < ? OR Event_ID < ?)")
+        else:
+            where.append("Timestamp >= ? AND (Timestamp > ? OR Event_ID > ?)")
+        params += [timestamp, timestamp, event_id]
+
+    order = "DESC" if direction == 'older' else "ASC"
+    sql = f"""
+        SELECT {', '.join(EVENT_COLUMNS)} FROM production_logs
+        {'WHERE ' + ' AND '.join(where) if where else ''}
+        ORDER BY Timestamp {order}, Event_ID {order}
+        LIMIT ?"""
+    rows = conn.execute(sql, (*params, limit)).fetchall()
+    return rows if direction == 'older' else rows[::-1]
+
+
+def machine_ids(conn):
+    """
+    All Machine_IDs, via a "loose index scan": one index lookup per machine instead of
+    reading every row (SELECT DISTINCT would walk the whole index).
+    """
+    rows = conn.execute("""
+        WITH RECURSIVE machines(id) AS (
+            SELECT MIN(Machine_ID) FROM production_logs
+            UNION ALL
+            SELECT (SELECT MIN(Machine_ID) FROM production_logs WHERE Machine_ID > machines.id)
+            FROM machines WHERE machines.id IS NOT NULL
+        )
+        SELECT id FROM machines WHERE id IS NOT NULL""").fetchall()
+    return [row[0] for row in rows]
@@ -0,0 +1,91 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# --- SHARED QUERY CACHE ---
+# Every open dashboard asks the database the same questions (same shift, same last 50
+# events). One cache per server (st.cache_resource) answers them all:
+# - key: SQL with whitespace normalized + the bound parameters (or any name for
+#   computed results, see get())
+# - valid while the database is unchanged: each entry remembers the change counter it was
+#   read at (ChangeWatcher.commits, bumped when 'PRAGMA data_version' moves); any commit
+#   by the writer makes every entry stale
+# - one query per key at a time: when 50 sessions miss together after new data arrives,
+#   one of them runs the query and the others wait for its result
+# Results can be up to one watcher interval (0.5 s) old, the same delay Live Mode has anyway.
+
+
+def normalize_sql(sql):
+    return " ".join(sql.split())
+
+
+class QueryCache:
+
+    def __init__(self, engine, version, max_entries=256):
+        """
+        'version' is a function returning the current change counter (e.g. lambda: watcher.commits).
+        """
+        self.engine = engine
+        self.version = version
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (version, result), least recently used first
+        self.key_locks = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key, version):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+        return False, None
+
+    def get(self, key, compute):
+        """
+        Cached result of compute() for 'key' at the current data version.
+        Results are shared between sessions: treat them as read-only.
+        """
+        # Read the version BEFORE computing: a commit that lands during the query makes
+        # the entry stale right away instead of hiding the new rows
+        version = self.version()
+        found, result = self._lookup(key, version)
+        if found:
+            return result
+
+        with self.lock:
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # Another session may have filled it while we waited
+            found, result = self._lookup(key, version)
+            if found:
+                return result
+            result = compute()
+            with self.lock:
+                self.misses += 1
+                self.entries[key] = (version, result)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    evicted, _ = self.entries.popitem(last=False)
+                    self.key_locks.pop(evicted, None)
+        return result
+
+    def read_sql(self, sql, params=()):
+        """
+        pd.read_sql through the cache. Returns a copy, so callers can modify it.
+        """
+        params = tuple(params)
+        df = self.get((normalize_sql(sql), params), lambda: pd.read_sql(sql, self.engine, params=params))
+        return df.copy()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
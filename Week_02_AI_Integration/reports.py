@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from rollups import hour_bucket
+from shifts import MORNING_START, AFTERNOON_START, NIGHT_START, SHIFT_LENGTH, get_shift
+
+# --- REPORT WINDOWS ---
+# A report covers any [start, end) window: a shift, a day, a week or a date range.
+# Nothing is loaded into pandas except the result (one row per machine). The window is
+# split into the coarsest rollup buckets that fit completely inside it (see rollups.py):
+#   whole shifts -> rollup_shift, then whole hours -> rollup_hour, then whole minutes ->
+#   rollup_minute, and only the leftover seconds (a window ending "now") -> production_logs
+# and ONE aggregate query sums all the pieces per machine. A month is ~90 shift buckets per
+# machine, so report time depends on the window, not on how much history the plant has.
+# Rollups keep their totals after archive.py moves old events to Parquet, so old reports still work.
+
+SHIFTS = {
+    "Morning (Ranná)": MORNING_START,
+    "Afternoon (Poobedná)": AFTERNOON_START,
+    "Night (Nočná)": NIGHT_START,
+}
+
+MACHINE_COLUMNS = ['Machine_ID', 'Events', 'Run_Events', 'Parts_Produced', 'Scrap_Count']
+
+
+# --- 1. WINDOWS (naive local datetimes, like the rest of the dashboard) ---
+
+def current_shift_window(now=None):
+    now = now or datetime.now()
+    start, name = get_shift(now)
+    return start, now, f"Current Shift: {name}, {start:%Y-%m-%d %H:%M} - {now:%H:%M}"
+
+
+def shift_window(day, shift_name):
+    # The night shift of 'day' starts at 22:00 and ends the next morning
+    start = datetime.combine(day, SHIFTS[shift_name])
+    return start, start + SHIFT_LENGTH, f"Shift: {shift_name}, {start:%Y-%m-%d %H:%M}"
+
+
+def day_window(day):
+    start = datetime.combine(day, datetime.min.time())
+    return start, start + timedelta(days=1), f"Day: {day:%Y-%m-%d}"
+
+
+def week_window(day):
+    # Monday to Monday of the week that contains 'day'
+    monday = day - timedelta(days=day.weekday())
+    start = datetime.combine(monday, datetime.min.time())
+    return start, start + timedelta(days=7), f"Week {monday:%G-W%V} ({monday:%Y-%m-%d} - {monday + timedelta(days=6):%Y-%m-%d})"
+
+
+def range_window(first_day, last_day):
+    # Both days included
+    start = datetime.combine(first_day, datetime.min.time())
+    end = datetime.combine(last_day + timedelta(days=1), datetime.min.time())
+    return start, end, f"Range: {first_day:%Y-%m-%d} - {last_day:%Y-%m-%d}"
+
+
+# --- 2. SPLITTING A WINDOW INTO ROLLUP BUCKETS ---
+
+def shift_floor(t):
+    return int(get_shift(datetime.fromtimestamp(t))[0].timestamp())
+
+
+def shift_ceil(t):
+    start = get_shift(datetime.fromtimestamp(t))[0]
+    if start.timestamp() == t:
+        return t
+    # Local wall-clock arithmetic, so shifts across a DST change still start at 06/14/22 h
+    return int(get_shift(start + SHIFT_LENGTH)[0].timestamp())
+
+
+def hour_ceil(t):
+    start = hour_bucket(t)
+    return t if start == t else hour_bucket(start + 3600)
+
+
+# Coarsest first: (rollup table, round down to a bucket start, round up to a bucket start).
+# Must match the buckets rollups.py writes: local hours, minutes.
+LEVELS = [
+    ('rollup_shift', shift_floor, shift_ceil),
+    ('rollup_hour', hour_bucket, hour_ceil),
+    ('rollup_minute', lambda t: t - t % 60, lambda t: t + (-t) % 60),
+]
+
+
+def split_window(start, end, level=0):
+    """
+    [(source table, lo, hi)] whose buckets exactly cover [start, end) in epoch seconds.
+    For rollups, lo/hi bound the bucket starts (all buckets in [lo, hi) lie fully inside).
+    """
+    if start >= end:
+        return []
+    if level == len(LEVELS):
+        return [('production_logs', start, end)]
+    table, floor, ceil = LEVELS[level]
+    first, last = ceil(start), floor(end)
+    if first >= last:
+        return split_window(start, end, level + 1)
+    return split_window(start, first, level + 1) + [(table, first, last)] + split_window(last, end, level + 1)
+
+
+def pieces_sql(pieces):
+    parts = []
+    for table, _, _ in pieces:
+        if table == 'production_logs':
+            parts.append("""
+                SELECT Machine_ID, 1 AS Events, Status = 'RUN' AS Run_Events, Parts_Produced, Scrap_Count
+                FROM production_logs WHERE Timestamp >= ? AND Timestamp < ?""")
+        else:
+            parts.append(f"""
+                SELECT Machine_ID, Events, Run_Events, Parts_Produced, Scrap_Count
+                FROM {table} WHERE Bucket >= ? AND Bucket < ?""")
+    return f"""
+        SELECT Machine_ID, SUM(Events), SUM(Run_Events), SUM(Parts_Produced), SUM(Scrap_Count)
+        FROM ({' UNION ALL '.join(parts)})
+        GROUP BY Machine_ID
+        ORDER BY Machine_ID"""
+
+
+# --- 3. THE REPORT ---
+
+def machine_totals(conn, start, end):
+    """
+    Per-machine totals of [start, end) (naive local datetimes) as a DataFrame
+    (MACHINE_COLUMNS). 'conn' is a DB-API connection.
+    """
+    pieces = split_window(int(start.timestamp()), int(end.timestamp()))
+    if not pieces:
+        return pd.DataFrame(columns=MACHINE_COLUMNS)
+    params = [value for _, lo, hi in pieces for value in (lo, hi)]
+    return pd.DataFrame(conn.execute(pieces_sql(pieces), params).fetchall(), columns=MACHINE_COLUMNS)
+
+
+def add_rates(df):
+    # Scrap rate = scrap / parts; availability = share of RUN readings (events are periodic)
+    df = df.copy()
+    df['Scrap_Rate_%'] = (100 * df['Scrap_Count'] / df['Parts_Produced'].where(df['Parts_Produced'] > 0)).fillna(0)
+    df['Availability_%'] = (100 * df['Run_Events'] / df['Events'].where(df['Events'] > 0)).fillna(0)
+    return df
+
+
+def build_report(conn, start, end):
+    """
+    (totals dict, per-machine DataFrame) for the window.
+    """
+    by_machine = machine_totals(conn, start, end)
+    totals = by_machine[MACHINE_COLUMNS[1:]].sum()
+    summary = add_rates(pd.DataFrame([totals], columns=MACHINE_COLUMNS[1:])).iloc[0]
+    return {
+        'events': int(summary['Events']),
+        'run_events': int(summary['Run_Events']),
+        'parts': int(summary['Parts_Produced']),
+        'scrap': int(summary['Scrap_Count']),
+        'scrap_rate': float(summary['Scrap_Rate_%']),
+        'availability': float(summary['Availability_%']),
+    }, add_rates(by_machine)
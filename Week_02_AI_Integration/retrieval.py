@@ -0,0 +1,158 @@
+import numpy as np
+
+# --- VECTOR SEARCH ---
+# Cosine similarity = dot product of unit-length vectors. So we normalize the chunk
+# vectors ONCE, keep them in one contiguous float32 matrix, and every query is a
+# single matrix product. argpartition finds the top-k without sorting every score.
+# (This replaces sklearn's cosine_similarity, which re-normalized all chunks per query.)
+#
+# Two interchangeable backends (same search / search_batch methods):
+# - BruteForceIndex: exact, scores every chunk. Best up to tens of thousands of chunks.
+# - IVFIndex: approximate. Clusters the chunks (k-means) and only scores the few
+#   clusters closest to the question. Built for hundreds of thousands of chunks.
+
+
+def normalize(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0  # an all-zero vector stays zero instead of becoming NaN
+    return matrix / norms
+
+
+def top_k(scores, k):
+    """
+    Indices and scores of the k best columns for each row of 'scores', best first.
+    """
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        # O(n) selection of the k largest, then sort only those k
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[1]), (scores.shape[0], k))
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1)
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
+
+
+class BruteForceIndex:
+
+    def __init__(self, vectors, normalized=False):
+        """
+        'vectors': one row per chunk. Pass normalized=True for rows that are already
+        unit length (e.g. a memory-mapped matrix saved by manual_index.py) - then
+        nothing is copied into memory.
+        """
+        self.matrix = vectors if normalized else np.ascontiguousarray(normalize(vectors))
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def search_batch(self, queries, k=1):
+        """
+        Many queries in one call: returns (indices, scores), both shaped (n_queries, k).
+        """
+        q = normalize(np.atleast_2d(queries))
+        scores = q @ self.matrix.T
+        return top_k(scores, k)
+
+    def search(self, query, k=1):
+        indices, scores = self.search_batch(query, k)
+        return indices[0], scores[0]
+
+
+def kmeans(vectors, n_clusters, n_iter=10, seed=0):
+    """
+    Spherical k-means (cosine) on unit-length rows. Returns unit-length centroids.
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        # New centroid = sum of its members (direction is all that matters after normalizing)
+        counts = np.bincount(assignments, minlength=n_clusters)
+        order = np.argsort(assignments, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        filled = counts > 0
+        # Only the non-empty clusters: an empty one at the end would start at len(vectors),
+        # which reduceat rejects, and between two filled starts there are only that cluster's rows
+        centroids[filled] = np.add.reduceat(vectors[order], starts[filled], axis=0)
+        # Empty cluster: restart it on a random vector
+        empty = np.flatnonzero(~filled)
+        centroids[empty] = vectors[rng.integers(len(vectors), size=len(empty))]
+        centroids = normalize(centroids)
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted file index: every vector is filed under its nearest centroid, and the rows
+    are stored grouped by cluster so one cluster is one contiguous slice.
+    A query scores the centroids, then only the rows of the 'nprobe' best clusters.
+    """
+
+    def __init__(self, vectors, normalized=False, n_clusters=None, nprobe=8, train_size=50000, seed=0):
+        matrix = np.asarray(vectors, dtype=np.float32) if normalized else normalize(vectors)
+        n = len(matrix)
+        # Rule of thumb: about sqrt(n) clusters
+        self.n_clusters = min(n, n_clusters or max(1, int(np.sqrt(n))))
+        self.nprobe = nprobe
+
+        # 1. TRAIN the centroids on a sample (k-means on everything is not needed)
+        rng = np.random.default_rng(seed)
+        sample = matrix[np.sort(rng.choice(n, min(n, train_size), replace=False))]
+        self.centroids = kmeans(sample, self.n_clusters, seed=seed)
+
+        # 2. ASSIGN every vector to its nearest centroid (in blocks to bound memory)
+        assignments = np.concatenate([
+            np.argmax(matrix[start:start + 65536] @ self.centroids.T, axis=1)
+            for start in range(0, n, 65536)
+        ])
+
+        # 3. GROUP rows by cluster: cluster c = rows offsets[c]:offsets[c + 1]
+        order = np.argsort(assignments, kind="stable")
+        self.matrix = np.ascontiguousarray(matrix[order])
+        self.ids = order  # position in self.matrix -> original row
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=self.n_clusters))])
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def search_batch(self, queries, k=1, nprobe=None):
+        q = normalize(np.atleast_2d(queries))
+        nprobe = min(nprobe or self.nprobe, self.n_clusters)
+        probes, _ = top_k(q @ self.centroids.T, nprobe)
+
+        # Fewer than k rows in the probed clusters: the rest stays index -1 / score -inf
+        all_indices = np.full((len(q), k), -1, dtype=np.int64)
+        all_scores = np.full((len(q), k), -np.inf, dtype=np.float32)
+        for row, (query, clusters) in enumerate(zip(q, probes)):
+            positions = np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in clusters])
+            if len(positions) == 0:
+                continue
+            scores = self.matrix[positions] @ query
+            best, best_scores = top_k(scores[None, :], k)
+            all_indices[row, :best.shape[1]] = self.ids[positions[best[0]]]
+            all_scores[row, :best.shape[1]] = best_scores[0]
+        return all_indices, all_scores
+
+    def search(self, query, k=1, nprobe=None):
+        indices, scores = self.search_batch(query, k, nprobe)
+        return indices[0], scores[0]
+
+
+INDEX_BACKENDS = {
+    'brute': BruteForceIndex,
+    'ivf': IVFIndex,
+}
+
+# Below this many vectors exact search is fast enough (a few ms) and always right
+AUTO_IVF_THRESHOLD = 50000
+
+
+def build_index(vectors, backend='auto', normalized=False, **options):
+    """
+    Creates a search index. backend: 'brute', 'ivf' or 'auto' (IVF for large collections).
+    """
+    if backend == 'auto':
+        backend = 'ivf' if len(vectors) >= AUTO_IVF_THRESHOLD else 'brute'
+    return INDEX_BACKENDS[backend](vectors, normalized=normalized, **options)
@@ -0,0 +1,186 @@
+import time
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
+
+from shifts import get_shift
+
+# --- ROLLUP TABLES ---
+# Pre-aggregated totals per (bucket, machine) for three granularities.
+# The ingest writer updates them in the SAME transaction as the raw rows (see ingest.py),
+# so a report over a month reads a few hundred shift rows instead of millions of events.
+# Bucket = start of the minute / hour / shift in epoch seconds.
+# Hours follow the LOCAL wall clock, like shifts do: in UTC+05:30 an hour bucket starts at
+# xx:00 local = xx:30 UTC, so every hour lies inside one shift and a shift is whole hours.
+# Minutes are the same everywhere (UTC offsets are whole minutes).
+
+GRANULARITIES = ['minute', 'hour', 'shift']
+
+ROLLUP_COLUMNS = "Events, Run_Events, Parts_Produced, Scrap_Count"
+
+
+def create_table_sql(granularity):
+    return f"""
+    CREATE TABLE IF NOT EXISTS rollup_{granularity} (
+        Bucket INTEGER NOT NULL,
+        Machine_ID TEXT NOT NULL,
+        Events INTEGER NOT NULL DEFAULT 0,
+        Run_Events INTEGER NOT NULL DEFAULT 0,
+        Parts_Produced INTEGER NOT NULL DEFAULT 0,
+        Scrap_Count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (Bucket, Machine_ID)
+    ) WITHOUT ROWID
+    """
+
+
+def upsert_sql(granularity):
+    # Add the batch totals on top of what is already in the bucket
+    return f"""
+    INSERT INTO rollup_{granularity} (Bucket, Machine_ID, {ROLLUP_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (Bucket, Machine_ID) DO UPDATE SET
+        Events = Events + excluded.Events,
+        Run_Events = Run_Events + excluded.Run_Events,
+        Parts_Produced = Parts_Produced + excluded.Parts_Produced,
+        Scrap_Count = Scrap_Count + excluded.Scrap_Count
+    """
+
+
+@lru_cache(maxsize=4096)
+def utc_offset(quarter_hour):
+    # Time zones change their offset on whole quarter hours, so one lookup per
+    # quarter hour is enough. Same C library call as SQLite's 'localtime'.
+    return time.localtime(quarter_hour).tm_gmtoff
+
+
+def hour_bucket(timestamp):
+    """
+    Start (epoch seconds) of the local wall-clock hour that contains 'timestamp'.
+    """
+    return timestamp - (timestamp + utc_offset(timestamp - timestamp % 900)) % 3600
+
+
+# SQL version of hour_bucket() for a column of minute buckets
+HOUR_BUCKET_SQL = "Bucket - CAST(strftime('%s', Bucket, 'unixepoch', 'localtime') AS INTEGER) % 3600"
+
+
+@lru_cache(maxsize=4096)
+def shift_bucket_for_hour(hour_bucket):
+    # Shifts change on whole local hours, so every event in one hour belongs to the same shift.
+    # Caching per hour keeps datetime math out of the per-event loop.
+    start_dt, _ = get_shift(datetime.fromtimestamp(hour_bucket))
+    return int(start_dt.timestamp())
+
+
+@lru_cache(maxsize=4096)
+def quarter_buckets(quarter_hour):
+    # (hour bucket, shift bucket) of a 15-minute slot. The whole slot lies in one local
+    # hour, so the per-event loop needs one cache lookup for both.
+    hour = hour_bucket(quarter_hour)
+    return hour, shift_bucket_for_hour(hour)
+
+
+def aggregate_events(events):
+    """
+    Sums a batch of events (Timestamp, Machine_ID, Status, Parts, Scrap) per granularity:
+    {granularity: {(bucket, machine): [events, run_events, parts, scrap]}}
+    """
+    totals = {granularity: defaultdict(lambda: [0, 0, 0, 0]) for granularity in GRANULARITIES}
+    for timestamp, machine, status, parts, scrap in events:
+        hour, shift = quarter_buckets(timestamp - timestamp % 900)
+        for granularity, bucket in (('minute', timestamp - timestamp % 60), ('hour', hour), ('shift', shift)):
+            row = totals[granularity][(bucket, machine)]
+            row[0] += 1
+            row[1] += status == 'RUN'
+            row[2] += parts
+            row[3] += scrap
+    return totals
+
+
+def apply_events(conn, events):
+    """
+    Adds a batch of events to all rollup tables. Call inside the transaction that inserts them.
+    """
+    for granularity, buckets in aggregate_events(events).items():
+        conn.executemany(
+            upsert_sql(granularity),
+            [(bucket, machine, *row) for (bucket, machine), row in buckets.items()],
+        )
+
+
+def rebuild(conn):
+    """
+    Recomputes every rollup from production_logs (after a migration or a bulk load
+    that bypassed the ingest writer). Minutes are grouped in SQL, hours and shifts
+    are folded from the minute rows (see regroup).
+    """
+    with conn:
+        conn.execute("DELETE FROM rollup_minute")
+        conn.execute(f"""
+            INSERT INTO rollup_minute (Bucket, Machine_ID, {ROLLUP_COLUMNS})
+            SELECT Timestamp - Timestamp % 60, Machine_ID,
+                   COUNT(*), SUM(Status = 'RUN'), SUM(Parts_Produced), SUM(Scrap_Count)
+            FROM production_logs
+            GROUP BY 1, 2
+        """)
+        _regroup(conn)
+
+
+def regroup(conn):
+    """
+    Recomputes the hour and shift rollups from the minute rollup. Unlike rebuild(), this
+    keeps the totals of events that archive.py already moved out of production_logs.
+    """
+    with conn:
+        _regroup(conn)
+
+
+def _regroup(conn):
+    # Hours in SQL, shifts from the hour rows in Python
+    conn.execute("DELETE FROM rollup_hour")
+    conn.execute("DELETE FROM rollup_shift")
+    conn.execute(f"""
+        INSERT INTO rollup_hour (Bucket, Machine_ID, {ROLLUP_COLUMNS})
+        SELECT {HOUR_BUCKET_SQL}, Machine_ID,
+               SUM(Events), SUM(Run_Events), SUM(Parts_Produced), SUM(Scrap_Count)
+        FROM rollup_minute
+        GROUP BY 1, 2
+    """)
+
+    shifts = defaultdict(lambda: [0, 0, 0, 0])
+    for hour, machine, *row in conn.execute(f"SELECT Bucket, Machine_ID, {ROLLUP_COLUMNS} FROM rollup_hour"):
+        totals = shifts[(shift_bucket_for_hour(hour), machine)]
+        for i, value in enumerate(row):
+            totals[i] += value
+    conn.executemany(
+        upsert_sql('shift'),
+        [(bucket, machine, *row) for (bucket, machine), row in shifts.items()],
+    )
+
+
+def hours_aligned(conn):
+    # Older versions bucketed hours by UTC; in half-hour time zones those buckets
+    # (and the shifts folded from them) don't line up with the local clock
+    first, last = conn.execute("SELECT MIN(Bucket), MAX(Bucket) FROM rollup_hour").fetchone()
+    return all(bucket is None or hour_bucket(bucket) == bucket for bucket in (first, last))
+
+
+def create_rollup_tables(conn):
+    """
+    Creates missing rollup tables. If any had to be created on a database that already
+    has events, the rollups are rebuilt from the raw rows. Hour buckets that are not
+    on the local hour are regrouped from the minute rollup.
+    """
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    missing = [g for g in GRANULARITIES if f"rollup_{g}" not in existing]
+    if not missing:
+        if not hours_aligned(conn):
+            regroup(conn)
+        return
+
+    with conn:
+        for granularity in missing:
+            conn.execute(create_table_sql(granularity))
+
+    if conn.execute("SELECT 1 FROM production_logs LIMIT 1").fetchone():
+        rebuild(conn)
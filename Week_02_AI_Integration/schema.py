@@ -0,0 +1,206 @@
+import argparse
+import sqlite3
+import sys
+
+import rollups
+
+# --- PRODUCTION LOG SCHEMA ---
+# The first version of 'production_logs' was created by pandas (to_sql): TEXT timestamps,
+# no key, no indexes. Every dashboard query had to read the whole table.
+# This module owns the "real" schema:
+# - Event_ID: INTEGER PRIMARY KEY = an alias for SQLite's rowid (no extra storage).
+#   AUTOINCREMENT: an ID is never handed out twice, even after archive.py deletes the
+#   newest rows. Readers that follow "Event_ID > last seen" (shift_kpis, live_updates)
+#   and the archive file names rely on that.
+# - Timestamp: INTEGER unix epoch seconds (compares as a number, not as text)
+# - Covering indexes: the dashboard queries can be answered from the index alone
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS production_logs (
+    Event_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Timestamp INTEGER NOT NULL,
+    Machine_ID TEXT NOT NULL,
+    Status TEXT NOT NULL,
+    Parts_Produced INTEGER NOT NULL DEFAULT 0,
+    Scrap_Count INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+INDEX_SQL = [
+    # Time window queries ("everything since shift start", "last 50 events")
+    """CREATE INDEX IF NOT EXISTS idx_logs_timestamp
+       ON production_logs (Timestamp, Machine_ID, Status, Parts_Produced, Scrap_Count)""",
+    # Per-machine history ("PRESS_01 since 06:00")
+    """CREATE INDEX IF NOT EXISTS idx_logs_machine_timestamp
+       ON production_logs (Machine_ID, Timestamp, Status, Parts_Produced, Scrap_Count)""",
+]
+
+INSERT_SQL = """
+INSERT INTO production_logs (Timestamp, Machine_ID, Status, Parts_Produced, Scrap_Count)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+# Queries that must never fall back to a full table scan (see check_query_plans)
+DASHBOARD_QUERIES = {
+    # Per-machine AND overall totals of a time window in one pass over the Timestamp index:
+    # the window functions sum the grouped rows, they don't read the table again (see queries.py).
+    # Without ANALYZE statistics SQLite prefers walking the Machine_ID index to skip the
+    # GROUP BY sort - i.e. reading every row. INDEXED BY pins the time-range plan.
+    'shift_totals': """
+        SELECT Machine_ID, SUM(Parts_Produced), SUM(Scrap_Count),
+               SUM(SUM(Parts_Produced)) OVER (), SUM(SUM(Scrap_Count)) OVER ()
+        FROM production_logs INDEXED BY idx_logs_timestamp
+        WHERE Timestamp >= ? AND Timestamp < ?
+        GROUP BY Machine_ID""",
+    # Only the rows written since the last refresh: a range on the rowid (NOT INDEXED)
+    'new_events_by_machine': """
+        SELECT Machine_ID, SUM(Parts_Produced), SUM(Scrap_Count), MAX(Event_ID)
+        FROM production_logs NOT INDEXED
+        WHERE Event_ID > ? AND Timestamp >= ?
+        GROUP BY Machine_ID""",
+    # Current-shift totals as maintained by the writer (see rollups.py)
+    'shift_rollup': """
+        SELECT Machine_ID, Parts_Produced, Scrap_Count
+        FROM rollup_shift WHERE Bucket = ?""",
+    'last_event_id': """
+        SELECT MAX(Event_ID) FROM production_logs""",
+    'recent_events': """
+        SELECT * FROM production_logs ORDER BY Timestamp DESC LIMIT 50""",
+    'machine_history': """
+        SELECT Timestamp, Parts_Produced FROM production_logs
+        WHERE Machine_ID = ? AND Timestamp >= ?""",
+}
+
+
+def get_columns(conn):
+    # PRAGMA table_info rows: (cid, name, type, notnull, default, pk)
+    return {row[1]: (row[2].upper(), row[5]) for row in conn.execute("PRAGMA table_info(production_logs)")}
+
+
+def table_sql(conn):
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'production_logs'").fetchone()
+    return row[0] if row else ''
+
+
+def needs_migration(conn):
+    columns = get_columns(conn)
+    if not columns:
+        return False
+    return (columns.get('Timestamp', ('', 0))[0] != 'INTEGER' or 'Event_ID' not in columns
+            or 'AUTOINCREMENT' not in table_sql(conn).upper())
+
+
+def create_schema(conn):
+    """
+    Creates (or upgrades) the table, its indexes and the rollup tables. Safe to call on every start.
+    """
+    if needs_migration(conn):
+        migrate(conn)
+    with conn:
+        conn.execute(CREATE_TABLE_SQL)
+        for sql in INDEX_SQL:
+            conn.execute(sql)
+    rollups.create_rollup_tables(conn)
+
+
+def migrate(conn):
+    """
+    In-place upgrade of an older table (pandas-created, or Event_ID without AUTOINCREMENT):
+    copy rows into the new layout (TEXT local time -> epoch seconds), swap the tables.
+    Existing Event_IDs are kept, so readers that remember the last ID they saw stay valid.
+    Runs in a single transaction, so a crash leaves the old table untouched.
+    """
+    old_count = conn.execute("SELECT COUNT(*) FROM production_logs").fetchone()[0]
+    id_column = 'Event_ID, ' if 'Event_ID' in get_columns(conn) else ''
+
+    # Manual transaction: the Python driver would otherwise commit before the DDL
+    conn.isolation_level = None
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("ALTER TABLE production_logs RENAME TO production_logs_old")
+        conn.execute(CREATE_TABLE_SQL)
+        # strftime('%s', ..., 'utc') reads the text as LOCAL time and returns epoch seconds.
+        # Already-numeric timestamps are kept as they are.
+        conn.execute(f"""
+            INSERT INTO production_logs ({id_column}Timestamp, Machine_ID, Status, Parts_Produced, Scrap_Count)
+            SELECT {id_column}
+                CASE WHEN typeof(Timestamp) = 'integer' THEN Timestamp
+                     ELSE CAST(strftime('%s', Timestamp, 'utc') AS INTEGER) END,
+                Machine_ID,
+                COALESCE(Status, 'RUN'),
+                COALESCE(Parts_Produced, 0),
+                COALESCE(Scrap_Count, 0)
+            FROM production_logs_old
+            WHERE Timestamp IS NOT NULL
+            ORDER BY {'Event_ID' if id_column else 'Timestamp'}
+        """)
+        conn.execute("DROP TABLE production_logs_old")
+        for sql in INDEX_SQL:
+            conn.execute(sql)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.isolation_level = ''
+
+    new_count = conn.execute("SELECT COUNT(*) FROM production_logs").fetchone()[0]
+    print(f"Migrated production_logs: {old_count} rows -> {new_count} rows (epoch timestamps, indexed)")
+
+
+def explain(conn, sql, params=()):
+    # EXPLAIN QUERY PLAN rows: (id, parent, notused, detail)
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+def is_full_scan(sql, plan):
+    """
+    "SCAN <table>" (with or without an index) means every row is visited.
+    Exceptions: walking an index in order and stopping after LIMIT rows ("last 50 events"),
+    and scanning a subquery's result (e.g. the grouped rows under a window function).
+    """
+    for step in plan:
+        if not step.startswith('SCAN ') or step == 'SCAN CONSTANT ROW' or step.startswith('SCAN (subquery'):
+            continue
+        if 'LIMIT' in sql.upper() and 'INDEX' in step and not any('TEMP B-TREE' in s for s in plan):
+            continue
+        return True
+    return False
+
+
+def check_query_plans(conn, queries=None):
+    """
+    Returns a list of (query name, plan) for every query that scans the whole table.
+    """
+    problems = []
+    for name, sql in (queries or DASHBOARD_QUERIES).items():
+        plan = explain(conn, sql, (0,) * sql.count('?'))
+        if is_full_scan(sql, plan):
+            problems.append((name, plan))
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create / migrate the production_logs schema")
+    parser.add_argument('--db', default='factory.db', help="SQLite database file")
+    parser.add_argument('--check', action='store_true', help="Fail if a dashboard query does a full table scan")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    create_schema(conn)
+    print(f"Schema ready in '{args.db}'.")
+
+    if args.check:
+        print("\n--- Query Plans ---")
+        for name, sql in DASHBOARD_QUERIES.items():
+            print(f"{name}: {' | '.join(explain(conn, sql, (0,) * sql.count('?')))}")
+
+        problems = check_query_plans(conn)
+        if problems:
+            print("\n❌ Full table scans detected:")
+            for name, plan in problems:
+                print(f"  {name}: {plan}")
+            sys.exit(1)
+        print("\n✅ All dashboard queries use an index.")
+
+    conn.close()
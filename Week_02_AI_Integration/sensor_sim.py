@@ -1,46 +1,98 @@
 import time
 import random
-import pandas as pd
-from sqlalchemy import create_engine
-from datetime import datetime, timedelta
+import argparse
+from datetime import datetime
 
-# 1. CONNECT to a local database file
-# If 'factory.db' doesn't exist, this will create it automatically.
-db_engine = create_engine('sqlite:///factory.db')
+from db import DB_PATH
+from ingest import BufferedWriter, format_report
 
-print("--- 🏭 Machine Simulator Started ---")
-print("Generating live data... (Press Ctrl+C to stop)")
+# Machine "families" - names cycle through these: PRESS_01, CNC_02, WELD_03, ASSEMBLY_04, PRESS_05, ...
+MACHINE_TYPES = ['PRESS', 'CNC', 'WELD', 'ASSEMBLY']
 
-machines = ['PRESS_01', 'CNC_02', 'WELD_03', 'ASSEMBLY_04']
 
-while True:
-    # 2. GENERATE random sensor data
-    current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+def make_machines(count):
+    return [f"{MACHINE_TYPES[i % len(MACHINE_TYPES)]}_{i + 1:02d}" for i in range(count)]
+
+
+def generate_event(machines):
+    # 1. GENERATE random sensor data
+    current_time = int(time.time())  # epoch seconds (see schema.py)
     machine = random.choice(machines)
-    
+
     # Simulate: 90% chance of 'RUN', 10% chance of 'STOP'
     status = 'RUN' if random.random() > 0.1 else 'STOP'
-    
+
     # Simulate: Output and Scrap
     parts = random.randint(1, 10) if status == 'RUN' else 0
     scrap = random.randint(0, 2) if status == 'RUN' else 0
-    
-    # Create a single row of data
-    data = {
-        'Timestamp': [current_time],
-        'Machine_ID': [machine],
-        'Status': [status],
-        'Parts_Produced': [parts],
-        'Scrap_Count': [scrap]
-    }
-    
-    df = pd.DataFrame(data)
-    
-    # 3. WRITE to the Database
-    # 'append': Add to the bottom of the table
-    df.to_sql('production_logs', db_engine, if_exists='append', index=False)
-    
-    print(f"[{current_time}] {machine}: {status} | +{parts} Parts")
-    
-    # 4. SLEEP (Wait 5 seconds to simulate real-time)
-    time.sleep(5)
\ No newline at end of file
+
+    return (current_time, machine, status, parts, scrap)
+
+
+def run(rate, machine_count, batch_size, flush_interval, duration=None, db_path=DB_PATH, verbose=False):
+    """
+    Produces events at 'rate' events/sec (0 = as fast as possible) spread over 'machine_count' machines.
+    Returns the writer's throughput report.
+    """
+    machines = make_machines(machine_count)
+    writer = BufferedWriter(db_path, batch_size=batch_size, flush_interval=flush_interval)
+
+    start = time.perf_counter()
+    emitted = 0
+
+    try:
+        while duration is None or time.perf_counter() - start < duration:
+            # 2. HOW MANY events are due since the start? (keeps the rate steady even if a flush was slow)
+            if rate > 0:
+                due = int((time.perf_counter() - start) * rate) + 1 - emitted
+            else:
+                due = batch_size
+
+            for _ in range(due):
+                event = generate_event(machines)
+                # 3. BUFFER the event (the writer flushes when the batch is full)
+                writer.add(event)
+                if verbose:
+                    print(f"[{datetime.fromtimestamp(event[0]):%Y-%m-%d %H:%M:%S}] {event[1]}: {event[2]} | +{event[3]} Parts")
+            emitted += due
+
+            # 4. FLUSH on the time threshold, then SLEEP until the next event is due
+            writer.flush_if_due()
+            if rate > 0:
+                next_due = start + emitted / rate
+                time.sleep(max(0.0, min(next_due - time.perf_counter(), flush_interval)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+
+    return writer.report()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Factory machine simulator")
+    parser.add_argument('--rate', type=float, default=0.2, help="Events per second (0 = as fast as possible). Default: 1 event every 5 s")
+    parser.add_argument('--machines', type=int, default=4, help="Number of simulated machines")
+    parser.add_argument('--batch-size', type=int, default=500, help="Flush after this many buffered events")
+    parser.add_argument('--flush-interval', type=float, default=1.0, help="Flush at least every N seconds")
+    parser.add_argument('--duration', type=float, default=None, help="Stop after N seconds and print the report")
+    parser.add_argument('--db', default=DB_PATH, help="SQLite database file")
+    args = parser.parse_args()
+
+    print("--- 🏭 Machine Simulator Started ---")
+    print(f"{args.machines} machines | {args.rate or 'max'} events/sec | batch {args.batch_size} / {args.flush_interval}s")
+    print("Generating live data... (Press Ctrl+C to stop)")
+
+    stats = run(
+        rate=args.rate,
+        machine_count=args.machines,
+        batch_size=args.batch_size,
+        flush_interval=args.flush_interval,
+        duration=args.duration,
+        db_path=args.db,
+        # Printing every event only makes sense at "human" speed
+        verbose=0 < args.rate <= 1,
+    )
+
+    print("\n--- 📈 Throughput Report ---")
+    print(format_report(stats))
@@ -0,0 +1,65 @@
+import threading
+
+from schema import DASHBOARD_QUERIES
+
+# --- INCREMENTAL SHIFT KPIs ---
+# Re-summing the whole shift on every refresh gets slower as the shift goes on.
+# The aggregator remembers the last Event_ID it has counted and only folds in newer rows,
+# so a refresh costs "new events since last time", not "everything since 06:00".
+# One instance is shared by all dashboard sessions (st.cache_resource).
+
+
+class ShiftAggregator:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.shift_start = None
+        self.last_event_id = 0
+        self.machine_totals = {}  # Machine_ID -> [parts, scrap]
+
+    def _seed(self, cursor, shift_start):
+        # First refresh of a shift: read the shift rollup (one row per machine) and the
+        # last Event_ID in ONE read transaction. The writer updates both together,
+        # so the next delta starts exactly where the rollup ends.
+        cursor.execute("BEGIN")
+        try:
+            last_event_id = cursor.execute(DASHBOARD_QUERIES['last_event_id']).fetchone()[0] or 0
+            rows = cursor.execute(DASHBOARD_QUERIES['shift_rollup'], (shift_start,)).fetchall()
+        finally:
+            cursor.execute("COMMIT")
+
+        self.shift_start = shift_start
+        self.last_event_id = last_event_id
+        self.machine_totals = {machine: [parts or 0, scrap or 0] for machine, parts, scrap in rows}
+
+    def _fold_new_rows(self, cursor):
+        rows = cursor.execute(DASHBOARD_QUERIES['new_events_by_machine'],
+                              (self.last_event_id, self.shift_start)).fetchall()
+        for machine, parts, scrap, max_id in rows:
+            totals = self.machine_totals.setdefault(machine, [0, 0])
+            totals[0] += parts or 0
+            totals[1] += scrap or 0
+            self.last_event_id = max(self.last_event_id, max_id)
+
+    def refresh(self, conn, shift_start):
+        """
+        Brings the totals up to date and returns a snapshot:
+        (total parts, total scrap, {Machine_ID: (parts, scrap)}).
+        'conn' is a DB-API connection, 'shift_start' the shift start in epoch seconds.
+        A new shift_start (shift boundary) resets the totals.
+        """
+        with self.lock:
+            cursor = conn.cursor()
+            try:
+                if shift_start != self.shift_start:
+                    self._seed(cursor, shift_start)
+                else:
+                    self._fold_new_rows(cursor)
+            finally:
+                cursor.close()
+
+            by_machine = {machine: tuple(totals) for machine, totals in self.machine_totals.items()}
+
+        total_parts = sum(parts for parts, _ in by_machine.values())
+        total_scrap = sum(scrap for _, scrap in by_machine.values())
+        return total_parts, total_scrap, by_machine
@@ -0,0 +1,50 @@
+from datetime import datetime, time as dt_time, timedelta
+
+# --- SHIFT LOGIC ---
+# Shared by the dashboard pages, the aggregators and the reports.
+
+MORNING_START = dt_time(6, 0)
+AFTERNOON_START = dt_time(14, 0)
+NIGHT_START = dt_time(22, 0)
+
+SHIFT_LENGTH = timedelta(hours=8)
+
+
+def get_shift(moment):
+    """
+    Returns (start datetime, shift name) of the shift that contains 'moment',
+    based on standard Central European patterns:
+    - Morning: 06:00 - 14:00
+    - Afternoon: 14:00 - 22:00
+    - Night: 22:00 - 06:00 (Crosses Midnight)
+    """
+    current_time = moment.time()
+
+    if MORNING_START <= current_time < AFTERNOON_START:
+        # Morning Shift (Starts Today 06:00)
+        start_dt = datetime.combine(moment.date(), MORNING_START)
+        shift_name = "Morning (Ranná)"
+
+    elif AFTERNOON_START <= current_time < NIGHT_START:
+        # Afternoon Shift (Starts Today 14:00)
+        start_dt = datetime.combine(moment.date(), AFTERNOON_START)
+        shift_name = "Afternoon (Poobedná)"
+
+    else:
+        # Night Shift (Nočná)
+        shift_name = "Night (Nočná)"
+        if current_time >= NIGHT_START:
+            # It's late night (e.g., 23:00) - Shift started today at 22:00
+            start_dt = datetime.combine(moment.date(), NIGHT_START)
+        else:
+            # It's early morning (e.g., 03:00) - Shift started Yesterday at 22:00
+            start_dt = datetime.combine(moment.date() - timedelta(days=1), NIGHT_START)
+
+    return start_dt, shift_name
+
+
+def get_current_shift_start():
+    """
+    Start time and name of the shift running right now.
+    """
+    return get_shift(datetime.now())
@@ -0,0 +1,86 @@
+import sqlite3
+
+import archive
+from db import connect_reader, connect_writer
+from ingest import BufferedWriter
+from shift_kpis import ShiftAggregator
+from shifts import get_current_shift_start
+
+# --- ARCHIVE / EVENT_ID TESTS ---
+# Compacting deletes the newest rows of production_logs. Event_IDs handed out afterwards
+# must still be larger than every ID seen before, or "Event_ID > last seen" readers
+# (ShiftAggregator, ChangeWatcher) stop seeing new events.
+# Run with: python -m pytest Week_02_AI_Integration
+
+
+def fake_write_day(written):
+    # Parquet is not what these tests are about: remember the file names instead
+    def write_day(df, day, archive_dir=archive.ARCHIVE_DIR):
+        for machine, part in df.groupby("Machine_ID", sort=False, observed=True):
+            written.append((day.isoformat(), machine, int(part['Event_ID'].iloc[0])))
+    return write_day
+
+
+def insert_events(db_path, events):
+    writer = BufferedWriter(db_path)
+    for event in events:
+        writer.add(event)
+    writer.close()
+
+
+def test_compact_then_insert_keeps_event_ids_growing(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "factory.db")
+    written = []
+    monkeypatch.setattr(archive, "write_day", fake_write_day(written))
+    shift_start = int(get_current_shift_start()[0].timestamp())
+
+    # Yesterday's events only: compacting removes every row, including the newest one
+    insert_events(db_path, [(shift_start - 86400 + i * 60, f"PRESS_0{i % 3}", "RUN", 10, 1) for i in range(30)])
+    reader = connect_reader(db_path)
+    aggregator = ShiftAggregator()
+    assert aggregator.refresh(reader, shift_start)[:2] == (0, 0)
+    old_max = aggregator.last_event_id
+    assert old_max == 30
+
+    assert archive.compact_closed_shifts(db_path, str(tmp_path / "archive"), verbose=False) == 30
+    assert reader.execute("SELECT COUNT(*) FROM production_logs").fetchone()[0] == 0
+
+    insert_events(db_path, [(shift_start + i, "PRESS_01", "RUN", 5, 0) for i in range(3)])
+    new_ids = [row[0] for row in reader.execute("SELECT Event_ID FROM production_logs")]
+    assert min(new_ids) > old_max
+
+    # The aggregator keeps following Event_ID and sees the new rows
+    total_parts, total_scrap, by_machine = aggregator.refresh(reader, shift_start)
+    assert (total_parts, total_scrap) == (15, 0)
+    assert by_machine == {"PRESS_01": (15, 0)}
+
+    # A second compaction can't reuse an archive file name
+    insert_events(db_path, [(shift_start - 86400, "PRESS_01", "RUN", 1, 0)])
+    archive.compact_closed_shifts(db_path, str(tmp_path / "archive"), verbose=False)
+    assert len(set(written)) == len(written)
+    reader.close()
+
+
+def test_migration_adds_autoincrement_and_keeps_ids(tmp_path):
+    db_path = str(tmp_path / "factory.db")
+    # The previous layout: Event_ID without AUTOINCREMENT
+    conn = sqlite3.connect(db_path)
+    conn.execute("""CREATE TABLE production_logs (
+        Event_ID INTEGER PRIMARY KEY, Timestamp INTEGER NOT NULL, Machine_ID TEXT NOT NULL,
+        Status TEXT NOT NULL, Parts_Produced INTEGER NOT NULL DEFAULT 0, Scrap_Count INTEGER NOT NULL DEFAULT 0)""")
+    conn.executemany("INSERT INTO production_logs VALUES (?, ?, 'PRESS_01', 'RUN', 1, 0)",
+                     [(event_id, 1_700_000_000 + event_id) for event_id in (3, 7, 12)])
+    conn.commit()
+    conn.close()
+
+    conn = connect_writer(db_path)
+    table_sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'production_logs'").fetchone()[0]
+    assert "AUTOINCREMENT" in table_sql
+    assert [row[0] for row in conn.execute("SELECT Event_ID FROM production_logs ORDER BY Event_ID")] == [3, 7, 12]
+
+    # Deleting the newest row no longer frees its ID
+    with conn:
+        conn.execute("DELETE FROM production_logs WHERE Event_ID = 12")
+        conn.execute("INSERT INTO production_logs (Timestamp, Machine_ID, Status) VALUES (1700000100, 'PRESS_01', 'RUN')")
+    assert conn.execute("SELECT MAX(Event_ID) FROM production_logs").fetchone()[0] == 13
+    conn.close()
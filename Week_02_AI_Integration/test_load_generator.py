@@ -0,0 +1,43 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import archive
+from db import connect_writer
+from load_generator import LoadGenerator, write_sqlite
+from test_archive import fake_write_day
+
+# --- LOAD GENERATOR TESTS ---
+# Run with: python -m pytest Week_02_AI_Integration
+
+
+@pytest.mark.parametrize("interval", [60, 1200, 1800, 3600])
+def test_coarse_intervals(interval):
+    # A 20 min mean stop is less than one step at 30/60 min intervals
+    generator = LoadGenerator(machine_count=8, interval=interval, seed=1)
+    frame = generator.day(date(2025, 3, 3))
+    assert len(frame) == 8 * 86400 // interval
+    assert frame['Timestamp'].is_monotonic_increasing
+    assert set(frame['Status'].astype(str)) <= {'RUN', 'STOP'}
+
+
+def test_bulk_load_keeps_rollups_of_archived_shifts(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "factory.db")
+    monkeypatch.setattr(archive, "write_day", fake_write_day([]))
+    generator = LoadGenerator(machine_count=4, interval=300, seed=2)
+    yesterday = (datetime.now() - timedelta(days=1)).date()
+
+    conn = connect_writer(db_path)
+    write_sqlite(conn, generator.day(yesterday - timedelta(days=1)))
+    archived = conn.execute("SELECT SUM(Parts_Produced) FROM rollup_shift").fetchone()[0]
+    assert archived > 0
+    conn.close()
+    archive.compact_closed_shifts(db_path, str(tmp_path / "archive"), verbose=False)
+
+    # More bulk data after compacting: the archived shifts keep their totals
+    conn = connect_writer(db_path)
+    frame = generator.day(yesterday)
+    write_sqlite(conn, frame)
+    total = conn.execute("SELECT SUM(Parts_Produced) FROM rollup_shift").fetchone()[0]
+    assert total == archived + frame['Parts_Produced'].sum()
+    conn.close()
@@ -0,0 +1,59 @@
+import random
+import time
+from datetime import datetime
+
+import pytest
+
+import reports
+import rollups
+from db import connect_reader
+from ingest import BufferedWriter
+from shifts import get_shift
+
+# --- REPORT / ROLLUP TESTS ---
+# Reports add up rollup buckets; the sums must equal the raw events in any time zone,
+# including half-hour offsets where local hours don't start on UTC hours.
+# Run with: python -m pytest Week_02_AI_Integration
+
+
+def clear_bucket_caches():
+    for cached in (rollups.utc_offset, rollups.shift_bucket_for_hour, rollups.quarter_buckets):
+        cached.cache_clear()
+
+
+@pytest.fixture(params=["Asia/Kolkata", "Europe/Bratislava", "UTC"])
+def local_zone(request, monkeypatch):
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    clear_bucket_caches()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+    clear_bucket_caches()
+
+
+def test_reports_match_raw_events(tmp_path, local_zone):
+    db_path = str(tmp_path / "factory.db")
+    start = int(datetime(2025, 10, 25, 3, 17).timestamp())  # includes the Bratislava DST change
+    events = [(start + i * 37, f"PRESS_0{i % 3}", "RUN" if i % 7 else "IDLE", i % 4, i % 2) for i in range(3 * 86400 // 37)]
+    writer = BufferedWriter(db_path, batch_size=997)
+    for event in events:
+        writer.add(event)
+    writer.close()
+    conn = connect_reader(db_path)
+
+    expected = {}
+    for timestamp, machine, _, parts, _ in events:
+        key = (int(get_shift(datetime.fromtimestamp(timestamp))[0].timestamp()), machine)
+        expected[key] = expected.get(key, 0) + parts
+    rows = conn.execute("SELECT Bucket, Machine_ID, Parts_Produced FROM rollup_shift")
+    assert {(bucket, machine): parts for bucket, machine, parts in rows} == expected
+
+    rnd = random.Random(7)
+    for _ in range(20):
+        lo = start + rnd.randrange(2 * 86400)
+        hi = lo + rnd.randrange(86400)
+        totals, _ = reports.build_report(conn, datetime.fromtimestamp(lo), datetime.fromtimestamp(hi))
+        assert totals['parts'] == sum(parts for timestamp, _, _, parts, _ in events if lo <= timestamp < hi)
+        assert totals['events'] == sum(1 for timestamp, *_ in events if lo <= timestamp < hi)
+    conn.close()
@@ -0,0 +1,35 @@
+import numpy as np
+
+from manual_index import ManualIndex
+from retrieval import normalize
+
+# --- RETRIEVAL TESTS ---
+# Run with: python -m pytest Week_02_AI_Integration
+
+
+def test_ivf_padding_is_not_returned_as_chunks():
+    vectors = normalize(np.random.default_rng(0).normal(size=(100, 16)).astype(np.float32))
+    chunks = [f"chunk {i}" for i in range(100)]
+    index = ManualIndex(chunks, vectors, backend='ivf')
+    index.store.nprobe = 1  # one cluster of ~10 rows, far fewer than k
+
+    results = index.search(vectors[3], k=50)
+    assert results[0][0] == "chunk 3"
+    assert 0 < len(results) < 50
+    assert all(np.isfinite(score) for _, score in results)
+    assert len({chunk for chunk, _ in results}) == len(results)
+
+    for row in index.search_batch(vectors[:4], k=50):
+        assert 0 < len(row) < 50
+
+
+def test_ivf_builds_with_empty_clusters():
+    # Duplicate boilerplate chunks: 10k rows but only 20 distinct vectors, so most of the
+    # ~100 clusters stay empty (including the highest-numbered ones)
+    distinct = normalize(np.random.default_rng(1).normal(size=(20, 16)).astype(np.float32))
+    vectors = distinct[np.arange(10_000) % 20]
+    index = ManualIndex([f"chunk {i}" for i in range(10_000)], vectors, backend='ivf')
+
+    chunk, score = index.search(distinct[5], k=1)[0]
+    assert int(chunk.split()[1]) % 20 == 5
+    assert score > 0.99
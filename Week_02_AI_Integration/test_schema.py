@@ -0,0 +1,45 @@
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from schema import check_query_plans, create_schema, get_columns, needs_migration
+
+# --- SCHEMA TESTS ---
+# Run with: python -m pytest Week_02_AI_Integration
+
+
+def test_dashboard_queries_use_an_index(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "factory.db"))
+    create_schema(conn)
+    assert check_query_plans(conn) == []
+    conn.close()
+
+
+def test_migrates_pandas_table(tmp_path):
+    db_path = str(tmp_path / "factory.db")
+    # The original layout: created by to_sql, TEXT local timestamps, no key, no indexes
+    legacy = pd.DataFrame({
+        'Timestamp': ['2025-01-06 05:59:30', '2025-01-06 06:00:00', '2025-07-01 22:15:00'],
+        'Machine_ID': ['PRESS_01', 'CNC_02', 'PRESS_01'],
+        'Status': ['RUN', 'STOP', 'RUN'],
+        'Parts_Produced': [12, 0, 7],
+        'Scrap_Count': [1, 0, 0],
+    })
+    conn = sqlite3.connect(db_path)
+    legacy.to_sql('production_logs', conn, index=False)
+    assert needs_migration(conn)
+
+    create_schema(conn)
+    assert not needs_migration(conn)
+    assert get_columns(conn)['Timestamp'][0] == 'INTEGER'
+    rows = conn.execute("SELECT Timestamp, typeof(Timestamp), Machine_ID, Parts_Produced "
+                        "FROM production_logs ORDER BY Event_ID").fetchall()
+    assert len(rows) == len(legacy)
+    assert {kind for _, kind, _, _ in rows} == {'integer'}
+    # Read as local time, like the dashboard wrote them
+    expected = [int(datetime.strptime(t, '%Y-%m-%d %H:%M:%S').timestamp()) for t in legacy['Timestamp']]
+    assert [timestamp for timestamp, _, _, _ in rows] == expected
+    assert [(machine, parts) for _, _, machine, parts in rows] == list(zip(legacy['Machine_ID'], legacy['Parts_Produced']))
+    assert check_query_plans(conn) == []
+    conn.close()
@@ -0,0 +1,65 @@
+import time
+
+import numpy as np
+
+from common import SEED
+
+# Approximate search quality vs speed: recall@k and latency per query for brute force
+# and IVF at several nprobe values. Synthetic "knowledge base": embeddings that form
+# topics (clusters), like real manuals do; queries are noisy copies of random chunks.
+# Ground truth = exact brute-force top-k.
+
+CHUNKS = 200_000
+DIM = 384
+TOPICS = 1000
+QUERIES = 200
+K = 5
+
+
+def synthetic_embeddings(n, dim, topics, seed=SEED):
+    from retrieval import normalize
+
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((topics, dim)).astype(np.float32)
+    labels = rng.integers(topics, size=n)
+    vectors = centers[labels] + 1.5 * rng.standard_normal((n, dim)).astype(np.float32)
+    return normalize(vectors)
+
+
+def make_queries(vectors, count, seed=SEED + 1):
+    from retrieval import normalize
+
+    rng = np.random.default_rng(seed)
+    picks = vectors[rng.integers(len(vectors), size=count)]
+    # Noise about as large as the vector itself: the nearest chunks are not obvious
+    return normalize(picks + rng.standard_normal(picks.shape).astype(np.float32) / np.sqrt(vectors.shape[1]))
+
+
+def search_each(index, queries, k, **options):
+    # One query at a time, like the chat page does. Returns (top-k rows, seconds per query)
+    t0 = time.perf_counter()
+    found = [index.search(q, k, **options)[0] for q in queries]
+    return found, (time.perf_counter() - t0) / len(queries)
+
+
+def recall(found, truth):
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+
+def bench_recall(ctx):
+    from retrieval import BruteForceIndex, IVFIndex
+
+    vectors = synthetic_embeddings(CHUNKS, DIM, TOPICS)
+    queries = make_queries(vectors, QUERIES)
+
+    brute = BruteForceIndex(vectors, normalized=True)
+    truth, seconds = search_each(brute, queries, K)
+    results = {"brute_force": {"seconds": seconds, "recall": 1.0}}
+
+    t0 = time.perf_counter()
+    ivf = IVFIndex(vectors, normalized=True)
+    results["ivf_build"] = {"seconds": time.perf_counter() - t0, "rows": CHUNKS}
+    for nprobe in (1, 4, 8, 16, 32):
+        found, seconds = search_each(ivf, queries, K, nprobe=nprobe)
+        results[f"ivf_nprobe_{nprobe}"] = {"seconds": seconds, "recall": round(recall(found, truth), 3)}
+    return results
@@ -0,0 +1,94 @@
+import importlib.util
+import os
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from common import DATA_DIR, SEED, Skip, best_of
+
+# CSV vs the date/machine partitioned Parquet archive (archive.py) for a year of events:
+# size on disk and load time for
+# - everything, all columns
+# - everything, 2 columns (projection)
+# - one machine, one week (partition pruning)
+
+MACHINES = 20
+INTERVAL = 300  # seconds between events per machine
+DAYS = 365
+
+
+def generate_year(machines, interval, days, seed=SEED):
+    """
+    One event per machine every 'interval' seconds, yielded one day at a time.
+    """
+    from archive import local_midnight
+
+    rng = np.random.default_rng(seed)
+    first_day = date(2025, 1, 1)
+    event_id = 1
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        times = np.arange(local_midnight(day), local_midnight(day + timedelta(days=1)), interval)
+        n = len(times) * len(machines)
+        running = rng.random(n) < 0.85
+        df = pd.DataFrame({
+            "Event_ID": np.arange(event_id, event_id + n),
+            "Timestamp": np.repeat(times, len(machines)),
+            "Machine_ID": np.tile(machines, len(times)),
+            "Status": np.where(running, "RUN", "STOP"),
+            "Parts_Produced": np.where(running, rng.integers(1, 20, n), 0),
+            "Scrap_Count": np.where(running, rng.binomial(3, 0.1, n), 0),
+        })
+        event_id += n
+        yield day, df
+
+
+def year_files(machines):
+    """
+    (CSV path, archive folder, rows) of the same year of events (built once).
+    """
+    from archive import write_day
+
+    folder = os.path.join(DATA_DIR, f"archive_{len(machines)}m_{INTERVAL}s_{DAYS}d")
+    csv_path = os.path.join(folder, "year.csv")
+    archive_dir = os.path.join(folder, "archive")
+    if not os.path.isdir(folder):
+        os.makedirs(folder + ".tmp", exist_ok=True)
+        for i, (day, df) in enumerate(generate_year(machines, INTERVAL, DAYS)):
+            df.to_csv(os.path.join(folder + ".tmp", "year.csv"), mode="a", header=(i == 0), index=False)
+            write_day(df, day, os.path.join(folder + ".tmp", "archive"))
+        os.replace(folder + ".tmp", folder)
+    return csv_path, archive_dir, len(machines) * DAYS * 86400 // INTERVAL
+
+
+def size_mb(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path) / 1e6
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files) / 1e6
+
+
+def bench_csv_vs_parquet(ctx):
+    if importlib.util.find_spec("pyarrow") is None:
+        raise Skip("pyarrow is not installed")
+    from archive import ARCHIVE_COLUMNS, read_archive
+    from sensor_sim import make_machines
+
+    machines = make_machines(MACHINES)
+    csv_path, archive_dir, rows = year_files(machines)
+    week_start = datetime(2025, 6, 2)
+    week_rows = 7 * 86400 // INTERVAL
+    cases = {
+        "csv_all_columns": (lambda: pd.read_csv(csv_path), rows),
+        "csv_2_columns": (lambda: pd.read_csv(csv_path, usecols=["Machine_ID", "Parts_Produced"]), rows),
+        "parquet_all_columns": (lambda: read_archive(ARCHIVE_COLUMNS, archive_dir=archive_dir), rows),
+        "parquet_2_columns": (lambda: read_archive(["Machine_ID", "Parts_Produced"], archive_dir=archive_dir), rows),
+        "parquet_1_machine_1_week": (lambda: read_archive(
+            ["Timestamp", "Parts_Produced"], week_start, week_start + timedelta(days=7),
+            machines=[machines[0]], archive_dir=archive_dir), week_rows),
+    }
+    results = {name: {"seconds": best_of(load, repeat=3, min_seconds=0), "rows": count}
+               for name, (load, count) in cases.items()}
+    results["csv_all_columns"]["size_mb"] = round(size_mb(csv_path), 1)
+    results["parquet_all_columns"]["size_mb"] = round(size_mb(archive_dir), 1)
+    return results
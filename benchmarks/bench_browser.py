@@ -0,0 +1,38 @@
+from common import best_of, factory_db, size_label
+
+# Event Browser: one 50-row page from the middle of the table, with keyset pagination
+# (queries.events_page) vs the OFFSET paging it replaces, unfiltered and per machine.
+
+PAGE = 50
+OFFSET_SQL = """
+    SELECT Event_ID, Timestamp, Machine_ID, Status, Parts_Produced, Scrap_Count
+    FROM production_logs {where}
+    ORDER BY Timestamp DESC, Event_ID DESC
+    LIMIT ? OFFSET ?"""
+
+
+def bench_event_pages(ctx):
+    from db import connect_reader
+    from queries import events_page, machine_ids
+
+    results = {}
+    for rows in ctx.sizes:
+        label = size_label(rows)
+        conn = connect_reader(factory_db(rows))
+        machine = machine_ids(conn)[0]
+        for name, where, params, filters, depth in [
+            ("all", "", (), {}, rows // 2),
+            ("machine", "WHERE Machine_ID = ?", (machine,), {"machine": machine}, rows // 200),
+        ]:
+            # Cursor of the row just before the middle: what keyset paging would remember
+            ts, event_id = conn.execute(OFFSET_SQL.format(where=where), (*params, 1, depth - 1)).fetchone()[1::-1]
+            keyset = events_page(conn, (ts, event_id), limit=PAGE, **filters)
+            offset = conn.execute(OFFSET_SQL.format(where=where), (*params, PAGE, depth)).fetchall()
+            assert keyset == offset
+            results[f"keyset_{name}.{label}"] = {
+                "seconds": best_of(lambda: events_page(conn, (ts, event_id), limit=PAGE, **filters))}
+            results[f"offset_{name}.{label}"] = {
+                "seconds": best_of(lambda: conn.execute(OFFSET_SQL.format(where=where), (*params, PAGE, depth)).fetchall(),
+                                   repeat=3, min_seconds=0)}
+        conn.close()
+    return results
@@ -0,0 +1,44 @@
+import importlib.util
+import io
+
+import numpy as np
+import pandas as pd
+
+from common import SEED, Skip, best_of
+
+# Real-Time Monitor bar chart: a fresh pyplot figure per rerun (the old way) vs charts.py,
+# first render of new totals (miss) and a rerun with unchanged totals (hit).
+
+MACHINES = 20
+
+
+def bench_bar_chart(ctx):
+    if importlib.util.find_spec("matplotlib") is None:
+        raise Skip("matplotlib is not installed")
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from charts import bar_chart_png
+
+    rng = np.random.default_rng(SEED)
+    labels = tuple(f"M-{i:03d}" for i in range(MACHINES))
+    totals = pd.Series(rng.integers(100, 1000, MACHINES), index=labels)
+
+    def pyplot_figure():
+        fig, ax = plt.subplots()
+        totals.plot(kind='bar', ax=ax, color='#FFA500')
+        fig.savefig(io.BytesIO(), format="png")
+        plt.close(fig)
+
+    def cached_miss():
+        bar_chart_png.cache_clear()
+        bar_chart_png(labels, tuple(totals.tolist()), "#FFA500", "Output", None, 0)
+
+    def cached_hit():
+        bar_chart_png(labels, tuple(totals.tolist()), "#FFA500", "Output", None, 0)
+
+    return {
+        "pyplot_figure": {"seconds": best_of(pyplot_figure, repeat=3)},
+        "cached_miss": {"seconds": best_of(cached_miss, repeat=3)},
+        "cached_hit": {"seconds": best_of(cached_hit)},
+    }
@@ -0,0 +1,211 @@
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import common  # noqa: F401  (puts the project folders on sys.path, also in the writer process)
+from ingest import BufferedWriter
+
+# One simulator process writes while N dashboard "sessions" (threads) refresh the
+# Real-Time Monitor, once as the project started ("legacy") and once as it is now ("tuned"):
+# - legacy: table created by pandas (to_sql), TEXT timestamps, no indexes, default
+#   connections (rollback journal), the original f-string KPI + chart queries
+# - tuned: db.py connections (WAL, pragmas), the indexed schema + rollups, queries.shift_totals
+# Both writers flush the same batches, so the difference is the database setup. Per mode:
+# - <mode>_reads: p95 latency of one dashboard refresh (p50/p99, count and
+#   "database is locked" errors alongside)
+# - <mode>_writes: p99 flush latency, with write throughput and errors alongside
+
+READERS = 8
+RATE = 5000         # simulator events per second
+BATCH_SIZE = 500
+DURATION = 5        # seconds per scenario
+SEED_ROWS = 200_000
+
+LEGACY_INSERT = """
+INSERT INTO production_logs (Timestamp, Machine_ID, Status, Parts_Produced, Scrap_Count)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def local_text(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def connect_legacy_writer(db_path):
+    # What create_engine('sqlite:///factory.db') gave us: rollback journal, default settings
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = DELETE")
+    return conn
+
+
+def connect_legacy_reader(db_path):
+    return sqlite3.connect(db_path, check_same_thread=False)
+
+
+class LegacyWriter(BufferedWriter):
+    """
+    Same batching as BufferedWriter, into the original table: TEXT timestamps, no rollups.
+    """
+
+    def flush(self):
+        self.last_flush = time.perf_counter()
+        if not self.buffer:
+            return 0
+        rows = [(local_text(t), machine, status, parts, scrap) for t, machine, status, parts, scrap in self.buffer]
+        self.buffer = []
+
+        t0 = time.perf_counter()
+        with self.conn:
+            self.conn.executemany(LEGACY_INSERT, rows)
+        self.flush_latencies.append(time.perf_counter() - t0)
+        self.rows_written += len(rows)
+        return len(rows)
+
+
+def make_writer(mode, db_path, **options):
+    from db import connect_writer
+
+    if mode == 'legacy':
+        return LegacyWriter(db_path, connect=connect_legacy_writer, **options)
+    return BufferedWriter(db_path, connect=connect_writer, **options)
+
+
+def refresh_queries(mode, shift_start):
+    # [(sql, params)] of one Monitor refresh
+    from bench_queries import FSTRING_CHART, FSTRING_KPI
+    from queries import END_OF_TIME
+    from schema import DASHBOARD_QUERIES
+
+    if mode == 'legacy':
+        shift_start_str = local_text(shift_start)
+        return [
+            (FSTRING_KPI.format(shift_start_str=shift_start_str), ()),
+            (FSTRING_CHART.format(shift_start_str=shift_start_str), ()),
+            (DASHBOARD_QUERIES['recent_events'], ()),
+        ]
+    return [
+        (DASHBOARD_QUERIES['shift_totals'], (shift_start, END_OF_TIME)),
+        (DASHBOARD_QUERIES['recent_events'], ()),
+    ]
+
+
+def writer_process(mode, db_path, result_queue):
+    from sensor_sim import generate_event, make_machines
+
+    machines = make_machines(50)
+    writer = make_writer(mode, db_path, batch_size=BATCH_SIZE, flush_interval=0.2)
+    errors = 0
+
+    start = time.perf_counter()
+    emitted = 0
+    while time.perf_counter() - start < DURATION:
+        due = int((time.perf_counter() - start) * RATE) - emitted
+        try:
+            for _ in range(due):
+                writer.add(generate_event(machines))
+            writer.flush_if_due()
+        except sqlite3.OperationalError:
+            # "database is locked": this batch is lost
+            errors += 1
+        emitted += max(due, 0)
+        time.sleep(0.001)
+
+    writer.close()
+    stats = writer.report()
+    stats['write_errors'] = errors
+    result_queue.put(stats)
+
+
+def reader_thread(mode, db_path, stop, latencies, errors):
+    from db import connect_reader
+
+    conn = connect_legacy_reader(db_path) if mode == 'legacy' else connect_reader(db_path)
+    # A cold-start dashboard refresh: full-shift totals + the live feed
+    queries = refresh_queries(mode, int(time.time()) - 8 * 3600)
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            for sql, params in queries:
+                conn.execute(sql, params).fetchall()
+            latencies.append(time.perf_counter() - t0)
+        except sqlite3.OperationalError:
+            errors.append(1)
+    conn.close()
+
+
+def seed(db_path, mode):
+    import pandas as pd
+    from sensor_sim import generate_event, make_machines
+
+    machines = make_machines(50)
+    events = [generate_event(machines) for _ in range(SEED_ROWS)]
+    if mode == 'legacy':
+        # The original table, created by pandas
+        columns = ['Timestamp', 'Machine_ID', 'Status', 'Parts_Produced', 'Scrap_Count']
+        frame = pd.DataFrame(events, columns=columns)
+        frame['Timestamp'] = frame['Timestamp'].map(local_text)
+        conn = connect_legacy_writer(db_path)
+        frame.to_sql('production_logs', conn, index=False)
+        conn.close()
+        return
+    writer = make_writer(mode, db_path, batch_size=10000)
+    for event in events:
+        writer.add(event)
+    writer.close()
+
+
+def run_scenario(mode):
+    workdir = tempfile.mkdtemp()
+    try:
+        return measure(mode, os.path.join(workdir, f"bench_{mode}.db"))
+    finally:
+        shutil.rmtree(workdir)
+
+
+def measure(mode, db_path):
+    from ingest import percentile
+
+    seed(db_path, mode)
+
+    result_queue = multiprocessing.Queue()
+    writer = multiprocessing.Process(target=writer_process, args=(mode, db_path, result_queue))
+
+    stop = threading.Event()
+    latencies, errors = [], []
+    threads = [threading.Thread(target=reader_thread, args=(mode, db_path, stop, latencies, errors))
+               for _ in range(READERS)]
+
+    writer.start()
+    for t in threads:
+        t.start()
+    time.sleep(DURATION)
+    stop.set()
+    for t in threads:
+        t.join()
+    write_stats = result_queue.get()
+    writer.join()
+
+    # No samples (every read or flush failed): no timing rather than 0 s
+    return {
+        f"{mode}_reads": {
+            "seconds": percentile(latencies, 95) if latencies else None,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+            "reads": len(latencies),
+            "errors": len(errors),
+        },
+        f"{mode}_writes": {
+            "seconds": write_stats['flush_p99_ms'] / 1000 if write_stats['flushes'] else None,
+            "rows_per_sec": round(write_stats['rows_per_sec']),
+            "errors": write_stats['write_errors'],
+        },
+    }
+
+
+def bench_writer_and_readers(ctx):
+    return {**run_scenario('legacy'), **run_scenario('tuned')}
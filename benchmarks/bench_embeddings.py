@@ -0,0 +1,63 @@
+import importlib.util
+import os
+import random
+import tempfile
+
+from common import SEED, Skip, best_of
+
+# Building the manual index against the fake API server (fake_openai_server.py), three ways:
+# - one_per_chunk: one request per paragraph (the old chat_with_manual.py loop)
+# - batched_1_worker: token-budget batches (embedding_pipeline.py), one worker
+# - batched_4_workers: the same with 4 workers
+
+PARAGRAPHS = 500
+LATENCY = 0.01  # simulated seconds per request
+
+WORDS = ["spindle", "hydraulic", "pressure", "valve", "coolant", "servo", "encoder", "bearing",
+         "feed", "rate", "check", "replace", "filter", "panel", "error", "sensor", "motor", "belt"]
+
+
+def synthetic_manual(paragraphs, seed=SEED):
+    rng = random.Random(seed)
+    sections = []
+    for i in range(paragraphs):
+        lines = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))) for _ in range(rng.randint(2, 5))]
+        sections.append(f"SECTION {i + 1}:\n- " + "\n- ".join(lines))
+    return "\n\n".join(sections)
+
+
+def bench_indexing(ctx):
+    if importlib.util.find_spec("openai") is None:
+        raise Skip("openai is not installed")
+    from openai import OpenAI
+
+    from fake_openai_server import start_in_background
+    from manual_index import EMBEDDING_MODEL, ManualIndex
+
+    text = synthetic_manual(PARAGRAPHS)
+    chunks = [c.strip() for c in text.split("\n\n") if c.strip()]
+    workdir = tempfile.TemporaryDirectory()
+    manual_path = os.path.join(workdir.name, "manual.txt")
+    with open(manual_path, "w") as f:
+        f.write(text)
+
+    def one_per_chunk():
+        for chunk in chunks:
+            client.embeddings.create(input=chunk, model=EMBEDDING_MODEL)
+
+    def pipeline(workers):
+        # A fresh index folder every time: nothing is reused from the previous build
+        return lambda: ManualIndex.load_or_build(manual_path, client, index_dir=tempfile.mkdtemp(dir=workdir.name),
+                                                 workers=workers)
+
+    server, base_url = start_in_background(port=0, latency=LATENCY)
+    client = OpenAI(base_url=base_url, api_key="fake")
+    try:
+        cases = {"one_per_chunk": one_per_chunk, "batched_1_worker": pipeline(1), "batched_4_workers": pipeline(4)}
+        # Seconds-long runs against a simulated network: one run each is enough
+        return {name: {"seconds": best_of(fn, repeat=1, min_seconds=0), "rows": len(chunks)}
+                for name, fn in cases.items()}
+    finally:
+        server.shutdown()
+        workdir.cleanup()
+
@@ -0,0 +1,40 @@
+import importlib.util
+import os
+import tempfile
+
+import pandas as pd
+
+from common import Skip, best_of, daily_files, production_csv
+
+# Week 1 file pipelines: combine_files.py (merge daily CSVs -> Parquet) and
+# daily_report.py (per-machine totals, in memory vs chunked).
+
+CSV_ROWS = 1_000_000
+
+
+def bench_combine_files(ctx):
+    if importlib.util.find_spec("pyarrow") is None:
+        raise Skip("pyarrow is not installed")
+    from combine_files import merge
+
+    folder = daily_files(CSV_ROWS, days=30)
+    files = sorted(os.path.join(folder, f) for f in os.listdir(folder))
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        output = os.path.join(workdir, "merged.parquet")
+        for workers in (1, 4):
+            seconds = best_of(lambda: merge(files, output, workers, verbose=False), repeat=3, min_seconds=0)
+            results[f"merge_{workers}_workers"] = {"seconds": seconds, "rows": CSV_ROWS}
+    return results
+
+
+def bench_daily_report(ctx):
+    from daily_report import build_report, build_report_chunked
+
+    path = production_csv(CSV_ROWS)
+    return {
+        "in_memory": {"seconds": best_of(lambda: build_report(pd.read_csv(path)), repeat=3, min_seconds=0),
+                      "rows": CSV_ROWS},
+        "chunked": {"seconds": best_of(lambda: build_report_chunked(path, 250_000), repeat=3, min_seconds=0),
+                    "rows": CSV_ROWS},
+    }
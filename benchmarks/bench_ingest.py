@@ -0,0 +1,32 @@
+import os
+import tempfile
+
+from common import best_of, generate_frames
+
+# sensor_sim.py -> ingest.BufferedWriter -> production_logs + rollups.
+# Same events, different batch sizes: rows per transaction is what matters.
+
+EVENTS = 50_000
+
+
+def bench_ingest(ctx):
+    from ingest import BufferedWriter
+
+    events = []
+    for _, frame in generate_frames(EVENTS):
+        events += list(zip(frame['Timestamp'].tolist(), frame['Machine_ID'].astype(str).tolist(),
+                           frame['Status'].astype(str).tolist(), frame['Parts_Produced'].tolist(),
+                           frame['Scrap_Count'].tolist()))
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for batch_size in (50, 500, 5000):
+            def write():
+                # A new database file every run (removed with the folder at the end, outside the timing)
+                path = os.path.join(tempfile.mkdtemp(dir=workdir), "ingest.db")
+                writer = BufferedWriter(path, batch_size=batch_size, flush_interval=1e9)
+                for event in events:
+                    writer.add(event)
+                writer.close()
+            results[f"batch_{batch_size}"] = {"seconds": best_of(write, repeat=3, min_seconds=0), "rows": len(events)}
+    return results
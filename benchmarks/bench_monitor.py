@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from common import best_of, factory_db, size_label
+
+# The queries behind one Real-Time Monitor refresh (see shift_kpis.py and the page):
+# - shift_rollup: per-machine shift totals from the rollup table (first refresh of a shift)
+# - new_events_by_machine: rows written since the previous refresh (every later refresh)
+# - recent_events: the live feed table
+
+
+def bench_monitor_queries(ctx):
+    from db import connect_reader
+    from schema import DASHBOARD_QUERIES
+    from shifts import get_shift
+
+    results = {}
+    for rows in ctx.sizes:
+        conn = connect_reader(factory_db(rows))
+        last_ts, last_id = conn.execute("SELECT MAX(Timestamp), MAX(Event_ID) FROM production_logs").fetchone()
+        shift_start = int(get_shift(datetime.fromtimestamp(last_ts))[0].timestamp())
+        queries = {
+            "shift_rollup": (DASHBOARD_QUERIES['shift_rollup'], (shift_start,)),
+            # About 5 seconds of events from 100 machines reporting every minute
+            "new_events_by_machine": (DASHBOARD_QUERIES['new_events_by_machine'], (last_id - 10, shift_start)),
+            "recent_events": (DASHBOARD_QUERIES['recent_events'], ()),
+        }
+        for name, (sql, params) in queries.items():
+            seconds = best_of(lambda: conn.execute(sql, params).fetchall())
+            results[f"{name}.{size_label(rows)}"] = {"seconds": seconds}
+        conn.close()
+    return results
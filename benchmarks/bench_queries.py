@@ -0,0 +1,71 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+from common import best_of, factory_db, legacy_db, size_label
+
+# Shift window totals (KPI cards + per-machine chart) since the start of the last FULL
+# shift in the data (the shift in progress may only be minutes old):
+# - fstring_two_scans: the original Monitor - SQL built with f-strings, TEXT timestamps,
+#   no indexes, one query for the KPIs and one for the chart
+# - bound_two_scans: same two queries on the indexed schema with bound parameters
+# - one_pass: queries.shift_totals (both results from one index range scan)
+# - one_pass_unprepared: the same with sqlite3's statement cache switched off
+
+FSTRING_KPI = """
+    SELECT SUM(Parts_Produced) as Total_Parts, SUM(Scrap_Count) as Total_Scrap
+    FROM production_logs
+    WHERE Timestamp >= '{shift_start_str}'
+"""
+FSTRING_CHART = """
+    SELECT Machine_ID, SUM(Parts_Produced) as Machine_Total
+    FROM production_logs
+    WHERE Timestamp >= '{shift_start_str}'
+    GROUP BY Machine_ID
+"""
+BOUND_KPI = "SELECT SUM(Parts_Produced), SUM(Scrap_Count) FROM production_logs WHERE Timestamp >= ?"
+BOUND_CHART = """
+    SELECT Machine_ID, SUM(Parts_Produced), SUM(Scrap_Count)
+    FROM production_logs INDEXED BY idx_logs_timestamp
+    WHERE Timestamp >= ?
+    GROUP BY Machine_ID"""
+
+
+def bench_shift_window(ctx):
+    from db import CONNECTION_PRAGMAS, apply_pragmas, connect_reader
+    from queries import shift_totals
+    from shifts import get_shift
+
+    results = {}
+    for rows in ctx.sizes:
+        label = size_label(rows)
+        conn = connect_reader(factory_db(rows))
+        last_ts = conn.execute("SELECT MAX(Timestamp) FROM production_logs").fetchone()[0]
+        shift_start_dt = get_shift(datetime.fromtimestamp(last_ts) - timedelta(hours=8))[0]
+        shift_start = int(shift_start_dt.timestamp())
+
+        legacy = sqlite3.connect(legacy_db(rows))
+        shift_start_str = shift_start_dt.strftime("%Y-%m-%d %H:%M:%S")
+
+        def fstring_two_scans():
+            legacy.execute(FSTRING_KPI.format(shift_start_str=shift_start_str)).fetchall()
+            legacy.execute(FSTRING_CHART.format(shift_start_str=shift_start_str)).fetchall()
+
+        def bound_two_scans():
+            conn.execute(BOUND_KPI, (shift_start,)).fetchall()
+            conn.execute(BOUND_CHART, (shift_start,)).fetchall()
+
+        # Every execute() parses and plans the SQL again
+        unprepared = sqlite3.connect(f"file:{factory_db(rows)}?mode=ro", uri=True, cached_statements=0)
+        apply_pragmas(unprepared, CONNECTION_PRAGMAS)
+
+        expected = shift_totals(conn, shift_start)
+        assert expected[0] == legacy.execute(FSTRING_KPI.format(shift_start_str=shift_start_str)).fetchone()[0]
+
+        results[f"fstring_two_scans.{label}"] = {"seconds": best_of(fstring_two_scans, repeat=3)}
+        results[f"bound_two_scans.{label}"] = {"seconds": best_of(bound_two_scans)}
+        results[f"one_pass.{label}"] = {"seconds": best_of(lambda: shift_totals(conn, shift_start))}
+        results[f"one_pass_unprepared.{label}"] = {
+            "seconds": best_of(lambda: shift_totals(unprepared, shift_start))}
+        for c in (conn, legacy, unprepared):
+            c.close()
+    return results
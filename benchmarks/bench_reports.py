@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+from common import best_of, factory_db, size_label
+
+# Shift Reports page: reports.build_report() for the report windows it offers,
+# ending at the last event in the data:
+# - shift / day / week / month at every database size
+# - a one-month report on a YEAR of data (20 machines, one event every 5 minutes, ~2.1M rows)
+#   next to what the page used to do: SELECT * and sum in pandas
+
+YEAR_ROWS = 20 * 288 * 365
+
+
+def report_windows(conn):
+    from reports import day_window, shift_window, week_window
+    from shifts import get_shift
+
+    last = datetime.fromtimestamp(conn.execute("SELECT MAX(Timestamp) FROM production_logs").fetchone()[0])
+    shift_start, shift_name = get_shift(last - timedelta(hours=8))  # last full shift
+    yesterday = last.date() - timedelta(days=1)
+    return {
+        "shift": shift_window(shift_start.date(), shift_name),
+        "day": day_window(yesterday),
+        "week": week_window(yesterday - timedelta(days=7)),
+        "month": (last - timedelta(days=30), last, "Last 30 days"),
+    }
+
+
+def bench_shift_report(ctx):
+    from db import connect_reader
+    from reports import build_report
+
+    results = {}
+    for rows in ctx.sizes:
+        conn = connect_reader(factory_db(rows))
+        for name, (start, end, _) in report_windows(conn).items():
+            results[f"{name}.{size_label(rows)}"] = {"seconds": best_of(lambda: build_report(conn, start, end))}
+        conn.close()
+    return results
+
+
+def bench_month_of_a_year(ctx):
+    import pandas as pd
+    from db import connect_reader
+    from reports import build_report
+
+    conn = connect_reader(factory_db(YEAR_ROWS, machines=20, interval=300))
+    start, end, _ = report_windows(conn)["month"]
+
+    def pandas_select_all():
+        df = pd.read_sql("SELECT * FROM production_logs", conn)
+        df = df[(df['Timestamp'] >= start.timestamp()) & (df['Timestamp'] < end.timestamp())]
+        return df['Parts_Produced'].sum(), df['Scrap_Count'].sum()
+
+    totals, _ = build_report(conn, start, end)
+    assert (totals['parts'], totals['scrap']) == pandas_select_all()
+    results = {
+        "rollups": {"seconds": best_of(lambda: build_report(conn, start, end))},
+        "pandas_select_all": {"seconds": best_of(pandas_select_all, repeat=1, min_seconds=0)},
+    }
+    conn.close()
+    return results
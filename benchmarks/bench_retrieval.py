@@ -0,0 +1,75 @@
+import importlib.util
+import os
+import tempfile
+
+import numpy as np
+
+from common import SEED, Skip, best_of
+
+# Manual retrieval without the network: a stub embeddings client returns the same
+# deterministic vectors as fake_openai_server.py, so index building measures our
+# batching/saving code and search measures retrieval.py.
+
+SEARCH_ROWS = 100_000
+DIM = 256
+
+
+class StubEmbeddingsClient:
+    """
+    Just enough of openai.OpenAI for manual_index / embedding_pipeline: client.embeddings.create().
+    """
+
+    class _Item:
+        def __init__(self, embedding):
+            self.embedding = embedding
+
+    class _Response:
+        def __init__(self, data):
+            self.data = data
+
+    def __init__(self, dim=DIM):
+        self.dim = dim
+        self.embeddings = self
+
+    def create(self, input, model):
+        from fake_openai_server import fake_embedding
+        texts = [input] if isinstance(input, str) else input
+        return self._Response([self._Item(fake_embedding(t, self.dim)) for t in texts])
+
+
+def bench_manual_index(ctx):
+    if importlib.util.find_spec("openai") is None:
+        raise Skip("openai is not installed")
+    from bench_embeddings import synthetic_manual
+    from manual_index import ManualIndex
+
+    with tempfile.TemporaryDirectory() as workdir:
+        manual_path = os.path.join(workdir, "manual.txt")
+        with open(manual_path, "w") as f:
+            f.write(synthetic_manual(2000))
+        client = StubEmbeddingsClient()
+
+        def build():
+            ManualIndex.load_or_build(manual_path, client, index_dir=tempfile.mkdtemp(dir=workdir), workers=4)
+
+        index_dir = tempfile.mkdtemp(dir=workdir)
+        ManualIndex.load_or_build(manual_path, client, index_dir=index_dir)
+        return {
+            "build_2000_chunks": {"seconds": best_of(build, repeat=3, min_seconds=0), "rows": 2000},
+            "load_saved": {"seconds": best_of(lambda: ManualIndex.load_or_build(manual_path, client, index_dir=index_dir))},
+        }
+
+
+def bench_search(ctx):
+    from retrieval import build_index
+
+    rng = np.random.default_rng(SEED)
+    vectors = rng.standard_normal((SEARCH_ROWS, DIM)).astype(np.float32)
+    queries = vectors[rng.choice(SEARCH_ROWS, 32)] + rng.normal(0, 0.5, (32, DIM)).astype(np.float32)
+
+    results = {}
+    for backend in ("brute", "ivf"):
+        index = build_index(vectors, backend=backend)
+        results[f"{backend}_top5"] = {"seconds": best_of(lambda: index.search(queries[0], k=5))}
+        results[f"{backend}_batch32_top5"] = {"seconds": best_of(lambda: index.search_batch(queries, k=5))}
+    return results
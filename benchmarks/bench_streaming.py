@@ -0,0 +1,69 @@
+import importlib.util
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import Skip
+
+# Chat answers for N concurrent "sessions" against the fake API server:
+# - blocking: a new OpenAI client per question, nothing shown until the whole answer is there
+# - streaming: the shared LLMClient (one event loop + connection pool), tokens as they arrive
+# <mode>_first_token = time until the user sees something, <mode>_answer = time per answer
+# (p50 as "seconds", p95 alongside).
+
+SESSIONS = 20
+QUESTIONS = 3  # per session
+FIRST_TOKEN_DELAY = 0.5
+TOKEN_DELAY = 0.02
+
+MESSAGES = [{"role": "user", "content": "How do I clear error E-404 on the hydraulic press after a pressure drop?"}]
+
+
+def blocking_answer(base_url):
+    from openai import OpenAI
+
+    client = OpenAI(base_url=base_url, api_key="fake")
+    t0 = time.perf_counter()
+    client.chat.completions.create(model="fake", messages=MESSAGES)
+    seconds = time.perf_counter() - t0
+    return seconds, seconds  # the user sees nothing until the end
+
+
+def streamed_answer(llm):
+    from llm_client import StreamMetrics
+
+    metrics = StreamMetrics()
+    llm.chat(MESSAGES, model="fake", metrics=metrics)
+    return metrics.time_to_first_token, metrics.total
+
+
+def run_sessions(mode, job):
+    from ingest import percentile
+
+    with ThreadPoolExecutor(max_workers=SESSIONS) as pool:
+        answers = list(pool.map(lambda _: job(), range(SESSIONS * QUESTIONS)))
+    results = {}
+    for i, stage in enumerate(("first_token", "answer")):
+        seconds = [answer[i] for answer in answers]
+        results[f"{mode}_{stage}"] = {
+            "seconds": percentile(seconds, 50),
+            "p95_ms": round(percentile(seconds, 95) * 1000, 1),
+        }
+    return results
+
+
+def bench_chat(ctx):
+    for package in ("openai", "httpx", "dotenv"):
+        if importlib.util.find_spec(package) is None:
+            raise Skip(f"{package} is not installed")
+    from fake_openai_server import start_in_background
+    from llm_client import LLMClient
+
+    server, base_url = start_in_background(port=0, first_token_delay=FIRST_TOKEN_DELAY, token_delay=TOKEN_DELAY)
+    try:
+        llm = LLMClient(api_key="fake", base_url=base_url)
+        return {
+            **run_sessions("blocking", lambda: blocking_answer(base_url)),
+            **run_sessions("streaming", lambda: streamed_answer(llm)),
+        }
+    finally:
+        server.shutdown()
@@ -0,0 +1,145 @@
+import os
+import sys
+import time
+from datetime import date
+
+# --- SHARED BENCHMARK HELPERS ---
+# Benchmarks import the project modules directly (both weeks are flat script folders),
+# and build their test data with the load generator. Generated databases/files are
+# kept in benchmarks/.data/ so repeated runs don't pay for them again.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEEK_01 = os.path.join(ROOT, "Week_01_Foundations")
+WEEK_02 = os.path.join(ROOT, "Week_02_AI_Integration")
+DATA_DIR = os.path.join(ROOT, "benchmarks", ".data")
+
+for path in (WEEK_02, WEEK_01):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+SEED = 42
+MACHINES = 100
+FIRST_DAY = date(2025, 1, 6)
+
+
+class Skip(Exception):
+    """
+    Raised by a benchmark that can't run here (e.g. an optional package is missing).
+    """
+
+
+def best_of(fn, repeat=5, min_seconds=0.2):
+    """
+    Fastest of 'repeat' timed runs (at least one, and keeps going until 'min_seconds'
+    have been spent so very fast calls get enough samples). Returns seconds.
+    """
+    timings = []
+    spent = 0.0
+    while len(timings) < repeat or (spent < min_seconds and len(timings) < 1000):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        timings.append(elapsed)
+        spent += elapsed
+    return min(timings)
+
+
+def size_label(rows):
+    for unit, size in (("M", 1_000_000), ("k", 1_000)):
+        if rows >= size and rows % size == 0:
+            return f"{rows // size}{unit}"
+    return str(rows)
+
+
+def generate_frames(rows, machines=MACHINES, interval=60):
+    """
+    Load generator output, day by day, cut off after exactly 'rows' events.
+    """
+    from load_generator import LoadGenerator
+
+    generator = LoadGenerator(machines, interval, seed=SEED)
+    remaining = rows
+    for day, frame in generator.days(FIRST_DAY, 10 ** 6):
+        if remaining <= 0:
+            return
+        yield day, frame.head(remaining)
+        remaining -= len(frame)
+
+
+def factory_db(rows, machines=MACHINES, interval=60):
+    """
+    Path of a production_logs database with 'rows' generated events (built once).
+    """
+    from db import connect_writer
+    from load_generator import write_sqlite
+
+    layout = "" if (machines, interval) == (MACHINES, 60) else f"_{machines}m_{interval}s"
+    path = os.path.join(DATA_DIR, f"factory_{size_label(rows)}{layout}.db")
+    if os.path.exists(path):
+        return path
+    os.makedirs(DATA_DIR, exist_ok=True)
+    conn = connect_writer(path + ".tmp")
+    for _, frame in generate_frames(rows, machines, interval):
+        write_sqlite(conn, frame)
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def legacy_db(rows):
+    """
+    The same events in the original layout: table created by pandas (to_sql), TEXT
+    timestamps, no indexes. For old-vs-new comparisons.
+    """
+    import sqlite3
+    from load_generator import to_csv_format
+
+    path = os.path.join(DATA_DIR, f"legacy_{size_label(rows)}.db")
+    if os.path.exists(path):
+        return path
+    os.makedirs(DATA_DIR, exist_ok=True)
+    conn = sqlite3.connect(path + ".tmp")
+    for i, (_, frame) in enumerate(generate_frames(rows)):
+        frame = to_csv_format(frame)[["Timestamp", "Machine_ID", "Status", "Parts_Produced", "Scrap_Count"]]
+        frame.to_sql("production_logs", conn, if_exists="replace" if i == 0 else "append", index=False)
+    conn.close()
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def production_csv(rows):
+    """
+    Path of a Week 1 style production_log CSV with 'rows' generated events (built once).
+    """
+    from load_generator import to_csv_format
+
+    path = os.path.join(DATA_DIR, f"production_log_{size_label(rows)}.csv")
+    if os.path.exists(path):
+        return path
+    os.makedirs(DATA_DIR, exist_ok=True)
+    for i, (_, frame) in enumerate(generate_frames(rows)):
+        to_csv_format(frame).to_csv(path + ".tmp", mode="w" if i == 0 else "a", header=(i == 0), index=False)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def daily_files(rows, days):
+    """
+    Folder of 'days' daily CSV files (combine_files.py input), 'rows' events in total.
+    """
+    from load_generator import to_csv_format
+
+    folder = os.path.join(DATA_DIR, f"daily_{size_label(rows)}_{days}")
+    if os.path.isdir(folder):
+        return folder
+    os.makedirs(folder + ".tmp", exist_ok=True)
+    per_day = rows // days
+    frames = generate_frames(rows, machines=max(1, per_day // 1440))
+    for i, (_, frame) in enumerate(frames):
+        if i >= days:
+            break
+        columns = ["Timestamp", "Machine_ID", "Parts_Produced", "Scrap_Count"]
+        to_csv_format(frame)[columns].to_csv(os.path.join(folder + ".tmp", f"day_{i + 1}.csv"), index=False)
+    os.replace(folder + ".tmp", folder)
+    return folder
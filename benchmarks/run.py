@@ -0,0 +1,152 @@
+import argparse
+import glob
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import traceback
+
+from common import ROOT, Skip
+
+# --- BENCHMARK RUNNER ---
+# Runs every bench_*() function in benchmarks/bench_*.py and saves the timings as JSON.
+#   python benchmarks/run.py                         # 10k + 1M rows
+#   python benchmarks/run.py --full                  # + 10M rows (builds a ~1 GB database once)
+#   python benchmarks/run.py --only monitor reports  # just some modules
+#   python benchmarks/run.py --compare benchmarks/results/baseline.json --threshold 0.2
+# With --compare the run fails (exit code 1) if any benchmark got slower than the
+# baseline by more than the threshold (0.2 = 20%). Timings are the best of several runs,
+# so compare results from the same machine only.
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+QUICK_SIZES = [10_000, 1_000_000]
+FULL_SIZES = QUICK_SIZES + [10_000_000]
+
+
+class Context:
+    # What every benchmark function gets: the database sizes to run at
+    def __init__(self, sizes):
+        self.sizes = sizes
+
+
+def discover(only=None):
+    """
+    (name, function) for every bench_* function, e.g. ('monitor.bench_monitor_queries', fn).
+    """
+    for path in sorted(glob.glob(os.path.join(BENCH_DIR, "bench_*.py"))):
+        module_name = os.path.basename(path)[:-3]
+        short = module_name[len("bench_"):]
+        if only and short not in only:
+            continue
+        module = importlib.import_module(module_name)
+        for name in sorted(dir(module)):
+            fn = getattr(module, name)
+            if name.startswith("bench_") and callable(fn) and fn.__module__ == module_name:
+                yield f"{short}.{name[len('bench_'):]}", fn
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(ctx, only=None):
+    results, skipped = {}, {}
+    for group, fn in discover(only):
+        print(f"{group} ...", flush=True)
+        try:
+            measured = fn(ctx)
+        except Skip as e:
+            skipped[group] = str(e)
+            print(f"  skipped: {e}")
+            continue
+        except Exception:
+            # One broken benchmark shouldn't throw away the others' results
+            skipped[group] = traceback.format_exc(limit=3)
+            print(f"  FAILED:\n{skipped[group]}")
+            continue
+        for name, result in measured.items():
+            # "seconds": None = nothing was measured (e.g. every write failed)
+            if result.get("rows") and result["seconds"]:
+                result["rows_per_sec"] = round(result["rows"] / result["seconds"])
+            results[f"{group}.{name}"] = result
+            timing = f"{result['seconds'] * 1000:>12.3f} ms" if result["seconds"] is not None else f"{'no timing':>15}"
+            rate = f"  ({result['rows_per_sec']:,} rows/s)" if "rows_per_sec" in result else ""
+            # Anything else a benchmark reports (recall, p95_ms, size_mb, ...) is shown as key=value
+            extra = "".join(f"  {key}={value}" for key, value in result.items()
+                            if key not in ("seconds", "rows", "rows_per_sec"))
+            print(f"  {name:<36}{timing}{rate}{extra}")
+    return results, skipped
+
+
+def format_ms(seconds):
+    return f"{seconds * 1000:.3f}" if seconds else "-"
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints new vs baseline timings. Returns the names that got slower than the threshold allows.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<58}{'baseline ms':>13}{'now ms':>12}{'change':>9}")
+    for name in sorted(results.keys() & baseline.keys()):
+        old, new = baseline[name].get("seconds"), results[name].get("seconds")
+        if not old or new is None:
+            # No timing on one side (or a zero baseline): nothing to compare against
+            print(f"{name:<58}{format_ms(old):>13}{format_ms(new):>12}  (not compared)")
+            continue
+        change = new / old - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  ❌ REGRESSION"
+        print(f"{name:<58}{old * 1000:>13.3f}{new * 1000:>12.3f}{change:>+9.0%}{flag}")
+    for name in sorted(baseline.keys() - results.keys()):
+        print(f"{name:<58}  (not run this time)")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and save/compare the timings")
+    parser.add_argument('--full', action='store_true', help="Also run at 10M rows")
+    parser.add_argument('--sizes', type=int, nargs='+', help="Database sizes in rows (overrides --full)")
+    parser.add_argument('--only', nargs='+', help="Module names without 'bench_', e.g. monitor reports")
+    parser.add_argument('--output', help="Results file (default: benchmarks/results/<time>.json)")
+    parser.add_argument('--compare', help="Baseline results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed slowdown, 0.2 = 20%%")
+    args = parser.parse_args()
+
+    ctx = Context(args.sizes or (FULL_SIZES if args.full else QUICK_SIZES))
+    started = time.time()
+    results, skipped = run(ctx, args.only)
+
+    report = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started)),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        "sizes": ctx.sizes,
+        "results": results,
+        "skipped": skipped,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S", time.localtime(started)) + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {len(results)} results to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%}")